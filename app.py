@@ -8,40 +8,74 @@ Nuclear Medicine Trivia Trainer – progress‑aware
 """
 
 from __future__ import annotations
-import random
+import hashlib
+import secrets
 from typing import List, Dict
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from nucmed import governor, sessions, warmup
+from nucmed.data import merge_decks
+from nucmed.ledger import SeenLedger
+from nucmed.quiz import (
+    match_answer_key, match_answer_pools, mcq_options, sample_match_rows, shuffled_deck,
+)
+
 st.set_page_config(page_title="NucMed Trivia Trainer", page_icon="☢️", layout="centered")
+warmup.start()   # first run in this process: load every page's data in the background
+sessions.touch()  # idle sessions are compacted; see nucmed/sessions.py
 
 # ---------------------------------------------------------------------
-# Load CSV + stable row IDs
+# Load CSVs, merge + dedupe, stable row IDs
 # ---------------------------------------------------------------------
-@st.cache_data
-def load_data(uploaded_file=None):
-    df = pd.read_csv(uploaded_file) if uploaded_file else pd.read_csv(
-        "radionuclides_info.csv")
-    df.columns = df.columns.str.strip()
-    df = df.reset_index().rename(columns={"index": "__row_id"})
-    return df
-
-df = load_data(st.sidebar.file_uploader("⬆️ Upload a custom CSV (optional)", type="csv"))
+def load_data(digests: tuple, uploads=None):
+    """
+    digests identifies the uploads by content. Merged decks live in the
+    process-wide warm-up cache, shared by every session that uploads the same
+    files and evictable by the memory governor (nucmed/governor.py).
+    """
+    if not uploads:
+        return warmup.default_deck()
+    with st.spinner("Merging decks..."):   # only shown if it takes a moment
+        return warmup.single_flight(("uploaded_deck", digests), lambda: merge_decks(uploads))
+
+uploads = st.sidebar.file_uploader("⬆️ Upload custom CSVs (optional)", type="csv", accept_multiple_files=True)
+deck_key = tuple(hashlib.sha1(f.getvalue()).hexdigest() for f in uploads)
+if uploads and not warmup.is_cached(("uploaded_deck", deck_key)):
+    # Refuse decks that would not fit in memory before parsing them.
+    problem = governor.check_upload(sum(f.size for f in uploads))
+    if problem:
+        st.sidebar.error(problem)
+        uploads, deck_key = [], ()
+df = load_data(deck_key, uploads)
 columns: List[str] = [c for c in df.columns if df[c].notna().any()]
 if df.empty:
     st.error("CSV is empty – please upload a valid file.")
     st.stop()
 
-total_rows = len(df)
-
 # ---------------------------------------------------------------------
 # State helpers
 # ---------------------------------------------------------------------
 
+def reseed(seed: int):
+    st.session_state.seed = seed
+    st.session_state.rng = np.random.default_rng(seed)
+
 def init_flash():
-    st.session_state.deck = df.sample(frac=1).to_dict("records")
+    search_deck = st.session_state.get("search_deck")
+    if search_deck:   # cards picked on the Search page
+        order = st.session_state.rng.permutation(len(search_deck))
+        st.session_state.deck = [search_deck[i] for i in order]
+    else:
+        st.session_state.deck = shuffled_deck(df, st.session_state.rng)
     st.session_state.qnum = 0
 
+def reset_progress():
+    # Ledgers are bitsets over __row_id positions, so they belong to one deck.
+    st.session_state.seen = SeenLedger(len(st.session_state.deck))   # mode_key -> bitset of row_ids
+    st.session_state.celebrated = set()                              # balloons already shown
+
 def next_flash():
     st.session_state.qnum = (st.session_state.qnum + 1) % len(st.session_state.deck)
 
@@ -53,33 +87,73 @@ def reset_mcq():
     st.session_state.mcq_opts = {}
 
 
+# Match-Up grid limits: speed drills go up to MATCH_MAX_ROWS rows, but the
+# per-cell dropdown style is only offered for small grids.
+MATCH_MAX_ROWS = 500
+MATCH_MAX_TARGETS = 5
+DROPDOWN_MAX_ROWS = 20
+
 def init_match(shuffle=True):
     if shuffle or "match_rows" not in st.session_state:
-        st.session_state.match_rows = df.sample(n=min(6, total_rows)).reset_index(drop=True)
+        size = st.session_state.get("match_size", 6)
+        st.session_state.match_rows = sample_match_rows(df, st.session_state.rng, size)
     st.session_state.match_choice = {}
+    st.session_state.match_picks = None   # the grid's answers, frozen by Check Answers
     st.session_state.match_submitted = False
+    st.session_state.match_grid_id = st.session_state.get("match_grid_id", 0) + 1   # fresh table editor
+
+# Session seed: the same seed and deck replay the same cards, options and grids
+if "rng" not in st.session_state:
+    reseed(secrets.randbits(32))
+
+# Idle compaction packs the deck and match rows down to __row_id arrays
+def unpack_deck(ids):
+    search_deck = st.session_state.get("search_deck")
+    return [search_deck[i] for i in ids] if search_deck else df.iloc[ids].to_dict("records")
 
-# Global ledgers
-st.session_state.setdefault("seen", {})          # mode_key -> set(row_ids)
-st.session_state.setdefault("celebrated", set()) # balloons already shown
+sessions.rehydrate(st.session_state, {
+    "deck": unpack_deck,
+    "match_rows": lambda ids: df.iloc[ids].reset_index(drop=True),
+})
 
-# Bootstrap
-if "deck" not in st.session_state:
-    init_flash(); reset_mcq(); init_match()
+# Bootstrap (again whenever a different set of files is uploaded)
+if "deck" not in st.session_state or st.session_state.get("deck_key") != deck_key:
+    st.session_state.deck_key = deck_key
+    init_flash(); reset_mcq(); init_match(); reset_progress()
 
 # ---------------------------------------------------------------------
 # Sidebar
 # ---------------------------------------------------------------------
 game = st.sidebar.selectbox("Choose a game", ["Flashcards", "Multiple Choice", "Multiple Match"])
+seed = st.sidebar.number_input("Session seed", min_value=0, max_value=2**32 - 1, value=st.session_state.seed, step=1,
+                               help="Share a seed to get the same cards, options and match grids.")
+if int(seed) != st.session_state.seed:
+    reseed(int(seed)); init_flash(); reset_mcq(); init_match()
+if st.session_state.get("search_deck"):
+    st.sidebar.info(f"🔎 Flashcards & MCQ use {len(st.session_state.deck)} cards from Search.")
+    if st.sidebar.button("Use full deck"):
+        st.session_state.pop("search_deck"); init_flash(); reset_mcq(); reset_progress(); st.rerun()
 if st.sidebar.button("🔄 Reset All"):
-    init_flash(); reset_mcq(); init_match(); st.session_state.seen = {}; st.session_state.celebrated = set()
+    reseed(st.session_state.seed)
+    init_flash(); reset_mcq(); init_match(); reset_progress()
+
+with st.sidebar.expander("📊 Coverage"):
+    ledger: SeenLedger = st.session_state.seen
+    total = len(st.session_state.deck)
+    any_mode = len(ledger.union())
+    st.progress(min(any_mode / total, 1.0), text=f"Seen in any mode: {any_mode}/{total}")
+    for mode, label in [("flash", "Flashcards"), ("mcq", "Multiple Choice")]:
+        mode_keys = [k for k in ledger.keys() if k[0] == mode]
+        if mode_keys:
+            st.caption(f"{label}, any fields: {len(ledger.union(mode_keys))}/{total}")
 
 # Helper: progress bar -------------------------------------------------
 
 def show_progress(key):
-    seen = len(st.session_state.seen.get(key, set()))
-    val = min(seen / total_rows, 1.0)
-    st.progress(val, text=f"Reviewed {seen}/{total_rows}")
+    total = len(st.session_state.deck)
+    seen = st.session_state.seen.count(key)
+    val = min(seen / total, 1.0)
+    st.progress(val, text=f"Reviewed {seen}/{total}")
     if val == 1.0:
         if key not in st.session_state.celebrated:
             st.session_state.celebrated.add(key)
@@ -92,12 +166,11 @@ def show_progress(key):
 # ---------------------------------------------------------------------
 if game == "Flashcards":
     st.header("Flashcards 🃏")
-    front = st.sidebar.selectbox("Front field", columns, index=columns.index("Radiopharmaceutical ") if "Radiopharmaceutical " in columns else 0)
+    front = st.sidebar.selectbox("Front field", columns, index=columns.index("Radiopharmaceutical") if "Radiopharmaceutical" in columns else 0)
     backs = [c for c in columns if c != front]
     back = st.sidebar.selectbox("Back field", backs, index=backs.index("Uses") if "Uses" in backs else 0)
 
     key = ("flash", front, back)
-    st.session_state.seen.setdefault(key, set())
     show_progress(key)
 
     card = st.session_state.deck[st.session_state.qnum]
@@ -106,7 +179,7 @@ if game == "Flashcards":
         st.markdown(card.get(back, "—") or "—")
 
     if st.button("Next ▶"):
-        st.session_state.seen[key].add(card["__row_id"])
+        st.session_state.seen.mark(key, card["__row_id"])
         next_flash(); st.rerun()
 
 # ---------------------------------------------------------------------
@@ -114,19 +187,16 @@ if game == "Flashcards":
 # ---------------------------------------------------------------------
 elif game == "Multiple Choice":
     st.header("Multiple Choice 🎯")
-    col_q = st.sidebar.selectbox("Ask about", columns, index=columns.index("Radiopharmaceutical ") if "Radiopharmaceutical " in columns else 0)
+    col_q = st.sidebar.selectbox("Ask about", columns, index=columns.index("Radiopharmaceutical") if "Radiopharmaceutical" in columns else 0)
     col_a = st.sidebar.selectbox("Identify", [c for c in columns if c != col_q], index=columns.index("Uses") if "Uses" in columns and col_q != "Uses" else 0)
 
     key = ("mcq", col_q, col_a)
-    st.session_state.seen.setdefault(key, set())
     show_progress(key)
 
     row = st.session_state.deck[st.session_state.qnum]; rid = row["__row_id"]
     qkey = (rid, col_q, col_a)
     if qkey not in st.session_state.mcq_opts:
-        correct = row.get(col_a, "")
-        distract = df[col_a].dropna().loc[lambda s: s != correct].unique().tolist(); random.shuffle(distract)
-        st.session_state.mcq_opts[qkey] = random.sample(distract, k=min(3, len(distract))) + [correct]
+        st.session_state.mcq_opts[qkey] = mcq_options(df, row, col_a, st.session_state.rng)
     opts = st.session_state.mcq_opts[qkey]
 
     st.markdown(f"**{col_q}:**"); st.markdown(row.get(col_q, ""))
@@ -137,7 +207,7 @@ elif game == "Multiple Choice":
 
     if not st.session_state.mcq_submitted and st.button("Submit ✅"):
         st.session_state.mcq_submitted = True
-        st.session_state.seen[key].add(rid)
+        st.session_state.seen.mark(key, rid)
         if choice == row.get(col_a, ""):
             st.session_state.mcq_type = "success"; st.session_state.mcq_msg = "Correct!"
         else:
@@ -153,13 +223,28 @@ else:
     st.header("Multiple Match 🧩")
 
     base_col = st.sidebar.selectbox("Rows show:", columns,
-                                    index=columns.index("Radiopharmaceutical ") if "Radiopharmaceutical " in columns else 0)
+                                    index=columns.index("Radiopharmaceutical") if "Radiopharmaceutical" in columns else 0)
 
     target_cols = st.sidebar.multiselect(
-        "Match with (1‑3):",
+        f"Match with (1‑{MATCH_MAX_TARGETS}):",
         [c for c in columns if c != base_col],
         default=[c for c in ["Mechanism of Localization"] if c in columns][:1],
-        max_selections=3,
+        max_selections=MATCH_MAX_TARGETS,
+    )
+
+    max_rows = min(MATCH_MAX_ROWS, len(df))
+    size = st.sidebar.number_input("Rows per grid", min_value=1, max_value=max_rows,
+                                   value=min(st.session_state.get("match_size", 6), max_rows), step=1,
+                                   help="Go big for a speed drill.")
+    if size != st.session_state.get("match_size", 6):
+        st.session_state.match_size = int(size)
+        init_match(shuffle=True)
+
+    grid_styles = ["Table", "Dropdowns"] if size <= DROPDOWN_MAX_ROWS else ["Table"]
+    grid_style = st.sidebar.radio(
+        "Grid style", grid_styles, horizontal=True,
+        help="Table sends each column's answer list to the browser once; Dropdowns sends it again for every cell "
+             f"and is only offered up to {DROPDOWN_MAX_ROWS} rows.",
     )
 
     if st.sidebar.button("Shuffle 🔀"):
@@ -176,69 +261,108 @@ else:
         "match_answer_pools" not in st.session_state
         or set(st.session_state.match_answer_pools.keys()) != set(target_cols)
     ):
-        st.session_state.match_answer_pools = {
-            c: random.sample(df[c].dropna().astype(str).unique().tolist(),
-                             k=len(df[c].dropna().unique()))
-            for c in target_cols
-        }
+        st.session_state.match_answer_pools = match_answer_pools(df, target_cols, st.session_state.rng)
     answer_pools: Dict[str, List[str]] = st.session_state.match_answer_pools
 
-    # ---------- header --------------------------------------------------- #
-    widths = [3] + [2] * len(target_cols)   # extra width for first col
-    hcols = st.columns(widths)
-    hcols[0].markdown(f"### {base_col}")
-    for i, tc in enumerate(target_cols, 1):
-        hcols[i].markdown(f"### {tc}")
-
-    # ---------- rows ----------------------------------------------------- #
-    for idx, row in st.session_state.match_rows.iterrows():
-        cols_stream = st.columns(widths)
-        base_text = str(row[base_col]) if pd.notna(row[base_col]) else ""
-        cols_stream[0].markdown(
-            f"<div style='padding:4px 16px 4px 0; white-space: nowrap;'>{base_text}</div>",
-            unsafe_allow_html=True,
-        )
-        for j, tcol in enumerate(target_cols, 1):
-            key = (idx, tcol)
-            default_val = st.session_state.match_choice.get(key, "Select")
-            display_pool = ["Select"] + answer_pools[tcol]
-            choice = cols_stream[j].selectbox(
-                label=f"{idx}-{tcol}",
-                options=display_pool,
-                index=display_pool.index(default_val) if default_val in display_pool else 0,
-                key=f"match_{idx}_{tcol}",
-                label_visibility="collapsed",
+    rows = st.session_state.match_rows
+    # One answer key per grid and column choice, not per rerun.
+    key_id = (st.session_state.match_grid_id, base_col, tuple(target_cols))
+    if st.session_state.get("match_key", (None,))[0] != key_id:
+        st.session_state.match_key = (key_id, match_answer_key(df, base_col, rows[base_col], target_cols))
+    answer_key = st.session_state.match_key[1]
+
+    # Picks frozen by Check Answers; a column added since then counts as unanswered.
+    picks = None
+    if st.session_state.match_submitted:
+        picks = st.session_state.get("match_picks")
+        picks = pd.DataFrame(index=rows.index) if picks is None else picks
+        picks = picks.reindex(index=rows.index, columns=target_cols).astype(object)
+        picks = picks.where(picks.notna(), None)
+
+    if grid_style == "Table":
+        # ---------- one editable table; each option list is sent once --- #
+        grid = pd.DataFrame({base_col: rows[base_col].fillna("").astype(str)})
+
+        if st.session_state.match_submitted:
+            # The editor's arguments are part of its identity, so it is not
+            # redrawn read-only (that would be a new, empty editor); the
+            # frozen picks are shown with their marks instead.
+            hits = picks.to_numpy() == answer_key[target_cols].to_numpy()
+            for j, tc in enumerate(target_cols):
+                grid[tc] = [f"{'✅' if hit else '❌'} {pick if pick is not None else '—'}"
+                            for hit, pick in zip(hits[:, j], picks[tc])]
+            st.dataframe(grid, hide_index=True, use_container_width=True)
+        else:
+            for tc in target_cols:
+                grid[tc] = pd.Series(None, index=rows.index, dtype=object)
+
+            column_config = {base_col: st.column_config.TextColumn(base_col, disabled=True)}
+            column_config.update({
+                tc: st.column_config.SelectboxColumn(tc, options=answer_pools[tc], width="medium")
+                for tc in target_cols
+            })
+            choices = st.data_editor(
+                grid,
+                column_config=column_config,
+                hide_index=True,
+                use_container_width=True,
+                key=f"match_grid_{st.session_state.match_grid_id}_{base_col}_{'|'.join(target_cols)}",
+            )[target_cols]
+    else:
+        # ---------- header --------------------------------------------------- #
+        widths = [3] + [2] * len(target_cols)   # extra width for first col
+        hcols = st.columns(widths)
+        hcols[0].markdown(f"### {base_col}")
+        for i, tc in enumerate(target_cols, 1):
+            hcols[i].markdown(f"### {tc}")
+
+        # ---------- rows ----------------------------------------------------- #
+        for idx, row in rows.iterrows():
+            cols_stream = st.columns(widths)
+            base_text = str(row[base_col]) if pd.notna(row[base_col]) else ""
+            cols_stream[0].markdown(
+                f"<div style='padding:4px 16px 4px 0; white-space: nowrap;'>{base_text}</div>",
+                unsafe_allow_html=True,
             )
-            st.session_state.match_choice[key] = choice
-
-            # feedback icon ------------------------------------------------ #
-            if st.session_state.match_submitted:
-                real_ans_series = df.loc[df[base_col] == row[base_col], tcol].dropna()
-                real_ans = str(real_ans_series.iloc[0]) if not real_ans_series.empty else ""
-                icon = "✅" if choice == real_ans else "❌"
-                cols_stream[j].markdown(icon)
+            for j, tcol in enumerate(target_cols, 1):
+                key = (idx, tcol)
+                default_val = st.session_state.match_choice.get(key, "Select")
+                display_pool = ["Select"] + answer_pools[tcol]
+                choice = cols_stream[j].selectbox(
+                    label=f"{idx}-{tcol}",
+                    options=display_pool,
+                    index=display_pool.index(default_val) if default_val in display_pool else 0,
+                    key=f"match_{idx}_{tcol}",
+                    label_visibility="collapsed",
+                )
+                st.session_state.match_choice[key] = choice
+
+                # feedback icon ------------------------------------------------ #
+                if st.session_state.match_submitted:
+                    icon = "✅" if picks.at[idx, tcol] == answer_key.at[idx, tcol] else "❌"
+                    cols_stream[j].markdown(icon)
+
+        choices = pd.DataFrame(
+            {tc: [st.session_state.match_choice.get((idx, tc)) for idx in rows.index] for tc in target_cols},
+            index=rows.index,
+        )
 
     # ---------- buttons & score ---------------------------------------- #
     if not st.session_state.match_submitted:
         if st.button("Check Answers ✅"):
+            st.session_state.match_picks = choices[target_cols].copy()
             st.session_state.match_submitted = True
             st.rerun()
     else:
-        total_cells = len(st.session_state.match_rows) * len(target_cols)
-        correct_cells = 0
-        for idx, row in st.session_state.match_rows.iterrows():
-            for tcol in target_cols:
-                key = (idx, tcol)
-                user_ans = st.session_state.match_choice.get(key, "Select")
-                real_ans_series = df.loc[df[base_col] == row[base_col], tcol].dropna()
-                real_ans = str(real_ans_series.iloc[0]) if not real_ans_series.empty else ""
-                if user_ans == real_ans:
-                    correct_cells += 1
-        st.success(f"Score: {correct_cells} / {total_cells}")
+        # picks and answer_key share rows and columns: one element-wise comparison scores the grid.
+        correct = picks.to_numpy() == answer_key[target_cols].to_numpy()
+        st.success(f"Score: {int(correct.sum())} / {correct.size}")
+        if len(target_cols) > 1:
+            st.caption(" · ".join(f"{tc}: {hits}/{len(rows)}" for tc, hits in zip(target_cols, correct.sum(axis=0))))
         if st.button("Retry 🔄"):
             init_match(shuffle=False)
             st.rerun()
-            
+
     st.info("Click Shuffle on the side bar to get a new batch to match!")
 
 # ---------------------------------------------------------------------
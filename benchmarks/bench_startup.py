@@ -0,0 +1,122 @@
+"""
+Startup and rerun timings for the Streamlit scripts.
+
+Each script is run headless with streamlit.testing.v1.AppTest:
+
+* time-to-first-paint: a fresh interpreter imports Streamlit, runs the
+  script once and stops the clock when the first run completes. This is the
+  cost the first visitor of a new server process pays.
+* warm rerun: further runs in the same process, after the caches are full.
+
+Scripts in LAZY_PANDAS must not import pandas before the question bank
+loads (the first import of nucmed.data); the run fails if one does.
+
+Usage (from the repository root):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --reruns 50 pages/2_Hot_or_Not.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPTS = ["app.py", "pages/2_Hot_or_Not.py"]
+
+# Scripts whose first paint does not wait for pandas.
+LAZY_PANDAS = {"pages/2_Hot_or_Not.py"}
+
+
+def _pandas_before_bank() -> list[bool]:
+    """Record, when nucmed.data is first imported, whether pandas already was."""
+    seen: list[bool] = []
+
+    def hook(event: str, args: tuple) -> None:
+        if event == "import" and args[0] == "nucmed.data" and not seen:
+            seen.append("pandas" in sys.modules)
+
+    sys.addaudithook(hook)
+    return seen
+
+
+def _child(script: str, reruns: int) -> None:
+    # `streamlit run` puts the repository root on sys.path; do the same.
+    sys.path.insert(0, str(ROOT))
+    pandas_early = _pandas_before_bank()
+    started = time.perf_counter()
+
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+
+    at = AppTest.from_file(str(ROOT / script), default_timeout=60)
+    at.run()
+    first_paint = time.perf_counter()
+
+    if at.exception:
+        raise SystemExit(f"{script} raised: {at.exception}")
+    if script in LAZY_PANDAS and pandas_early[:1] != [False]:
+        raise SystemExit(f"{script} imported pandas before the question bank loaded")
+
+    rerun_times = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        rerun_times.append(time.perf_counter() - t0)
+
+    print(json.dumps({
+        "script": script,
+        "import_s": imported - started,
+        "first_paint_s": first_paint - started,
+        "rerun_median_s": statistics.median(rerun_times) if rerun_times else None,
+        "rerun_max_s": max(rerun_times) if rerun_times else None,
+    }))
+
+
+def measure(script: str, reruns: int) -> dict:
+    out = subprocess.run(
+        [sys.executable, __file__, "--child", "--reruns", str(reruns), script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode:
+        raise SystemExit(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else f"{script} failed")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _ms(value: float | None) -> str:
+    return "-" if value is None else f"{value * 1000:8.1f} ms"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scripts", nargs="*", default=SCRIPTS)
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.scripts[0], args.reruns)
+        return 0
+
+    print(f"{'script':<28}{'import':>12}{'first paint':>14}{'rerun p50':>12}{'rerun max':>12}")
+    for script in args.scripts:
+        r = measure(script, args.reruns)
+        print(
+            f"{script:<28}{_ms(r['import_s']):>12}{_ms(r['first_paint_s']):>14}"
+            f"{_ms(r['rerun_median_s']):>12}{_ms(r['rerun_max_s']):>12}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
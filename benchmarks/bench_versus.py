@@ -0,0 +1,233 @@
+"""
+End-to-end latency of Hot or Not versus mode.
+
+Starts `streamlit run app.py` on a free port and drives two sessions over
+the Streamlit websocket protocol, as two browser tabs would: A creates a
+match, B joins it by code, and B then answers questions. A behaves like a
+browser on the play screen, asking for its versus panel fragment every
+time the server's auto-rerun interval comes round, unless a run is going.
+
+Measured per answer: from B's click leaving the client to A receiving
+standings that count it. That covers B's rerun up to the answer callback,
+the hub, A's fragment poll and the fragment run. Each match gives up to
+--per-match samples, before B's round ends or A's HOT meter runs down.
+The server runs without the source file watcher, as a deployment would.
+
+Usage (from the repository root):
+    python benchmarks/bench_versus.py
+    python benchmarks/bench_versus.py --samples 40
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from streamlit import dataframe_util
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FULL_RUN_DONE = ForwardMsg.ScriptFinishedStatus.FINISHED_SUCCESSFULLY
+
+
+# ---------------------------------------------------------------------
+# A scripted browser tab
+# ---------------------------------------------------------------------
+class Tab:
+    def __init__(self, port: int) -> None:
+        self.url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        self.page_hash = ""
+        self.elements: dict[str, object] = {}   # label or key -> element proto of the last full run
+        self.markdown: list[str] = []
+        self.fragment: tuple[str, float] | None = None   # (fragment id, interval) while one auto-reruns
+        self.full_runs = asyncio.Queue()
+        self.running = False
+        self.opponent_answers = 0   # answers by others in the last standings received
+        self.standings = asyncio.Queue()   # times the standings showed more of them
+
+    async def open(self, page: str) -> None:
+        self.ws = await connect(self.url, subprotocols=["streamlit"], max_size=None)
+        self._reader = asyncio.ensure_future(self._read())
+        await self.rerun()
+        pages = self._pages
+        self.page_hash = next(p.page_script_hash for p in pages if page in p.page_name)
+        await self.rerun()
+
+    async def _read(self) -> None:
+        run: dict[str, object] = {}
+        markdown: list[str] = []
+        async for data in self.ws:
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+
+            if kind == "navigation":
+                self._pages = list(msg.navigation.app_pages)
+            elif kind == "new_session":
+                self.running = True
+                if not msg.new_session.fragment_ids_this_run:
+                    run, markdown = {}, []
+                    self.fragment = None
+            elif kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                widget = getattr(element, element.WhichOneof("type"))
+                if hasattr(widget, "label"):
+                    run[widget.label] = widget
+                if "-hon_answer_" in getattr(widget, "id", ""):
+                    run[widget.id.split("-", 2)[-1]] = widget   # by key: "$$ID-<hash>-<key>"
+                if element.WhichOneof("type") == "markdown":
+                    markdown.append(element.markdown.body)
+                if element.WhichOneof("type") == "dataframe":
+                    self._read_standings(element.dataframe)
+            elif kind == "auto_rerun":
+                self.fragment = (msg.auto_rerun.fragment_id, msg.auto_rerun.interval)
+            elif kind == "script_finished":
+                self.running = False
+                if msg.script_finished == FULL_RUN_DONE:
+                    self.elements, self.markdown = run, markdown
+                    self.full_runs.put_nowait(time.perf_counter())
+
+    def _read_standings(self, proto) -> None:
+        data = proto.arrow_data.data or proto.lazy_data.initial_chunk.data
+        table = dataframe_util.convert_arrow_bytes_to_pandas_df(data)
+        if "Answered" not in table.columns:
+            return
+        answers = int(table.loc[~table["Player"].str.endswith("(you)"), "Answered"].sum())
+        if answers > self.opponent_answers:
+            self.opponent_answers = answers
+            self.standings.put_nowait(time.perf_counter())
+
+    async def send(self, *states: WidgetState, fragment_id: str = "") -> None:
+        msg = BackMsg()
+        msg.rerun_script.page_script_hash = self.page_hash
+        msg.rerun_script.widget_states.widgets.extend(states)
+        if fragment_id:
+            msg.rerun_script.fragment_id = fragment_id
+            msg.rerun_script.is_auto_rerun = True
+        await self.ws.send(msg.SerializeToString())
+
+    async def rerun(self, *states: WidgetState) -> None:
+        """Send a full rerun and wait until it has finished."""
+        while not self.full_runs.empty():
+            self.full_runs.get_nowait()
+        await self.send(*states)
+        await asyncio.wait_for(self.full_runs.get(), timeout=60)
+
+    async def poll_fragment(self) -> None:
+        """What the browser does for st.fragment(run_every=...): no request while a run is going."""
+        while True:
+            if self.fragment is None:
+                await asyncio.sleep(0.01)
+                continue
+            fragment_id, interval = self.fragment
+            await asyncio.sleep(interval)
+            if not self.running:
+                await self.send(fragment_id=fragment_id)
+
+    def click(self, name: str) -> WidgetState:
+        return WidgetState(id=self.elements[name].id, trigger_value=True)
+
+    def text(self, name: str, value: str) -> WidgetState:
+        return WidgetState(id=self.elements[name].id, string_value=value)
+
+    async def close(self) -> None:
+        self._reader.cancel()
+        await self.ws.close()
+
+
+# ---------------------------------------------------------------------
+# Scenario
+# ---------------------------------------------------------------------
+async def play_match(port: int, per_match: int) -> list[float]:
+    a, b = Tab(port), Tab(port)
+    await a.open("Hot")
+    await b.open("Hot")
+
+    await a.rerun(a.click("Create match with these settings"))
+    code = next(m for m in a.markdown if "Versus match" in m).split("**")[1]
+
+    await b.rerun(b.text("Match code", code))
+    await b.rerun(b.text("Match code", code), b.click("Join match"))
+
+    poller = asyncio.ensure_future(a.poll_fragment())
+    samples = []
+    try:
+        while len(samples) < per_match and a.fragment is not None:
+            answer = next((k for k in b.elements if k.startswith("hon_answer_")), None)
+            if answer is None:   # B's round is over
+                break
+            clicked = time.perf_counter()
+            await b.send(b.click(answer))
+            shown = await asyncio.wait_for(a.standings.get(), timeout=10)
+            samples.append(shown - clicked)
+            await asyncio.wait_for(b.full_runs.get(), timeout=10)
+    finally:
+        poller.cancel()
+        await a.close()
+        await b.close()
+    return samples
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_healthy(port: int, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("streamlit exited before it was ready")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit("streamlit did not become healthy within 60s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--samples", type=int, default=20, help="answers to time")
+    parser.add_argument("--per-match", type=int, default=5, help="answers timed per match")
+    args = parser.parse_args(argv)
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false",
+         "--server.fileWatcherType", "none"],   # as deployed; the dev watcher polls on every run
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_healthy(port, server)
+        samples: list[float] = []
+        while len(samples) < args.samples:
+            # A match can end before its first sample (e.g. A's meter already ran down).
+            samples += asyncio.run(play_match(port, min(args.per_match, args.samples - len(samples))))
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    cuts = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+    print(f"{len(samples)} answers: opponent's screen updated in "
+          f"p50 {cuts[49] * 1000:.0f} ms, p95 {cuts[94] * 1000:.0f} ms, max {max(samples) * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
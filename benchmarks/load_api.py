@@ -0,0 +1,185 @@
+"""
+Load test for the JSON API (nucmed.api).
+
+Each virtual client loops: fetch a round, then score it (answering the
+first option of every question). Reports requests per second and latency
+percentiles per endpoint.
+
+Two targets:
+* in-process (default): the ASGI app is called directly, with no server or
+  sockets, which measures the engines plus the app itself;
+* --url: a running server, over keep-alive HTTP/1.1 connections (one per
+  virtual client), using only the standard library.
+
+Usage (from the repository root):
+    python benchmarks/load_api.py --clients 64 --seconds 10
+    python benchmarks/load_api.py --kinds mcq hot_or_not --seed-pool 1000
+    python -m nucmed.api --workers 8 &
+    python benchmarks/load_api.py --url http://127.0.0.1:8000 --clients 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parent.parent
+
+KINDS = ["flashcards", "mcq", "match", "hot_or_not"]
+
+
+# ---------------------------------------------------------------------
+# Transports: both return (status, parsed JSON body)
+# ---------------------------------------------------------------------
+class InProcess:
+    def __init__(self) -> None:
+        sys.path.insert(0, str(ROOT))
+        from nucmed import api
+
+        api.datasets()
+        self.app = api.app
+
+    async def request(self, method: str, target: str, body: bytes = b"") -> tuple[int, dict]:
+        path, _, query = target.partition("?")
+        scope = {"type": "http", "method": method, "path": path, "query_string": query.encode("ascii")}
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await self.app(scope, receive, send)
+        return sent[0]["status"], json.loads(sent[1]["body"])
+
+    async def close(self) -> None:
+        pass
+
+
+class Http:
+    """One keep-alive HTTP/1.1 connection."""
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.reader = self.writer = None
+
+    async def request(self, method: str, target: str, body: bytes = b"") -> tuple[int, dict]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        head = (
+            f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        )
+        self.writer.write(head.encode("ascii") + body)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        status = int(status_line.split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    async def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+# ---------------------------------------------------------------------
+# Load
+# ---------------------------------------------------------------------
+def _answers(kind: str, round_: dict) -> list:
+    if kind == "match":
+        return [{c: round_["pools"][c][0] if round_["pools"][c] else None for c in round_["columns"]} for _ in round_["rows"]]
+    return [item["options"][0] if item["options"] else None for item in round_["items"]]
+
+
+async def client(transport, args, deadline: float, latencies: dict, errors: list) -> None:
+    rng = random.Random()
+    try:
+        while time.perf_counter() < deadline:
+            kind = rng.choice(args.kinds)
+            seed = rng.randrange(args.seed_pool) if args.seed_pool else rng.randrange(2**31)
+
+            t0 = time.perf_counter()
+            status, round_ = await transport.request("GET", f"/v1/{kind}?seed={seed}&length={args.length}")
+            latencies[f"GET {kind}"].append(time.perf_counter() - t0)
+            if status != 200:
+                errors.append(f"GET {kind}: {status} {round_}")
+                continue
+
+            if kind == "flashcards":
+                continue
+
+            body = json.dumps({"token": round_["token"], "answers": _answers(kind, round_)}).encode("utf-8")
+            t0 = time.perf_counter()
+            status, scored = await transport.request("POST", "/v1/score", body)
+            latencies["POST score"].append(time.perf_counter() - t0)
+            if status != 200:
+                errors.append(f"score {kind}: {status} {scored}")
+    finally:
+        await transport.close()
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+async def run(args) -> int:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: list[str] = []
+
+    shared = None if args.url else InProcess()
+    transports = [Http(args.url) if args.url else shared for _ in range(args.clients)]
+
+    started = time.perf_counter()
+    deadline = started + args.seconds
+    await asyncio.gather(*(client(t, args, deadline, latencies, errors) for t in transports))
+    elapsed = time.perf_counter() - started
+
+    total = sum(len(v) for v in latencies.values())
+    rounds = sum(len(v) for k, v in latencies.items() if k.startswith("GET"))
+    print(f"{total:,} requests in {elapsed:.1f}s: {total / elapsed:,.0f} req/s, "
+          f"{rounds / elapsed:,.0f} rounds/s, {len(errors)} errors")
+    print(f"{'endpoint':<20}{'count':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, values in sorted(latencies.items()):
+        print(f"{name:<20}{len(values):>9,}"
+              + "".join(f"{_percentile(values, q) * 1000:>9.2f}" for q in (50, 95, 99)))
+    for error in errors[:5]:
+        print("error:", error, file=sys.stderr)
+
+    return 1 if errors else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running server (default: call the app in-process)")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent virtual clients")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=KINDS)
+    parser.add_argument("--length", type=int, default=10, help="questions (or match rows) per round")
+    parser.add_argument("--seed-pool", type=int, default=0,
+                        help="draw seeds from range(N) to model shared assignment seeds (0: every round is new)")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,291 @@
+"""
+Concurrency stress test for app.py and pages/2_Hot_or_Not.py.
+
+Hundreds of scripted sessions are driven with streamlit.testing.v1.AppTest.
+AppTest is not thread-safe (its script runs against a process-wide test
+runtime), so each worker process runs one session at a time and --workers
+sets the concurrency. Sessions in one process share its caches
+(cache_resource, the warm-up cache, the event log) the way sessions of one
+server process do. Each session plays one scenario:
+
+* flashcards: flip through cards with "Next";
+* mcq: answer multiple-choice questions and move on;
+* match: check Match-Up grids, shuffle and check again;
+* hot_or_not: play full Hot or Not rounds, clicking an answer until the
+  round ends.
+
+Reported: rerun latency percentiles per scenario (every AppTest run is one
+rerun); errors, counting script exceptions, exceptions raised in any thread
+and buttons a scenario expected but did not find; the pickled size of a
+session's state (what a serializing session store would hold); and memory
+per session, measured apart from the load run in a fresh process per
+scenario: the RSS growth while --memory-sessions finished sessions are kept
+alive, after warm-up sessions have loaded the imports and shared caches.
+Everything runs offline; nothing listens on a port.
+
+Usage (from the repository root):
+    python benchmarks/stress_sessions.py --sessions 200
+    python benchmarks/stress_sessions.py --sessions 400 --workers 4 --steps 40
+    python benchmarks/stress_sessions.py --scenarios hot_or_not --sessions 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCRIPTS = {
+    "flashcards": "app.py",
+    "mcq": "app.py",
+    "match": "app.py",
+    "hot_or_not": "pages/2_Hot_or_Not.py",
+}
+
+
+def _rss() -> int:
+    """Resident set size once garbage is collected and freed memory handed back."""
+    from nucmed.governor import _release
+
+    _release()
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+# ---------------------------------------------------------------------
+# Scenarios: each drives one AppTest and records every rerun's latency
+# ---------------------------------------------------------------------
+class Session:
+    def __init__(self, scenario: str, timeout: float) -> None:
+        from streamlit.testing.v1 import AppTest
+
+        self.scenario = scenario
+        self.at = AppTest.from_file(str(ROOT / SCRIPTS[scenario]), default_timeout=timeout)
+        self.latencies: list[float] = []
+        self.errors: list[str] = []
+
+    def run(self, element=None) -> None:
+        started = time.perf_counter()
+        (element or self.at).run()
+        self.latencies.append(time.perf_counter() - started)
+        if self.at.exception:
+            self.errors.append(str(self.at.exception[0].message))
+
+    def button(self, label: str):
+        return next((b for b in self.at.button if b.label == label), None)
+
+    def click(self, label: str) -> bool:
+        """Click a button the scenario expects; a missing one is an error."""
+        button = self.button(label)
+        if button is None:
+            self.errors.append(f"{self.scenario}: no {label!r} button")
+            return False
+        self.run(button.click())
+        return True
+
+    def choose_game(self, game: str) -> None:
+        picker = next(s for s in self.at.sidebar.selectbox if s.label == "Choose a game")
+        self.run(picker.select(game))
+
+    def state_bytes(self) -> int:
+        state = self.at.session_state
+        values = {key: state[key] for key in state}
+        try:
+            return len(pickle.dumps(values))
+        except Exception:
+            # Futures, locks and the like cannot be pickled; size the rest.
+            return sum(len(pickle.dumps(v)) for v in values.values() if _picklable(v))
+
+
+def _picklable(value) -> bool:
+    try:
+        pickle.dumps(value)
+    except Exception:
+        return False
+    return True
+
+
+def play_flashcards(session: Session, steps: int) -> None:
+    for _ in range(steps):
+        if not session.click("Next ▶"):
+            break
+
+
+def play_mcq(session: Session, steps: int) -> None:
+    session.choose_game("Multiple Choice")
+    for _ in range(steps):
+        if session.at.radio:
+            session.at.radio[0].set_value(session.at.radio[0].options[0])
+        if not session.click("Submit ✅"):
+            break
+        session.click("Next ▶")
+
+
+def play_match(session: Session, steps: int) -> None:
+    session.choose_game("Multiple Match")
+    for _ in range(steps):
+        if not session.click("Check Answers ✅"):
+            break
+        session.click("Shuffle 🔀")
+
+
+def play_hot_or_not(session: Session, steps: int) -> None:
+    session.click("Start Round ▶")
+    for _ in range(steps):
+        answers = [b for b in session.at.button if (b.key or "").startswith("hon_answer_")]
+        if answers:
+            session.run(answers[0].click())
+        elif not session.click("Play Again 🔁"):
+            break
+
+
+PLAYERS = {
+    "flashcards": play_flashcards,
+    "mcq": play_mcq,
+    "match": play_match,
+    "hot_or_not": play_hot_or_not,
+}
+
+
+def drive(scenario: str, steps: int, timeout: float) -> Session:
+    session = Session(scenario, timeout)
+    session.run()
+    PLAYERS[scenario](session, steps)
+    return session
+
+
+# ---------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------
+_thread_errors: list[str] = []
+
+
+def _record_thread_error(args: threading.ExceptHookArgs) -> None:
+    # AppTest runs the script in its own thread; an exception that escapes
+    # it never reaches at.exception.
+    name = args.thread.name if args.thread else "thread"
+    _thread_errors.append(f"{name}: {args.exc_type.__name__}: {args.exc_value}")
+
+
+def _setup() -> None:
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))   # `streamlit run` does the same
+    threading.excepthook = _record_thread_error
+
+
+def worker(scenarios: list[str], steps: int, timeout: float) -> dict:
+    """Play scenarios one session at a time."""
+    _setup()
+
+    latencies = defaultdict(list)
+    errors, state_bytes = [], []
+    started = time.perf_counter()
+    for scenario in scenarios:
+        session = drive(scenario, steps, timeout)
+        latencies[scenario].extend(session.latencies)
+        errors.extend(session.errors)
+        state_bytes.append(session.state_bytes())
+
+    return {
+        "latencies": dict(latencies),
+        "errors": errors + _thread_errors,
+        "state_bytes": state_bytes,
+        "elapsed": time.perf_counter() - started,
+    }
+
+
+def session_memory(scenario: str, steps: int, timeout: float, sessions: int) -> dict:
+    """RSS growth per finished session of one scenario; run in a fresh process."""
+    _setup()
+
+    # Warm-up sessions load the imports and shared caches, and are kept
+    # alive so the sessions measured cannot reuse their memory.
+    warm = [drive(scenario, steps, timeout) for _ in range(2)]
+    baseline = _rss()
+
+    kept = [drive(scenario, steps, timeout) for _ in range(sessions)]
+    grown = _rss() - baseline
+
+    return {
+        "scenario": scenario,
+        "bytes": grown / sessions,
+        "errors": [e for s in warm + kept for e in s.errors] + _thread_errors,
+    }
+
+
+# ---------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------
+def _percentiles(values: list[float]) -> tuple[float, float, float]:
+    if len(values) < 2:
+        return (values[0],) * 3 if values else (float("nan"),) * 3
+    cuts = statistics.quantiles(values, n=100)
+    return cuts[49], cuts[94], cuts[98]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=100, help="total sessions")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes, i.e. sessions running at once")
+    parser.add_argument("--steps", type=int, default=20, help="interactions per session")
+    parser.add_argument("--scenarios", nargs="+", choices=list(PLAYERS), default=list(PLAYERS))
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds allowed per rerun")
+    parser.add_argument("--memory-sessions", type=int, default=10,
+                        help="sessions kept alive per scenario for the memory measurement; 0 skips it")
+    args = parser.parse_args()
+
+    plan = [args.scenarios[i % len(args.scenarios)] for i in range(args.sessions)]
+    shares = [plan[w :: args.workers] for w in range(args.workers)]
+    shares = [share for share in shares if share]
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(shares)) as pool:
+        results = list(pool.map(worker, shares, [args.steps] * len(shares), [args.timeout] * len(shares)))
+    wall = time.perf_counter() - started
+
+    memory = []
+    if args.memory_sessions > 0:
+        n = len(args.scenarios)
+        with ProcessPoolExecutor(max_workers=min(n, args.workers), max_tasks_per_child=1) as pool:
+            memory = list(pool.map(
+                session_memory, args.scenarios, [args.steps] * n, [args.timeout] * n, [args.memory_sessions] * n,
+            ))
+
+    latencies = defaultdict(list)
+    for result in results:
+        for scenario, values in result["latencies"].items():
+            latencies[scenario].extend(values)
+    everything = [v for values in latencies.values() for v in values]
+    errors = [e for r in results + memory for e in r["errors"]]
+
+    print(f"{args.sessions} sessions in {len(shares)} process(es), {len(everything):,} reruns "
+          f"in {wall:.1f}s ({len(everything) / wall:,.1f} reruns/s), {len(errors)} errors")
+    print(f"{'scenario':<14}{'reruns':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for scenario, values in sorted(latencies.items()) + [("all", everything)]:
+        p50, p95, p99 = _percentiles(values)
+        print(f"{scenario:<14}{len(values):>8,}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}{p99 * 1000:>10.1f}")
+
+    state_sizes = [b for r in results for b in r["state_bytes"]]
+    print(f"pickled state per session: {statistics.median(state_sizes) / 1024:,.1f} KiB (median), "
+          f"{max(state_sizes) / 1024:,.1f} KiB (max)")
+    for result in memory:
+        print(f"memory per {result['scenario']} session: {result['bytes'] / 1024:,.0f} KiB RSS growth "
+              f"({args.memory_sessions} kept alive, fresh process)")
+
+    for error in sorted(set(errors))[:5]:
+        print("error:", error, file=sys.stderr)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
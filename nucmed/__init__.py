@@ -0,0 +1,7 @@
+"""
+Shared, Streamlit-free building blocks for the NucMed Trivia Trainer.
+
+The Streamlit scripts (app.py and pages/) handle layout and session state;
+anything that has to be shared across sessions or reused outside the UI
+lives here.
+"""
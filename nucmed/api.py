@@ -0,0 +1,366 @@
+"""
+JSON HTTP API over the quiz engines, for clients that cannot use the
+Streamlit pages (mobile apps, LMS integrations).
+
+A bare ASGI application with no framework dependency; serve it with any
+ASGI server:
+    pip install uvicorn
+    python -m nucmed.api --port 8000 --workers 4
+    uvicorn nucmed.api:app --workers 4
+
+Endpoints:
+    GET  /health
+    GET  /v1/flashcards?seed=&length=&front=&back=
+    GET  /v1/mcq?seed=&length=&ask=&identify=
+    GET  /v1/match?seed=&length=&base=&targets=a,b
+    GET  /v1/hot_or_not?seed=&length=&fact_types=a,b&max_difficulty=
+    POST /v1/score   {"token": ..., "answers": [...]}
+
+The server keeps no per-client state. Every round response carries a token:
+the kind, parameters and seed of the round, signed with HMAC. /v1/score
+rebuilds the round from the token with the same engines as the app and
+exporter (a seed fully determines a round) and scores the answers against
+it. Recently built rounds are kept in an LRU cache, so scoring a round just
+handed out does not rebuild it. Set NUCMED_API_SECRET so tokens stay valid
+across restarts. Without it, `python -m nucmed.api` makes one random key
+and hands it to all of its workers; a server started some other way (e.g.
+`uvicorn --workers 4`) must set it, or each process signs with its own key.
+
+The deck is the merged bundled CSVs (as on the main page) and the question
+bank is data/hot_or_not/, each loaded once per process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import math
+import os
+import secrets
+from argparse import Namespace
+from functools import lru_cache
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from nucmed import governor, sessions, warmup
+from nucmed.export import BUILDERS
+from nucmed.hot_or_not import RoundGenerationError, calculate_xp_for_answer
+
+
+SECRET = os.environ.get("NUCMED_API_SECRET", "").encode("utf-8") or secrets.token_bytes(32)
+
+MAX_LENGTH = 200
+MAX_MATCH_ROWS = 500
+ROUND_CACHE_SIZE = 4096
+MAX_BODY_BYTES = 1024 * 1024   # a full 500-row match answer sheet is well under this
+
+# Query parameters of each round kind, with their defaults.
+PARAMETERS = {
+    "flashcards": {"length": 20, "front": "Radiopharmaceutical", "back": "Uses"},
+    "mcq": {"length": 20, "ask": "Radiopharmaceutical", "identify": "Uses"},
+    "match": {"length": 6, "base": "Radiopharmaceutical", "targets": ("Mechanism of Localization",)},
+    "hot_or_not": {"length": 20, "fact_types": (), "max_difficulty": 5},
+}
+
+
+class BadRequest(ValueError):
+    """The request cannot be served; the message is returned to the client."""
+
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# ---------------------------------------------------------------------
+# Data and rounds
+# ---------------------------------------------------------------------
+def datasets():
+    """(deck, question bank) from the process-wide warm-up cache."""
+    return warmup.default_deck(), warmup.question_bank()
+
+
+@lru_cache(maxsize=ROUND_CACHE_SIZE)
+def build_round(kind: str, params: tuple, seed: int) -> tuple:
+    deck, bank = datasets()
+    args = Namespace(**{k: list(v) if isinstance(v, tuple) else v for k, v in params})
+    rng = np.random.default_rng(seed)
+
+    try:
+        items = BUILDERS[kind](bank if kind == "hot_or_not" else deck, args, rng)
+    except RoundGenerationError as exc:
+        raise BadRequest(str(exc), status=422) from exc
+
+    # Shared between requests through the cache, so keep it immutable.
+    return tuple(items)
+
+
+def parse_params(kind: str, query: dict[str, list[str]]) -> tuple:
+    deck, _ = datasets()
+    params = {}
+
+    for name, default in PARAMETERS[kind].items():
+        values = query.get(name)
+        if not values:
+            params[name] = default
+        elif isinstance(default, tuple):
+            params[name] = tuple(v.strip() for value in values for v in value.split(",") if v.strip())
+        elif isinstance(default, int):
+            try:
+                params[name] = int(values[-1])
+            except ValueError:
+                raise BadRequest(f"{name} must be an integer") from None
+        else:
+            params[name] = values[-1]
+
+    limit = MAX_MATCH_ROWS if kind == "match" else MAX_LENGTH
+    if not 1 <= params["length"] <= limit:
+        raise BadRequest(f"length must be between 1 and {limit}")
+
+    if kind != "hot_or_not":
+        columns = [params[k] for k in ("front", "back", "ask", "identify", "base") if k in params]
+        columns += list(params.get("targets", ()))
+        missing = [c for c in columns if c not in deck.columns]
+        if missing:
+            raise BadRequest(f"unknown column(s): {', '.join(missing)}")
+        if kind == "match" and not params["targets"]:
+            raise BadRequest("match needs at least one target column")
+
+    return tuple(sorted(params.items()))
+
+
+# ---------------------------------------------------------------------
+# Round tokens
+# ---------------------------------------------------------------------
+def _sign(payload: bytes) -> str:
+    return hmac.new(SECRET, payload, hashlib.sha256).hexdigest()[:24]
+
+
+def make_token(kind: str, params: tuple, seed: int) -> str:
+    body = json.dumps([kind, params, seed], separators=(",", ":")).encode("utf-8")
+    payload = base64.urlsafe_b64encode(body).rstrip(b"=")
+    return f"{payload.decode('ascii')}.{_sign(payload)}"
+
+
+def read_token(token: str) -> tuple[str, tuple, int]:
+    try:
+        payload, signature = token.encode("ascii").split(b".")
+    except (AttributeError, UnicodeEncodeError, ValueError):
+        raise BadRequest("malformed token") from None
+
+    if not hmac.compare_digest(signature.decode("ascii"), _sign(payload)):
+        raise BadRequest("invalid token signature", status=403)
+
+    kind, params, seed = json.loads(base64.urlsafe_b64decode(payload + b"=" * (-len(payload) % 4)))
+    params = tuple((name, tuple(value) if isinstance(value, list) else value) for name, value in params)
+    return kind, params, int(seed)
+
+
+# ---------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------
+def handle_round(kind: str, query: dict[str, list[str]]) -> dict:
+    params = parse_params(kind, query)
+
+    seed_values = query.get("seed")
+    try:
+        seed = int(seed_values[-1]) if seed_values else secrets.randbits(31)
+    except ValueError:
+        raise BadRequest("seed must be an integer") from None
+    if seed < 0:
+        raise BadRequest("seed must not be negative")
+
+    items = build_round(kind, params, seed)
+    response = {"kind": kind, "seed": seed, "token": make_token(kind, params, seed)}
+
+    if kind == "flashcards":
+        response["items"] = [{"front": item["prompt"], "back": item["answer"]} for item in items]
+    elif kind == "match":
+        targets = list(dict(params)["targets"])
+        response["columns"] = targets
+        response["rows"] = [item["prompt"] for item in items]
+        response["pools"] = items[0]["pools"] if items else {t: [] for t in targets}
+    else:
+        response["items"] = [{"prompt": item["prompt"], "options": item["options"]} for item in items]
+
+    return response
+
+
+def handle_score(body: dict) -> dict:
+    if not isinstance(body, dict) or "token" not in body:
+        raise BadRequest('expected {"token": ..., "answers": [...]}')
+
+    kind, params, seed = read_token(body["token"])
+    if kind == "flashcards":
+        raise BadRequest("flashcards are not scored")
+
+    items = build_round(kind, params, seed)
+    answers = body.get("answers") or []
+    if not isinstance(answers, list) or len(answers) > len(items):
+        raise BadRequest(f"answers must be a list of at most {len(items)} entries")
+
+    if kind == "match":
+        targets = list(dict(params)["targets"])
+        key = np.array([[item["answers"][t] for t in targets] for item in items], dtype=object)
+        given = np.full(key.shape, None, dtype=object)
+        for row, answer in enumerate(answers):
+            if isinstance(answer, dict):
+                given[row] = [answer.get(t) for t in targets]
+        hits = given == key
+        return {
+            "correct": int(hits.sum()),
+            "total": int(hits.size),
+            "results": [dict(zip(targets, map(bool, row))) for row in hits],
+            "answers": [item["answers"] for item in items],
+        }
+
+    # mcq and hot_or_not: one option per question, as a string or as
+    # {"option": ..., "time": seconds} (the time earns Hot or Not speed bonuses).
+    results, xp, streak = [], 0, 0
+    for item, answer in zip(items, answers):
+        option, answer_time = (answer.get("option"), answer.get("time")) if isinstance(answer, dict) else (answer, None)
+        is_correct = option == item["answer"]
+        results.append(is_correct)
+
+        if kind == "hot_or_not":
+            if answer_time is None:
+                answer_time = float("inf")   # no time given: no speed bonus
+            elif isinstance(answer_time, bool) or not isinstance(answer_time, (int, float)) or math.isnan(answer_time):
+                raise BadRequest("time must be a number")
+            elif answer_time < 0:
+                raise BadRequest("time must not be negative")
+
+            streak = streak + 1 if is_correct else 0
+            earned, _ = calculate_xp_for_answer(is_correct=is_correct, answer_time=float(answer_time), streak=streak)
+            xp += earned
+
+    response = {
+        "correct": sum(results),
+        "total": len(items),
+        "results": results,
+        "answers": [item["answer"] for item in items],
+    }
+    if kind == "hot_or_not":
+        response["xp"] = xp
+    return response
+
+
+def route(method: str, path: str, query: dict[str, list[str]], body: bytes) -> tuple[int, dict]:
+    if path == "/health":
+        deck, bank = datasets()
+        memory, _ = sessions.memory_bytes()
+        return 200, {
+            "status": "ok",
+            "ready": warmup.is_ready(),
+            "cards": len(deck),
+            "questions": len(bank),
+            "memory_bytes": memory,
+        }
+
+    if path == "/v1/score":
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise BadRequest("body is not valid JSON") from None
+        return 200, handle_score(payload)
+
+    if path.startswith("/v1/"):
+        kind = path[len("/v1/"):]
+        if kind in PARAMETERS:
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, handle_round(kind, query)
+
+    return 404, {"error": f"no route for {path}"}
+
+
+# ---------------------------------------------------------------------
+# ASGI
+# ---------------------------------------------------------------------
+async def _read_body(scope, receive) -> bytes:
+    too_large = BadRequest(f"request body over {MAX_BODY_BYTES} bytes", status=413)
+    for name, value in scope.get("headers", ()):
+        if name == b"content-length" and value.isdigit() and int(value) > MAX_BODY_BYTES:
+            raise too_large
+
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > MAX_BODY_BYTES:   # no (or a wrong) Content-Length
+            raise too_large
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                warmup.warm_up()   # load before the first request, not during it
+                governor.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    if scope["type"] != "http":
+        return
+
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+
+    try:
+        body = await _read_body(scope, receive) if scope["method"] == "POST" else b""
+        # Building a round is CPU work; keep the event loop free to accept
+        # and read other requests meanwhile.
+        status, payload = await asyncio.to_thread(route, scope["method"], scope["path"], query, body)
+    except BadRequest as exc:
+        status, payload = exc.status, {"error": str(exc)}
+
+    data = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(data)).encode("ascii")),
+        ],
+    })
+    await send({"type": "http.response.body", "body": data})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m nucmed.api",
+        description="Serve the quiz engines as a JSON HTTP API.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="server processes")
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        parser.exit(1, "error: serving needs an ASGI server (pip install uvicorn)\n")
+
+    # Worker processes import this module afresh; they must all sign with
+    # the same key, or a token from one is rejected by the others.
+    if args.workers > 1 and not os.environ.get("NUCMED_API_SECRET"):
+        os.environ["NUCMED_API_SECRET"] = secrets.token_hex(32)
+
+    uvicorn.run("nucmed.api:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
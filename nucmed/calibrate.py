@@ -0,0 +1,216 @@
+"""
+Difficulty recalibration from the answer-event log.
+
+Fits a Rasch (one-parameter IRT) model, P(correct) = sigmoid(ability -
+difficulty), by streaming the log one record batch at a time. Each batch
+makes one vectorized, Elo-style step: residuals are summed per question
+and per player with np.bincount and every rating moves by its mean
+residual. Memory is bounded by the number of distinct questions and
+players, not by the length of the history.
+
+Each question's fitted rating is turned into the chance that an average
+player answers it correctly, and that chance is bucketed onto the 1-5
+scale. Questions that are also slow (mean answer time above --slow-seconds)
+go up one step. The result is written as an overlay CSV that read_questions
+merges at load time. Questions with too few answers are left out, so they
+keep their hand-assigned difficulty.
+
+Usage:
+    python -m nucmed.calibrate
+    python -m nucmed.calibrate --events data/events --min-answers 50 --epochs 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nucmed.data import DIFFICULTY_OVERLAY_NAME, QUESTIONS_DIR
+from nucmed.events import HAS_PYARROW, iter_segments
+
+
+EVENTS_DIR = Path("data/events")
+
+# Lower bounds on P(correct) for an average player, for difficulty 1..4;
+# anything below the last bound is difficulty 5.
+ACCURACY_BANDS = (0.90, 0.80, 0.65, 0.50)
+
+
+class _Ids:
+    """String -> dense int id, growing as new keys appear."""
+
+    def __init__(self) -> None:
+        self.index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def encode(self, column) -> np.ndarray:
+        # Dictionary-encoded columns only need their (small) dictionary mapped.
+        if hasattr(column, "dictionary"):
+            keys = column.dictionary.to_pylist()
+            codes = np.fromiter((self._id(k) for k in keys), dtype=np.int64, count=len(keys))
+            return codes[column.indices.to_numpy(zero_copy_only=False)]
+        return np.fromiter((self._id(k) for k in column.to_pylist()), dtype=np.int64)
+
+    def _id(self, key) -> int:
+        key = "" if key is None else str(key)
+        found = self.index.get(key)
+        if found is None:
+            found = self.index[key] = len(self.index)
+        return found
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class RaschCalibrator:
+    def __init__(self, learning_rate: float = 0.5) -> None:
+        self.learning_rate = learning_rate
+        self.questions = _Ids()
+        self.players = _Ids()
+        self.difficulty = np.zeros(1024)
+        self.ability = np.zeros(1024)
+        self.answers = np.zeros(1024, dtype=np.int64)
+        self.correct = np.zeros(1024, dtype=np.int64)
+        self.time_sum = np.zeros(1024)
+
+    def update(self, batch, count_stats: bool) -> int:
+        q = self.questions.encode(batch.column("question_id"))
+        # Sessions, not names: anonymous players have no name, and one name
+        # can be shared by several people.
+        p = self.players.encode(batch.column("session"))
+        y = batch.column("is_correct").to_numpy(zero_copy_only=False).astype(float)
+        t = batch.column("answer_time").to_numpy(zero_copy_only=False).astype(float)
+
+        nq, npl = len(self.questions), len(self.players)
+        self.difficulty = _grow(self.difficulty, nq)
+        self.answers = _grow(self.answers, nq)
+        self.correct = _grow(self.correct, nq)
+        self.time_sum = _grow(self.time_sum, nq)
+        self.ability = _grow(self.ability, npl)
+
+        if count_stats:
+            self.answers[:nq] += np.bincount(q, minlength=nq)
+            self.correct[:nq] += np.bincount(q, weights=y, minlength=nq).astype(np.int64)
+            self.time_sum[:nq] += np.bincount(q, weights=np.nan_to_num(t), minlength=nq)
+
+        expected = 1.0 / (1.0 + np.exp(self.difficulty[q] - self.ability[p]))
+        residual = y - expected
+
+        q_n = np.maximum(np.bincount(q, minlength=nq), 1)
+        p_n = np.maximum(np.bincount(p, minlength=npl), 1)
+        self.difficulty[:nq] -= self.learning_rate * np.bincount(q, weights=residual, minlength=nq) / q_n
+        self.ability[:npl] += self.learning_rate * np.bincount(p, weights=residual, minlength=npl) / p_n
+
+        return len(y)
+
+    def recenter(self) -> None:
+        """Pin the mean question difficulty at 0; the model only fixes differences."""
+        nq = len(self.questions)
+        if nq:
+            shift = self.difficulty[:nq].mean()
+            self.difficulty[:nq] -= shift
+            self.ability[: len(self.players)] -= shift
+
+    def results(self, min_answers: int, slow_seconds: float) -> pd.DataFrame:
+        nq = len(self.questions)
+        answers = self.answers[:nq]
+        keep = answers >= min_answers
+
+        rating = self.difficulty[:nq]
+        p_average = 1.0 / (1.0 + np.exp(rating - self.ability[: len(self.players)].mean()))
+        bucket = 1 + np.sum(p_average[:, None] < np.array(ACCURACY_BANDS)[None, :], axis=1)
+        mean_time = self.time_sum[:nq] / np.maximum(answers, 1)
+        difficulty = np.clip(bucket + (mean_time > slow_seconds), 1, 5)
+
+        frame = pd.DataFrame({
+            "question_id": list(self.questions.index),
+            "difficulty": difficulty,
+            "rating": rating.round(3),
+            "expected_accuracy": p_average.round(3),
+            "answers": answers,
+            "accuracy": (self.correct[:nq] / np.maximum(answers, 1)).round(3),
+            "mean_time": mean_time.round(2),
+        })
+        return frame[keep].sort_values("question_id").reset_index(drop=True)
+
+
+def calibrate(
+    events_dir: Path,
+    epochs: int = 2,
+    learning_rate: float = 0.5,
+    min_answers: int = 20,
+    slow_seconds: float = 6.0,
+) -> tuple[pd.DataFrame, int]:
+    calibrator = RaschCalibrator(learning_rate)
+    seen = 0
+
+    for epoch in range(epochs):
+        for batch in iter_segments(events_dir):
+            n = calibrator.update(batch, count_stats=epoch == 0)
+            if epoch == 0:
+                seen += n
+        calibrator.recenter()
+
+    return calibrator.results(min_answers, slow_seconds), seen
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m nucmed.calibrate",
+        description="Fit question difficulties from the answer log and write an overlay.",
+    )
+    parser.add_argument("--events", default=str(EVENTS_DIR), help="answer-event log directory")
+    parser.add_argument(
+        "--out",
+        default=str(QUESTIONS_DIR.parent / DIFFICULTY_OVERLAY_NAME),
+        help="overlay CSV that read_questions merges",
+    )
+    parser.add_argument("--epochs", type=int, default=2, help="passes over the log")
+    parser.add_argument("--learning-rate", type=float, default=0.5)
+    parser.add_argument("--min-answers", type=int, default=20, help="skip questions with fewer answers")
+    parser.add_argument("--slow-seconds", type=float, default=6.0, help="mean time that adds one step")
+    args = parser.parse_args(argv)
+
+    if not HAS_PYARROW:
+        parser.exit(1, "error: reading the answer log needs pyarrow (pip install pyarrow)\n")
+
+    started = time.perf_counter()
+    overlay, seen = calibrate(
+        Path(args.events),
+        epochs=args.epochs,
+        learning_rate=args.learning_rate,
+        min_answers=args.min_answers,
+        slow_seconds=args.slow_seconds,
+    )
+    elapsed = time.perf_counter() - started
+
+    if overlay.empty:
+        print(f"No question has {args.min_answers}+ answers in {seen:,} events; nothing written.", file=sys.stderr)
+        return 1
+
+    out = Path(args.out)
+    tmp = out.with_suffix(out.suffix + ".tmp")
+    overlay.to_csv(tmp, index=False)
+    tmp.replace(out)
+
+    print(
+        f"Calibrated {len(overlay):,} questions from {seen:,} answers in {elapsed:.2f}s -> {out}",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,259 @@
+"""
+Dataset loaders shared by the Streamlit pages and the offline tools.
+
+These return plain DataFrames; the pages wrap them in Streamlit caches.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+
+
+DECK_PATH = Path("radionuclides_info.csv")
+MASTER_DECK_PATH = Path("radionuclides_radiopharmaceuticals_master.csv")
+QUESTIONS_DIR = Path("data/hot_or_not")
+
+# Rows of merged decks with the same (normalized) values here are one card.
+DECK_KEY_COLUMNS = ("Radionuclide", "Radiopharmaceutical")
+
+# Written by `python -m nucmed.calibrate`, next to the question directory.
+DIFFICULTY_OVERLAY_NAME = "difficulty_overlay.csv"
+
+
+def fingerprint(df: pd.DataFrame) -> str:
+    """
+    Content hash of a frame.
+
+    Together with the settings and a seed it identifies a generated round,
+    so it is safe to use as a cache key across sessions.
+    """
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def read_deck(source=None) -> pd.DataFrame:
+    """
+    Load a card deck CSV (the bundled radionuclide table by default).
+
+    Column names are stripped and a stable __row_id column is added.
+    """
+    df = pd.read_csv(source) if source else pd.read_csv(DECK_PATH)
+    df.columns = df.columns.str.strip()
+    df = df.reset_index().rename(columns={"index": "__row_id"})
+    return df
+
+
+def _column_key(name: str) -> str:
+    # "Radiopharmaceutical " and "radiopharmaceutical" are the same column.
+    return re.sub(r"\s+", " ", str(name)).strip().casefold()
+
+
+def _strip_text(series: pd.Series) -> pd.Series:
+    """Strip string cells and turn empty ones into NaN; other values pass through."""
+    stripped = series.str.strip()
+    series = stripped.where(stripped.notna(), series)
+    return series.mask(series == "")
+
+
+def _normalize_text(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.replace(r"\s+", " ", regex=True).str.strip().str.casefold()
+
+
+def merge_decks(sources: Iterable, key_columns: Iterable[str] = DECK_KEY_COLUMNS) -> pd.DataFrame:
+    """
+    Load several card deck CSVs into one deduplicated deck.
+
+    Columns are aligned by normalized name; the spelling seen first is kept.
+    Rows are keyed by a hash of their normalized key_columns (or of every
+    column if the deck has none of them). Rows sharing a key become one card
+    that takes, column by column, the first non-empty value in source order,
+    so a card found in two decks gets the columns of both.
+
+    Each file is read once and everything is concatenated in a single call,
+    so the cost is linear in the total number of rows.
+    """
+    names: dict[str, str] = {}   # column key -> display name
+    frames = []
+
+    for source in sources:
+        df = pd.read_csv(source)
+        renamed = {}
+        for col in df.columns:
+            display = re.sub(r"\s+", " ", str(col)).strip()
+            renamed[col] = names.setdefault(_column_key(col), display)
+        df = df.rename(columns=renamed)
+        # Two spellings of one column in the same file: keep the first.
+        frames.append(df.loc[:, ~df.columns.duplicated()])
+
+    if not frames:
+        return pd.DataFrame(columns=["__row_id"])
+
+    combined = pd.concat(frames, ignore_index=True, sort=False)
+
+    text_cols = combined.select_dtypes(include=["object", "string"]).columns
+    combined[text_cols] = combined[text_cols].apply(_strip_text)
+
+    wanted = {_column_key(k) for k in key_columns}
+    keys = [c for c in combined.columns if _column_key(c) in wanted]
+    content = combined[keys or list(combined.columns)].apply(_normalize_text).fillna("")
+    row_key = pd.util.hash_pandas_object(content, index=False).to_numpy()
+
+    deck = combined.groupby(row_key, sort=False).first()
+    deck = deck.dropna(axis=1, how="all").reset_index(drop=True)
+    deck = deck.reset_index().rename(columns={"index": "__row_id"})
+    return deck
+
+
+def read_questions(data_dir: Path, overlay_path: Path | None = None) -> pd.DataFrame:
+    """
+    Load Hot or Not fact files from data/hot_or_not/.
+
+    Expected file format for each PSV:
+        item_id|radionuclide|prompt|correct_option|explanation|difficulty
+
+    Optional columns:
+        distractor_group
+
+    The fact_type is inferred from the filename.
+    Example:
+        half_life.psv -> fact_type = "half_life"
+
+    If a difficulty overlay (question_id,difficulty) exists, by default
+    data/difficulty_overlay.csv, its calibrated values replace the
+    hand-assigned ones for the questions it lists.
+    """
+    if not data_dir.exists():
+        return pd.DataFrame()
+
+    required_columns = {
+        "item_id",
+        "radionuclide",
+        "prompt",
+        "correct_option",
+        "explanation",
+        "difficulty",
+    }
+
+    base_columns = [
+        "question_id",
+        "item_id",
+        "radionuclide",
+        "fact_type",
+        "prompt",
+        "correct_option",
+        "explanation",
+        "difficulty",
+    ]
+
+    supported_optional_columns = [
+        "distractor_group",
+    ]
+
+    frames = []
+
+    for path in sorted(data_dir.glob("*.psv")):
+        fact_type = path.stem
+
+        # Skip empty placeholder files.
+        if path.stat().st_size == 0:
+            continue
+
+        try:
+            df = pd.read_csv(path, sep="|", quotechar='"', skip_blank_lines=True)
+        except pd.errors.EmptyDataError:
+            continue
+
+        df.columns = df.columns.str.strip()
+
+        # Skip files that only have a header and no rows.
+        if df.empty:
+            continue
+
+        missing = required_columns - set(df.columns)
+        if missing:
+            raise ValueError(
+                f"{path.name} is missing required column(s): "
+                f"{', '.join(sorted(missing))}"
+            )
+
+        df = df.copy()
+        df["fact_type"] = fact_type
+        df["question_id"] = (
+            df["fact_type"].astype(str) + "_" + df["item_id"].astype(str)
+        )
+
+        df["difficulty"] = (
+            pd.to_numeric(df["difficulty"], errors="coerce")
+            .fillna(1)
+            .astype(int)
+            .clip(1, 5)
+        )
+
+        optional_columns = [
+            col for col in supported_optional_columns if col in df.columns
+        ]
+
+        frames.append(df[base_columns + optional_columns])
+
+    if not frames:
+        return pd.DataFrame()
+
+    combined = pd.concat(frames, ignore_index=True)
+
+    # Basic cleanup
+    text_cols = [
+        "question_id",
+        "item_id",
+        "radionuclide",
+        "fact_type",
+        "prompt",
+        "correct_option",
+        "explanation",
+        "distractor_group",
+    ]
+
+    for col in text_cols:
+        if col in combined.columns:
+            combined[col] = combined[col].astype(str).str.strip()
+
+    combined = combined.dropna(subset=["radionuclide", "correct_option"])
+    combined = combined[combined["correct_option"].str.len() > 0]
+
+    # Normalize optional distractor_group.
+    # If a file does not have distractor_group, fall back to correct_option.
+    # This preserves old behavior while letting emission.psv opt into smarter grouping.
+    if "distractor_group" not in combined.columns:
+        combined["distractor_group"] = combined["correct_option"]
+    else:
+        combined["distractor_group"] = combined["distractor_group"].fillna("")
+        combined.loc[
+            combined["distractor_group"].str.len() == 0,
+            "distractor_group",
+        ] = combined["correct_option"]
+
+    if overlay_path is None:
+        overlay_path = data_dir.parent / DIFFICULTY_OVERLAY_NAME
+
+    if overlay_path.exists():
+        overlay = (
+            pd.read_csv(overlay_path, usecols=["question_id", "difficulty"])
+            .drop_duplicates("question_id", keep="last")
+            .set_index("question_id")["difficulty"]
+        )
+        combined["difficulty"] = (
+            pd.to_numeric(combined["question_id"].map(overlay), errors="coerce")
+            .fillna(combined["difficulty"])
+            .astype(int)
+            .clip(1, 5)
+        )
+
+    # Rounds store positional row indices into this frame, so keep the
+    # index a plain 0..n-1 range.
+    return combined.reset_index(drop=True)
+
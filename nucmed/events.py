@@ -0,0 +1,253 @@
+"""
+Hot or Not answer-event log and analytics.
+
+Every answer is appended to an in-memory buffer. The buffer is flushed as an
+Arrow record batch once it holds flush_rows events, by a background timer
+once its oldest event is flush_seconds old (so a quiet server still shows
+its last answers to the Analytics page), and at interpreter exit. Batches go to Arrow IPC stream segments
+(*.arrows) that are rotated after segment_rows events, so a crash loses at
+most the unflushed buffer and never corrupts a closed segment.
+
+The analytics helpers read every segment into one Arrow table and then use
+vectorized pandas group-bys, which handle millions of events in well under
+a second.
+
+This needs pyarrow, which is optional:
+    pip install pyarrow
+Without it, EventLog accepts and drops events, and HAS_PYARROW is False.
+
+pandas is imported inside the reading and analytics functions, so the play
+pages can log answers without importing it before the bank loads.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+SEGMENT_SUFFIX = ".arrows"
+
+# (column, Arrow type) for every event.
+COLUMNS = [
+    ("ts", "float64"),
+    ("session", "string"),
+    ("player", "string"),
+    ("question_id", "string"),
+    ("fact_type", "string"),
+    ("distractor_id", "string"),
+    ("difficulty", "int8"),
+    ("difficulty_level", "int8"),
+    ("is_correct", "bool"),
+    ("answer_time", "float32"),
+    ("streak", "int16"),
+    ("earned_xp", "int16"),
+    ("speed_bonus", "int16"),
+    ("multiplier", "float32"),
+    ("hot_meter", "float32"),
+]
+
+# Low-cardinality text columns are dictionary-encoded on disk.
+DICTIONARY_COLUMNS = {"question_id", "fact_type", "distractor_id", "player"}
+
+
+def _schema():
+    fields = []
+    for name, type_name in COLUMNS:
+        arrow_type = getattr(pa, "bool_" if type_name == "bool" else type_name)()
+        if name in DICTIONARY_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), arrow_type)
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+class EventLog:
+    def __init__(
+        self,
+        directory: Path,
+        flush_rows: int = 512,
+        flush_seconds: float = 5.0,
+        segment_rows: int = 250_000,
+    ) -> None:
+        self.directory = Path(directory)
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.segment_rows = segment_rows
+
+        self._lock = threading.Lock()
+        self._buffer: dict[str, list] = {name: [] for name, _ in COLUMNS}
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        self._writer = None
+        self._sink = None
+        self._segment_count = 0
+        self._timer: threading.Thread | None = None
+
+        if HAS_PYARROW:
+            self._schema = _schema()
+            atexit.register(self.close)
+
+    def append(self, **event) -> None:
+        if not HAS_PYARROW:
+            return
+
+        with self._lock:
+            if not self._buffered:
+                self._last_flush = time.monotonic()   # the timer counts from the oldest event
+            for name, _ in COLUMNS:
+                self._buffer[name].append(event.get(name))
+            self._buffered += 1
+
+            if self._buffered >= self.flush_rows:
+                self._flush_locked()
+
+            if self._timer is None:
+                self._timer = threading.Thread(target=self._flush_on_timer, name="event-log-flush", daemon=True)
+                self._timer.start()
+
+    def _flush_on_timer(self) -> None:
+        while True:
+            time.sleep(self.flush_seconds / 2)
+            with self._lock:
+                if self._buffered and time.monotonic() - self._last_flush >= self.flush_seconds:
+                    try:
+                        self._flush_locked()
+                    except OSError:   # retried on the next tick
+                        pass
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._close_segment()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+
+        if not self._buffered:
+            return
+
+        batch = pa.record_batch(
+            [
+                pa.array(self._buffer[field.name], type=field.type.value_type).dictionary_encode()
+                if pa.types.is_dictionary(field.type)
+                else pa.array(self._buffer[field.name], type=field.type)
+                for field in self._schema
+            ],
+            schema=self._schema,
+        )
+
+        if self._writer is None:
+            self._open_segment()
+
+        self._writer.write_batch(batch)
+        self._sink.flush()
+        self._segment_count += self._buffered
+
+        for column in self._buffer.values():
+            column.clear()
+        self._buffered = 0
+
+        if self._segment_count >= self.segment_rows:
+            self._close_segment()
+
+    def _open_segment(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"events-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{time.monotonic_ns()}"
+        self._sink = pa.OSFile(str(self.directory / (name + SEGMENT_SUFFIX)), "wb")
+        self._writer = ipc.new_stream(self._sink, self._schema)
+        self._segment_count = 0
+
+    def _close_segment(self) -> None:
+        if self._writer is None:
+            return
+        self._writer.close()
+        self._sink.close()
+        self._writer = None
+        self._sink = None
+
+
+# ---------------------------------------------------------------------
+# Reading and analytics
+# ---------------------------------------------------------------------
+def iter_segments(directory: Path):
+    """Yield the record batches of every segment, oldest first."""
+    for path in sorted(Path(directory).glob(f"*{SEGMENT_SUFFIX}")):
+        try:
+            with pa.memory_map(str(path)) as source:
+                reader = ipc.open_stream(source)
+                while True:
+                    try:
+                        yield reader.read_next_batch()
+                    except StopIteration:
+                        break
+        except pa.ArrowInvalid:
+            # The open segment of a running server, or a segment torn by a
+            # crash: keep the batches read so far and move on.
+            continue
+
+
+def read_events(directory: Path) -> pd.DataFrame:
+    import pandas as pd
+
+    if not HAS_PYARROW:
+        return pd.DataFrame(columns=[name for name, _ in COLUMNS])
+
+    batches = list(iter_segments(directory))
+
+    if not batches:
+        return pd.DataFrame(columns=[name for name, _ in COLUMNS])
+
+    # Each segment has its own dictionaries; unify them before converting.
+    table = pa.Table.from_batches(batches).unify_dictionaries()
+    return table.to_pandas()
+
+
+def question_stats(events: pd.DataFrame) -> pd.DataFrame:
+    """Per question: answers, accuracy, median and p90 answer time."""
+    grouped = events.groupby("question_id", observed=True)
+    stats = grouped.agg(
+        fact_type=("fact_type", "first"),
+        difficulty=("difficulty", "first"),
+        answers=("is_correct", "size"),
+        accuracy=("is_correct", "mean"),
+        median_time=("answer_time", "median"),
+    )
+    stats["p90_time"] = grouped["answer_time"].quantile(0.9)
+    stats["observed_difficulty"] = 1.0 - stats["accuracy"]
+    return stats.sort_values("observed_difficulty", ascending=False)
+
+
+def confused_pairs(events: pd.DataFrame, min_shown: int = 5, top: int = 25) -> pd.DataFrame:
+    """(question, distractor) pairs with the highest wrong-answer rate."""
+    import pandas as pd
+
+    grouped = events.groupby(["question_id", "distractor_id"], observed=True)["is_correct"]
+    pairs = pd.DataFrame({"shown": grouped.size(), "correct": grouped.sum()})
+    pairs["wrong"] = pairs["shown"] - pairs["correct"]
+    pairs["wrong_rate"] = pairs["wrong"] / pairs["shown"]
+    pairs = pairs[pairs["shown"] >= min_shown]
+    return (
+        pairs.sort_values(["wrong_rate", "wrong"], ascending=False)
+        .head(top)
+        .drop(columns="correct")
+        .reset_index()
+    )
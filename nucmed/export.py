@@ -0,0 +1,314 @@
+"""
+Offline practice-sheet exporter.
+
+Builds many randomized quiz variants with the same engines as the app and
+writes them as printable Markdown (one file per variant, answer key on its
+own page) or as a single CSV.
+
+Examples:
+    python -m nucmed.export hot_or_not --variants 500 --out exams/
+    python -m nucmed.export mcq --ask Radiopharmaceutical --identify Uses \\
+        --variants 200 --length 25 --format csv --out exams/
+    python -m nucmed.export match --base Radiopharmaceutical \\
+        --targets "Decay Mode" "Half-life" --out exams/
+
+Variants are generated in a process pool. Variant i draws from a generator
+seeded with (seed, i), so the same --seed reproduces the same sheets.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import os
+import secrets
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from nucmed.data import DECK_PATH, QUESTIONS_DIR, merge_decks, read_questions
+from nucmed.hot_or_not import (
+    RoundGenerationError,
+    generate_round,
+    resolve_question,
+    round_options,
+)
+from nucmed.quiz import (
+    deck_index,
+    match_answer_pools,
+    mcq_options,
+    sample_match_positions,
+    shuffled_deck,
+)
+
+
+KINDS = ("flashcards", "mcq", "match", "hot_or_not")
+
+TITLES = {
+    "flashcards": "Flashcards",
+    "mcq": "Multiple Choice",
+    "match": "Multiple Match",
+    "hot_or_not": "Hot or Not",
+}
+
+PAGE_BREAK = '<div style="page-break-before: always"></div>'
+
+# Per-process state filled in by _init_worker.
+_worker: dict = {}
+
+
+def _text(value) -> str:
+    return "" if pd.isna(value) else str(value).strip()
+
+
+def _letter(i: int) -> str:
+    return chr(ord("A") + i)
+
+
+# ---------------------------------------------------------------------
+# Builders: each returns a list of items
+#   {"prompt": str, "options": list[str], "answer": str, "note": str}
+# Match items carry "answers": {column: answer} instead of "answer".
+# ---------------------------------------------------------------------
+def build_flashcards(deck: pd.DataFrame, args: argparse.Namespace, rng: np.random.Generator) -> list[dict]:
+    cards = shuffled_deck(deck, rng)[: args.length]
+    return [
+        {"prompt": _text(card.get(args.front)), "options": [], "answer": _text(card.get(args.back)), "note": ""}
+        for card in cards
+    ]
+
+
+def build_mcq(deck: pd.DataFrame, args: argparse.Namespace, rng: np.random.Generator) -> list[dict]:
+    items = []
+    for row in shuffled_deck(deck, rng)[: args.length]:
+        options = [_text(o) for o in mcq_options(deck, row, args.identify, rng)]
+        # The app lists the correct answer last; a printed sheet cannot.
+        options = [options[i] for i in rng.permutation(len(options))]
+        items.append({
+            "prompt": _text(row.get(args.ask)),
+            "options": options,
+            "answer": _text(row.get(args.identify)),
+            "note": "",
+        })
+    return items
+
+
+def build_match(deck: pd.DataFrame, args: argparse.Namespace, rng: np.random.Generator) -> list[dict]:
+    index = deck_index(deck)
+    positions = sample_match_positions(deck, rng, args.length)
+    pools = match_answer_pools(deck, args.targets, rng)
+    # Every base value's answers, built once per deck with match_answer_key.
+    answers = index.answers(args.base, tuple(args.targets))
+    no_answer = dict.fromkeys(args.targets, "")
+    items = []
+    for i in positions:
+        base = index.records[i][args.base]
+        items.append({
+            "prompt": _text(base),
+            "options": [],
+            "answers": dict(answers.get(base, no_answer)),
+            "note": "",
+            "pools": pools,
+        })
+    return items
+
+
+def build_hot_or_not(bank: pd.DataFrame, args: argparse.Namespace, rng: np.random.Generator) -> list[dict]:
+    round_ = generate_round(bank, args.fact_types, args.max_difficulty, args.length, rng)
+    items = []
+    for i in range(len(round_)):
+        question = resolve_question(bank, round_.questions[i], round_.distractors[i])
+        items.append({
+            "prompt": f"{question['radionuclide']} — {question['prompt']}",
+            "options": round_options(question, round_.flips[i]),
+            "answer": question["correct_option"],
+            "note": question["explanation"],
+        })
+    return items
+
+
+BUILDERS = {
+    "flashcards": build_flashcards,
+    "mcq": build_mcq,
+    "match": build_match,
+    "hot_or_not": build_hot_or_not,
+}
+
+
+# ---------------------------------------------------------------------
+# Renderers
+# ---------------------------------------------------------------------
+def render_markdown(kind: str, variant: int, items: list[dict], args: argparse.Namespace) -> str:
+    title = f"# {TITLES[kind]} — Variant {variant}"
+    lines = [title, "", "Name: ______________________   Date: __________", ""]
+    key = ["## Answer key", ""]
+
+    if kind == "match":
+        header = [args.base] + list(args.targets)
+        lines += ["| # | " + " | ".join(header) + " |", "|---" * (len(header) + 1) + "|"]
+        key += ["| # | " + " | ".join(header) + " |", "|---" * (len(header) + 1) + "|"]
+        for n, item in enumerate(items, 1):
+            lines.append(f"| {n} | {item['prompt']} |" + " |" * len(args.targets))
+            key.append(f"| {n} | {item['prompt']} | " + " | ".join(item["answers"].values()) + " |")
+        if items:
+            for target, pool in items[0]["pools"].items():
+                lines += ["", f"**{target} — word bank**", ""]
+                lines += [f"- {answer}" for answer in pool]
+    else:
+        for n, item in enumerate(items, 1):
+            lines.append(f"{n}. **{item['prompt']}**")
+            if item["options"]:
+                lines += [f"   - {_letter(i)}. {option}" for i, option in enumerate(item["options"])]
+            else:
+                lines.append("   - ________________________________")
+            lines.append("")
+
+            answer = item["answer"]
+            if item["options"]:
+                answer = f"{_letter(item['options'].index(answer))}. {answer}"
+            key.append(f"{n}. {answer}" + (f" — {item['note']}" if item["note"] else ""))
+
+    return "\n".join(lines + ["", PAGE_BREAK, ""] + key) + "\n"
+
+
+def render_csv_rows(kind: str, variant: int, items: list[dict]) -> list[list[str]]:
+    rows = []
+    for n, item in enumerate(items, 1):
+        if kind == "match":
+            for target, answer in item["answers"].items():
+                rows.append([variant, n, item["prompt"], target, "", answer, ""])
+        else:
+            rows.append([variant, n, item["prompt"], "", " || ".join(item["options"]), item["answer"], item["note"]])
+    return rows
+
+
+CSV_HEADER = ["variant", "number", "prompt", "column", "options", "answer", "explanation"]
+
+
+# ---------------------------------------------------------------------
+# Process pool
+# ---------------------------------------------------------------------
+def _init_worker(args: argparse.Namespace) -> None:
+    _worker["args"] = args
+    if args.kind == "hot_or_not":
+        _worker["data"] = read_questions(Path(args.questions_dir))
+    else:
+        _worker["data"] = merge_decks(args.deck)
+
+
+def _build_variant(variant: int):
+    args = _worker["args"]
+
+    # Each variant gets its own generator, so results do not depend on
+    # which worker builds it or in what order.
+    rng = np.random.default_rng([args.seed, variant])
+
+    items = BUILDERS[args.kind](_worker["data"], args, rng)
+
+    if args.format == "csv":
+        return variant, render_csv_rows(args.kind, variant, items)
+    return variant, render_markdown(args.kind, variant, items, args)
+
+
+def run(args: argparse.Namespace) -> int:
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    variants = range(1, args.variants + 1)
+    chunksize = max(1, args.variants // (4 * (args.workers or os.cpu_count() or 1)))
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(args,),
+    ) as pool:
+        results = pool.map(_build_variant, variants, chunksize=chunksize)
+
+        if args.format == "csv":
+            path = out_dir / f"{args.kind}.csv"
+            with path.open("w", newline="", encoding="utf-8") as fh:
+                writer = csv.writer(fh)
+                writer.writerow(CSV_HEADER)
+                for _, rows in results:
+                    writer.writerows(rows)
+        else:
+            width = len(str(args.variants))
+            for variant, text in results:
+                path = out_dir / f"{args.kind}_{variant:0{width}d}.md"
+                path.write_text(text, encoding="utf-8")
+
+    return args.variants
+
+
+def _validate(args: argparse.Namespace, parser: argparse.ArgumentParser) -> None:
+    if args.kind == "hot_or_not":
+        return
+
+    columns = set(merge_decks(args.deck).columns)
+    needed = {
+        "flashcards": [args.front, args.back],
+        "mcq": [args.ask, args.identify],
+        "match": [args.base] + list(args.targets or []),
+    }[args.kind]
+
+    if args.kind == "match" and not args.targets:
+        parser.error("match needs at least one --targets column")
+
+    missing = [c for c in needed if c not in columns]
+    if missing:
+        parser.error(f"unknown column(s): {', '.join(missing)}; deck has: {', '.join(sorted(columns))}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m nucmed.export",
+        description="Pre-generate randomized practice sheets.",
+    )
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("--variants", type=int, default=10, help="number of sheets to build")
+    parser.add_argument("--length", type=int, default=20, help="questions (or match rows) per sheet")
+    parser.add_argument("--format", choices=("markdown", "csv"), default="markdown")
+    parser.add_argument("--out", default="exports", help="output directory")
+    parser.add_argument("--seed", type=int, default=None, help="base seed; variant i is seeded with (seed, i)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+
+    deck = parser.add_argument_group("card deck (flashcards, mcq, match)")
+    deck.add_argument("--deck", nargs="+", default=[str(DECK_PATH)], help="one or more CSVs, merged and deduplicated")
+    deck.add_argument("--front", default="Radiopharmaceutical")
+    deck.add_argument("--back", default="Uses")
+    deck.add_argument("--ask", default="Radiopharmaceutical")
+    deck.add_argument("--identify", default="Uses")
+    deck.add_argument("--base", default="Radiopharmaceutical")
+    deck.add_argument("--targets", nargs="+", default=["Mechanism of Localization"])
+
+    hon = parser.add_argument_group("Hot or Not")
+    hon.add_argument("--questions-dir", default=str(QUESTIONS_DIR))
+    hon.add_argument("--fact-types", nargs="*", default=[], help="default: all fact types")
+    hon.add_argument("--max-difficulty", type=int, default=5)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.seed is None:
+        args.seed = secrets.randbits(31)
+
+    _validate(args, parser)
+
+    try:
+        count = run(args)
+    except RoundGenerationError as exc:
+        parser.exit(1, f"error: {exc}\n")
+
+    print(f"Wrote {count} {args.kind} variant(s) to {args.out} (seed {args.seed})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
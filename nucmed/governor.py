@@ -0,0 +1,319 @@
+"""
+Per-process memory budget with graceful degradation.
+
+On a small container one large upload, a big question bank or a crowd of
+sessions can push the server past its memory limit, and the kernel then
+kills the whole process and every session with it. The governor watches
+the process RSS against a budget and gives memory back before that point:
+
+* NUCMED_MEMORY_BUDGET_MB sets the budget. Without it the budget is 85% of
+  the container's cgroup memory limit, and with neither the governor only
+  measures.
+* The shared datasets in the warm-up cache (decks, the question bank,
+  merged uploads, the search index) are tracked with their approximate
+  footprint and when they were last used.
+* Above SOFT_SHARE of the budget, a check (every CHECK_SECONDS on a
+  background thread, and before loading an upload):
+    1. downcasts repeated text columns of datasets that allow it (the
+       question bank) to categoricals, in a copy that replaces the cached one;
+    2. compacts sessions idle for PRESSURE_IDLE_SECONDS instead of the usual
+       15 minutes (see nucmed/sessions.py);
+    3. evicts datasets unused for COLD_SECONDS, coldest first, until the
+       estimate is back under SOFT_SHARE. Above HARD_SHARE any dataset may go.
+  Evicted datasets are loaded again by the next page that needs them.
+* check_upload() refuses uploads whose loaded size would not fit, with a
+  message for the sidebar.
+
+Sizes are estimates (DataFrame.memory_usage(deep=True) for frames, a
+bounded walk for other objects); RSS is the ground truth for when to act.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import gc
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Hashable
+
+from nucmed import sessions
+
+
+def _cgroup_limit() -> int | None:
+    """The container's memory limit (cgroup v2 or v1), if it has one."""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            text = Path(path).read_text().strip()
+        except OSError:
+            continue
+        if text.isdigit() and int(text) < 2**60:   # v1 reports "no limit" as a huge number
+            return int(text)
+    return None
+
+
+def _budget() -> int:
+    configured = os.environ.get("NUCMED_MEMORY_BUDGET_MB", "").strip()
+    if configured:
+        return int(float(configured) * 2**20)
+    limit = _cgroup_limit()
+    return int(limit * 0.85) if limit else 0
+
+
+BUDGET_BYTES = _budget()   # 0: no budget, measure only
+SOFT_SHARE = 0.80
+HARD_SHARE = 0.95
+CHECK_SECONDS = 2.0
+COLD_SECONDS = 120.0
+PRESSURE_IDLE_SECONDS = 60.0
+
+# A CSV takes several times its size once parsed into object columns.
+UPLOAD_EXPANSION = 8
+# No single upload may take more than this share of the budget.
+MAX_UPLOAD_SHARE = 0.25
+# Text columns with at most this share of distinct values become categoricals.
+CATEGORY_MAX_RATIO = 0.5
+
+OK, SOFT, HARD = 0, 1, 2
+
+
+@dataclass
+class _Entry:
+    store: dict   # the cache the value lives in, e.g. the warm-up cache
+    size: int
+    downcast: bool   # may be replaced by a categorical copy
+    last_used: float = field(default_factory=time.monotonic)
+
+
+_entries: dict[Hashable, _Entry] = {}
+_lock = threading.Lock()
+_counters = {"downcast": 0, "evicted": 0, "compacted": 0, "rejected": 0}
+_started = False
+
+
+def _count(name: str, n: int = 1) -> None:
+    with _lock:
+        _counters[name] += n
+
+
+# ---------------------------------------------------------------------
+# Footprints
+# ---------------------------------------------------------------------
+def footprint(value, _depth: int = 0, _seen: set | None = None) -> int:
+    """Approximate bytes held by value: exact for frames and arrays, a bounded walk otherwise."""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if callable(getattr(value, "memory_usage", None)):   # DataFrame, Series
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(value, "nbytes") and hasattr(value, "dtype"):   # ndarray
+        return int(value.nbytes)
+
+    size = sys.getsizeof(value, 0)
+    if _depth >= 4:
+        return size
+
+    if isinstance(value, dict):
+        items = [v for pair in value.items() for v in pair]
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(value)
+    elif hasattr(value, "__dict__"):
+        items = list(vars(value).values())
+    else:
+        return size
+
+    # Long containers are sampled; their items tend to be alike.
+    if len(items) > 1000:
+        sample = items[:: len(items) // 1000]
+        return size + sum(footprint(v, _depth + 1, seen) for v in sample) * len(items) // len(sample)
+    return size + sum(footprint(v, _depth + 1, seen) for v in items)
+
+
+def downcast(value):
+    """
+    A copy of a frame (or dict of frames) with repeated text columns as
+    categoricals; value itself when no column qualifies.
+    """
+    if isinstance(value, dict):
+        frames = {name: downcast(frame) for name, frame in value.items()}
+        return frames if any(frames[name] is not frame for name, frame in value.items()) else value
+    if not (hasattr(value, "columns") and hasattr(value, "assign")):
+        return value
+
+    converted = {}
+    for col in value.select_dtypes(include=["object", "string"]).columns:
+        series = value[col]
+        distinct = series.nunique(dropna=True)
+        if distinct and distinct <= CATEGORY_MAX_RATIO * len(series):
+            converted[col] = series.astype("category")
+    return value.assign(**converted) if converted else value
+
+
+# ---------------------------------------------------------------------
+# Tracking
+# ---------------------------------------------------------------------
+def track(key: Hashable, store: dict, allow_downcast: bool = False):
+    """
+    Start tracking store[key] and return the value to keep there: when memory
+    is already tight and allow_downcast is set, a categorical copy.
+    """
+    value = store[key]
+    if allow_downcast and level() >= SOFT:
+        smaller = downcast(value)
+        if smaller is not value:
+            value = store[key] = smaller
+            _count("downcast")
+
+    with _lock:
+        _entries[key] = _Entry(store=store, size=footprint(value), downcast=allow_downcast)
+    return value
+
+
+def touch(key: Hashable) -> None:
+    entry = _entries.get(key)
+    if entry is not None:
+        entry.last_used = time.monotonic()
+
+
+def tracked_bytes() -> int:
+    with _lock:
+        return sum(entry.size for entry in _entries.values())
+
+
+# ---------------------------------------------------------------------
+# Pressure
+# ---------------------------------------------------------------------
+def level(rss: int | None = None) -> int:
+    if not BUDGET_BYTES:
+        return OK
+    if rss is None:
+        rss, _ = sessions.memory_bytes()
+    if rss >= BUDGET_BYTES * HARD_SHARE:
+        return HARD
+    return SOFT if rss >= BUDGET_BYTES * SOFT_SHARE else OK
+
+
+def _release() -> None:
+    """Hand freed memory back to the OS, so RSS reflects it (glibc only)."""
+    gc.collect()
+    libc = ctypes.util.find_library("c")
+    if libc and sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL(libc).malloc_trim(0)
+        except (AttributeError, OSError):
+            pass
+
+
+def relieve() -> int:
+    """Apply the degradation steps for the current pressure; returns the level found."""
+    rss, _ = sessions.memory_bytes()
+    found = level(rss)
+    if found == OK:
+        return found
+
+    with _lock:
+        entries = list(_entries.items())
+
+    # 1. Categorical copies replace the cached frames; sessions holding the
+    #    old frame keep it until their next run.
+    for key, entry in entries:
+        if entry.downcast and key in entry.store:
+            smaller = downcast(entry.store[key])
+            size = footprint(smaller)
+            if size < entry.size:
+                entry.store[key] = smaller
+                rss -= entry.size - size
+                entry.size = size
+                _count("downcast")
+            entry.downcast = False   # once is enough
+
+    # 2. Idle sessions give up their rebuildable state early.
+    _count("compacted", sessions.sweep(PRESSURE_IDLE_SECONDS))
+
+    # 3. Cold datasets go, coldest first, until the estimate is under SOFT.
+    now = time.monotonic()
+    cold_after = 0.0 if found == HARD else COLD_SECONDS
+    target = BUDGET_BYTES * SOFT_SHARE
+    for key, entry in sorted(entries, key=lambda item: item[1].last_used):
+        if rss < target:
+            break
+        if now - entry.last_used < cold_after:
+            continue
+        entry.store.pop(key, None)
+        with _lock:
+            _entries.pop(key, None)
+        rss -= entry.size
+        _count("evicted")
+
+    _release()
+    return found
+
+
+def check_upload(nbytes: int) -> str | None:
+    """None if an upload of nbytes (file size) may be loaded, else why not."""
+    if not BUDGET_BYTES:
+        return None
+
+    need = nbytes * UPLOAD_EXPANSION
+    if need > BUDGET_BYTES * MAX_UPLOAD_SHARE:
+        _count("rejected")
+        return (
+            f"These files are too large for this server: about {need / 2**20:,.0f} MB once loaded, "
+            f"and uploads are limited to {BUDGET_BYTES * MAX_UPLOAD_SHARE / 2**20:,.0f} MB. "
+            "Upload a smaller deck, or split it."
+        )
+
+    rss, _ = sessions.memory_bytes()
+    if rss + need >= BUDGET_BYTES * HARD_SHARE:
+        relieve()
+        rss, _ = sessions.memory_bytes()
+        if rss + need >= BUDGET_BYTES * HARD_SHARE:
+            _count("rejected")
+            return "The server is low on memory right now, so uploads are paused. Try again in a few minutes."
+
+    return None
+
+
+# ---------------------------------------------------------------------
+# Monitor
+# ---------------------------------------------------------------------
+def _monitor() -> None:
+    while True:
+        time.sleep(CHECK_SECONDS)
+        try:
+            relieve()
+        except Exception:   # the monitor must outlive a bad pass
+            continue
+
+
+def start() -> None:
+    """Start the monitor thread, once per process; nothing to do without a budget."""
+    global _started
+
+    with _lock:
+        if _started or not BUDGET_BYTES:
+            return
+        _started = True
+
+    threading.Thread(target=_monitor, name="nucmed-memory-governor", daemon=True).start()
+
+
+def stats() -> dict:
+    rss, _ = sessions.memory_bytes()
+    with _lock:
+        counters = dict(_counters)
+    return {
+        "budget_bytes": BUDGET_BYTES,
+        "level": ("ok", "soft", "hard")[level(rss)],
+        "datasets": len(_entries),
+        "dataset_bytes": tracked_bytes(),
+        "session_bytes": sum(footprint(state) for state in sessions.session_states()),
+        **counters,
+    }
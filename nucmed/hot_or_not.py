@@ -0,0 +1,372 @@
+"""
+Hot or Not game rules and round generation.
+
+Pure NumPy code with no Streamlit calls, so a round can be built in a
+background thread or outside the app entirely. Everything here is evaluated
+once per process, not on every rerun of the page.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# ---------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------
+FACT_TYPE_LABELS = {
+    "half_life": "Half-Life",
+    "decay_mode": "Decay Mode",
+    "emission": "Emission",
+    "generation": "Generation",
+    "common_use": "Common Use",
+}
+
+DIFFICULTY_SETTINGS = {
+    1: {
+        "name": "Warm Background",
+        "decay_rate": 1.0,
+        "correct_bump": 12,
+        "wrong_penalty": 10,
+    },
+    2: {
+        "name": "Mild Uptake",
+        "decay_rate": 1.5,
+        "correct_bump": 10,
+        "wrong_penalty": 12,
+    },
+    3: {
+        "name": "Physiologic Activity",
+        "decay_rate": 2.0,
+        "correct_bump": 9,
+        "wrong_penalty": 15,
+    },
+    4: {
+        "name": "Intense Focal Uptake",
+        "decay_rate": 2.5,
+        "correct_bump": 8,
+        "wrong_penalty": 18,
+    },
+    5: {
+        "name": "Hot Lab Meltdown",
+        "decay_rate": 3.0,
+        "correct_bump": 7,
+        "wrong_penalty": 20,
+    },
+}
+
+XP_LEVELS = [
+    {"level": 1, "name": "Non-Avid", "xp_required": 0},
+    {"level": 2, "name": "Mild Uptake", "xp_required": 100},
+    {"level": 3, "name": "Heterogenous Uptake", "xp_required": 250},
+    {"level": 4, "name": "Focal Uptake", "xp_required": 500},
+    {"level": 5, "name": "Bone Scan Banger", "xp_required": 900},
+    {"level": 6, "name": "Howard's Apprentice", "xp_required": 1400},
+    {"level": 7, "name": "Basically a 3/5 Resident", "xp_required": 2200},
+    {"level": 8, "name": "Mettler Himself", "xp_required": 3200},
+]
+
+STARTING_HOT = 65.0
+MAX_HOT = 100.0
+NOT_THRESHOLD = 20.0
+
+SPEED_BONUS_SECONDS = 3.0
+ROUND_CLEAR_BONUS = 25
+PERFECT_ROUND_BONUS = 50
+
+
+# ---------------------------------------------------------------------
+# XP helpers
+# ---------------------------------------------------------------------
+def get_xp_level(total_xp: int) -> dict:
+    current = XP_LEVELS[0]
+    for level in XP_LEVELS:
+        if total_xp >= level["xp_required"]:
+            current = level
+    return current
+
+
+def get_next_xp_level(total_xp: int) -> dict | None:
+    for level in XP_LEVELS:
+        if total_xp < level["xp_required"]:
+            return level
+    return None
+
+
+def get_streak_multiplier(streak: int) -> float:
+    if streak >= 10:
+        return 2.0
+    if streak >= 6:
+        return 1.5
+    if streak >= 3:
+        return 1.25
+    return 1.0
+
+
+def calculate_xp_for_answer(is_correct: bool, answer_time: float, streak: int) -> tuple[int, dict]:
+    if not is_correct:
+        return 0, {
+            "base_xp": 0,
+            "speed_bonus": 0,
+            "multiplier": 1.0,
+        }
+
+    base_xp = 10
+    speed_bonus = 5 if answer_time < SPEED_BONUS_SECONDS else 0
+    multiplier = get_streak_multiplier(streak)
+    earned = round((base_xp + speed_bonus) * multiplier)
+
+    return earned, {
+        "base_xp": base_xp,
+        "speed_bonus": speed_bonus,
+        "multiplier": multiplier,
+    }
+
+
+# ---------------------------------------------------------------------
+# Round generation
+# ---------------------------------------------------------------------
+class RoundGenerationError(ValueError):
+    """The current filters cannot produce a playable round."""
+
+
+@dataclass(frozen=True)
+class Round:
+    """
+    A round as row indices into the question bank.
+
+    questions[i] is the question row, distractors[i] is the row whose
+    correct_option is shown as the wrong answer, and flips[i] is True when
+    the wrong answer is shown first.
+    """
+
+    questions: np.ndarray
+    distractors: np.ndarray
+    flips: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+
+def filter_questions(
+    df: pd.DataFrame,
+    selected_fact_types: list[str],
+    max_difficulty: int,
+) -> pd.DataFrame:
+    filtered = df
+
+    if selected_fact_types:
+        filtered = filtered[filtered["fact_type"].isin(selected_fact_types)]
+
+    return filtered[filtered["difficulty"] <= max_difficulty]
+
+
+def keep_distractable(filtered: pd.DataFrame) -> pd.DataFrame:
+    """
+    Only keep fact types that have at least 2 unique answer choices.
+    Otherwise we cannot generate a wrong answer from the same category.
+    """
+    unique_answers = filtered.groupby("fact_type", observed=True)["correct_option"].nunique()
+    eligible_fact_types = unique_answers[unique_answers >= 2].index
+
+    return filtered[filtered["fact_type"].isin(eligible_fact_types)]
+
+
+@dataclass(frozen=True)
+class _Eligible:
+    """
+    The rows one filter setting leaves, with their distractor pools.
+
+    Pool p is pool_rows[pool_start[p] : pool_start[p] + pool_size[p]]: one
+    representative row per distinct wrong answer, in bank order.
+    """
+
+    rows: np.ndarray   # index labels of the eligible rows, in bank order
+    pool_of: np.ndarray   # pool number of each eligible row, -1 if it has none
+    pool_rows: np.ndarray
+    pool_start: np.ndarray
+    pool_size: np.ndarray
+    error: str | None = None
+
+
+class _BankIndex:
+    """
+    A question bank as integer codes, built once per bank.
+
+    Banks are shared read-only by every session, so the codes stay valid for
+    the bank's lifetime. Each filter setting's eligible rows and distractor
+    pools are built the first time it is asked for and then kept.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self.labels = df.index.to_numpy()
+        self.fact_type, fact_types = _codes(df["fact_type"])
+        self.fact_type_codes = {name: code for code, name in enumerate(fact_types)}
+        self.answer, _ = _codes(df["correct_option"])
+        # Groups compare as stripped text, so a missing group is the group "nan".
+        self.group, _ = _codes(np.array([str(g).strip() for g in df["distractor_group"]], dtype=object))
+        self.difficulty = df["difficulty"].to_numpy(dtype=float, na_value=np.nan)
+        # Rows by label, for resolve_question.
+        self.rows = dict(zip(self.labels.tolist(), df.to_dict("records")))
+        self.eligible = lru_cache(maxsize=64)(self._eligible)
+
+    def _eligible(self, fact_types: frozenset, max_difficulty: int) -> _Eligible:
+        matched = self.difficulty <= max_difficulty
+        if fact_types:
+            codes = [self.fact_type_codes[f] for f in fact_types if f in self.fact_type_codes]
+            matched &= np.isin(self.fact_type, codes)
+        if not matched.any():
+            return _empty("No questions match the selected filters.")
+
+        # keep_distractable(): fact types with at least two distinct answers.
+        known = matched & (self.fact_type >= 0)
+        answered = known & (self.answer >= 0)
+        pairs = np.unique(np.stack([self.fact_type[answered], self.answer[answered]]), axis=1)
+        distractable = np.bincount(pairs[0], minlength=len(self.fact_type_codes)) >= 2
+        positions = np.flatnonzero(known & distractable[np.maximum(self.fact_type, 0)])
+        if not len(positions):
+            return _empty(
+                "No eligible questions found. Each selected fact type needs at least "
+                "two unique correct_option values so the app can generate distractors."
+            )
+
+        # Wrong answers come from the same fact type and another distractor group.
+        fact_type, group, answer = self.fact_type[positions], self.group[positions], self.answer[positions]
+        pool_of = np.full(len(positions), -1, dtype=np.int32)
+        pools = []
+        for f in np.unique(fact_type):
+            in_type = fact_type == f
+            for g in np.unique(group[in_type]):
+                others = np.flatnonzero(in_type & (group != g) & (answer >= 0))
+                _, first = np.unique(answer[others], return_index=True)
+                if len(first):
+                    pool_of[in_type & (group == g)] = len(pools)
+                    pools.append(self.labels[positions[others[np.sort(first)]]])
+
+        sizes = np.array([len(pool) for pool in pools], dtype=np.int64)
+        return _Eligible(
+            rows=self.labels[positions],
+            pool_of=pool_of,
+            pool_rows=np.concatenate(pools) if pools else np.empty(0, dtype=self.labels.dtype),
+            pool_start=np.cumsum(sizes) - sizes,
+            pool_size=sizes,
+        )
+
+
+def _codes(values) -> tuple[np.ndarray, list]:
+    """Integer codes for values (-1 where missing) and the value of each code."""
+    values = np.asarray(values, dtype=object)
+    missing = np.array([v is None or v != v for v in values], dtype=bool)   # None and NaN
+    uniques, codes = np.unique(values[~missing].astype(str), return_inverse=True)
+    out = np.full(len(values), -1, dtype=np.int32)
+    out[~missing] = codes
+    return out, uniques.tolist()
+
+
+def _empty(error: str) -> _Eligible:
+    nothing = np.empty(0, dtype=np.int64)
+    return _Eligible(nothing, nothing, nothing, nothing, nothing, error)
+
+
+_indexes: dict[int, tuple[weakref.ref, _BankIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def _bank_index(df: pd.DataFrame) -> _BankIndex:
+    key = id(df)
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    index = _BankIndex(df)
+
+    def forget(ref: weakref.ref) -> None:
+        with _indexes_lock:
+            if _indexes.get(key, (None,))[0] is ref:
+                del _indexes[key]
+
+    with _indexes_lock:
+        _indexes[key] = (weakref.ref(df, forget), index)
+    return index
+
+
+def generate_round(
+    df: pd.DataFrame,
+    selected_fact_types: list[str],
+    max_difficulty: int,
+    round_length: int,
+    rng: np.random.Generator,
+    question_pool=None,
+) -> Round:
+    """
+    Sample a round. With the same bank, filters and generator state the
+    result is always the same, so rounds can be cached by seed.
+
+    question_pool optionally limits which rows may be asked (for example
+    search results); distractors still come from the whole filtered bank.
+    """
+    eligible = _bank_index(df).eligible(frozenset(selected_fact_types or ()), max_difficulty)
+    if eligible.error:
+        raise RoundGenerationError(eligible.error)
+
+    candidates = np.arange(len(eligible.rows))
+    if question_pool is not None:
+        candidates = np.flatnonzero(np.isin(eligible.rows, np.fromiter(question_pool, dtype=np.int64)))
+        if not len(candidates):
+            raise RoundGenerationError(
+                "None of the chosen questions match the selected filters."
+            )
+
+    # The same draw as DataFrame.sample(n, random_state=rng).
+    picked = candidates[rng.choice(len(candidates), size=min(round_length, len(candidates)), replace=False)]
+
+    # One wrong answer per question, uniform over the distinct wrong answers
+    # of its pool; questions without a pool are left out.
+    pools = eligible.pool_of[picked]
+    picked, pools = picked[pools >= 0], pools[pools >= 0]
+    if not len(picked):
+        raise RoundGenerationError("Could not generate any questions with distractors.")
+
+    offsets = rng.integers(eligible.pool_size[pools])
+    return Round(
+        questions=eligible.rows[picked].astype(np.int32),
+        distractors=eligible.pool_rows[eligible.pool_start[pools] + offsets].astype(np.int32),
+        flips=rng.random(len(picked)) < 0.5,
+    )
+
+
+def resolve_question(df: pd.DataFrame, row_idx: int, distractor_idx: int) -> dict:
+    rows = _bank_index(df).rows
+    row, distractor = rows[int(row_idx)], rows[int(distractor_idx)]
+
+    return {
+        "row_idx": int(row_idx),
+        "question_id": row["question_id"],
+        "radionuclide": row["radionuclide"],
+        "fact_type": row["fact_type"],
+        "prompt": row["prompt"],
+        "correct_option": str(row["correct_option"]),
+        "incorrect_option": str(distractor["correct_option"]),
+        "explanation": str(row["explanation"]),
+        "difficulty": int(row["difficulty"]),
+        "distractor_id": distractor["question_id"],
+    }
+
+
+def round_options(question: dict, flipped: bool) -> list[str]:
+    options = [question["correct_option"], question["incorrect_option"]]
+
+    if flipped:
+        options.reverse()
+
+    return options
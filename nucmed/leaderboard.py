@@ -0,0 +1,184 @@
+"""
+Local XP leaderboard.
+
+Scores live in a sorted container keyed by (-xp, player), so a rank lookup
+or an update is O(log n) and reading the top k entries is O(k). Nothing
+ever sorts the whole table.
+
+Every accepted update is appended to a JSON-lines file. The writes happen
+in batches on a background thread (and at interpreter exit), so submit()
+never waits for the disk. On start-up the log is replayed (best value per
+player wins) and rewritten once it holds many more lines than there are
+players.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+from itertools import islice
+from pathlib import Path
+
+from sortedcontainers import SortedList
+
+
+# Rewrite the log once it holds this many lines per player.
+COMPACT_FACTOR = 4
+
+
+class Leaderboard:
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._scores: dict[str, int] = {}
+        self._ranked = SortedList()
+        self._log_lines = 0
+
+        # Lines waiting for the writer thread, and the lock that keeps two
+        # flushes (the thread and atexit) from interleaving on disk.
+        self._pending: list[str] = []
+        self._wake = threading.Event()
+        self._io_lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+
+        if self.path is not None and self.path.exists():
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def __contains__(self, player: str) -> bool:
+        return player in self._scores
+
+    # -----------------------------------------------------------------
+    # Reads
+    # -----------------------------------------------------------------
+    def score(self, player: str) -> int | None:
+        return self._scores.get(player)
+
+    def rank(self, player: str) -> int | None:
+        """1-based rank; players with equal XP share a rank."""
+        with self._lock:
+            xp = self._scores.get(player)
+
+            if xp is None:
+                return None
+
+            # (-xp,) sorts before every (-xp, name), so this counts only the
+            # players with strictly more XP.
+            return self._ranked.bisect_left((-xp,)) + 1
+
+    def top(self, k: int = 10) -> list[tuple[str, int]]:
+        with self._lock:
+            return [(player, -neg_xp) for neg_xp, player in islice(self._ranked, k)]
+
+    # -----------------------------------------------------------------
+    # Writes
+    # -----------------------------------------------------------------
+    def submit(self, player: str, xp: int) -> int:
+        """
+        Record xp for player if it beats their best and return their rank.
+
+        The board keeps each player's best total, so a fresh session under
+        an existing name cannot knock them down.
+        """
+        player = player.strip()
+        xp = int(xp)
+
+        with self._lock:
+            old = self._scores.get(player)
+
+            if old is None or xp > old:
+                if old is not None:
+                    self._ranked.remove((-old, player))
+                self._scores[player] = xp
+                self._ranked.add((-xp, player))
+                self._append(player, xp)
+
+            return self._ranked.bisect_left((-self._scores[player],)) + 1
+
+    # -----------------------------------------------------------------
+    # Persistence
+    # -----------------------------------------------------------------
+    def _load(self) -> None:
+        with self.path.open(encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    player, xp = str(entry["player"]), int(entry["xp"])
+                except (ValueError, KeyError, TypeError):
+                    # A torn last line after a crash is not worth failing over.
+                    continue
+                self._log_lines += 1
+                self._scores[player] = max(xp, self._scores.get(player, xp))
+
+        self._ranked = SortedList((-xp, player) for player, xp in self._scores.items())
+
+        if self._log_lines > COMPACT_FACTOR * max(1, len(self._scores)):
+            self._compact()
+
+    def _append(self, player: str, xp: int) -> None:
+        """Queue one log line; called with self._lock held."""
+        if self.path is None:
+            return
+
+        self._pending.append(json.dumps({"player": player, "xp": xp}) + "\n")
+
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_forever, name="leaderboard-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.flush)
+        self._wake.set()
+
+    def _write_forever(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError:   # keep the board running; the lines are retried next time
+                continue
+
+    def flush(self) -> None:
+        """Write queued lines now (or rewrite the log, if it has grown too long)."""
+        if self.path is None:
+            return
+
+        with self._io_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+                snapshot = None
+                if self._log_lines + len(lines) > COMPACT_FACTOR * max(1, len(self._scores)):
+                    # The snapshot already holds every queued update.
+                    snapshot = dict(self._scores)
+
+            if not lines and snapshot is None:
+                return
+
+            try:
+                if snapshot is not None:
+                    self._compact(snapshot)
+                else:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with self.path.open("a", encoding="utf-8") as fh:
+                        fh.writelines(lines)
+                    self._log_lines += len(lines)
+            except OSError:
+                with self._lock:
+                    self._pending[:0] = lines
+                raise
+
+    def _compact(self, scores: dict[str, int] | None = None) -> None:
+        scores = self._scores if scores is None else scores
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as fh:
+            for player, xp in scores.items():
+                fh.write(json.dumps({"player": player, "xp": xp}) + "\n")
+        os.replace(tmp, self.path)
+        self._log_lines = len(scores)
@@ -0,0 +1,100 @@
+"""
+Compact "cards seen" ledgers for the progress bars.
+
+Each ledger is a bitset over row positions (the deck's __row_id), stored as
+NumPy uint64 words: a 100k-row deck needs 12.5 KB per (mode, front, back)
+combination instead of a Python set of ints. The number of set bits is
+kept up to date on every add, so progress is O(1); unions across modes are
+a single np.bitwise_or.reduce over the word arrays.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, Iterable
+
+import numpy as np
+
+
+_ONE = np.uint64(1)
+
+
+def _popcount(words: np.ndarray) -> int:
+    if hasattr(np, "bitwise_count"):   # NumPy 2.0+
+        return int(np.bitwise_count(words).sum())
+    return int(np.unpackbits(words.view(np.uint8)).sum())
+
+
+class Bitset:
+    __slots__ = ("words", "count")
+
+    def __init__(self, size: int = 0) -> None:
+        self.words = np.zeros(max(1, (size + 63) // 64), dtype=np.uint64)
+        self.count = 0
+
+    @classmethod
+    def from_words(cls, words: np.ndarray) -> Bitset:
+        bits = cls()
+        bits.words = words
+        bits.count = _popcount(words)
+        return bits
+
+    def add(self, position: int) -> bool:
+        """Set a bit; returns False if it was already set."""
+        word, bit = divmod(int(position), 64)
+
+        if word >= len(self.words):
+            grown = np.zeros(max(word + 1, 2 * len(self.words)), dtype=np.uint64)
+            grown[: len(self.words)] = self.words
+            self.words = grown
+
+        mask = _ONE << np.uint64(bit)
+        if self.words[word] & mask:
+            return False
+
+        self.words[word] |= mask
+        self.count += 1
+        return True
+
+    def __contains__(self, position: int) -> bool:
+        word, bit = divmod(int(position), 64)
+        return word < len(self.words) and bool(self.words[word] & (_ONE << np.uint64(bit)))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def positions(self) -> np.ndarray:
+        bits = np.unpackbits(self.words.view(np.uint8), bitorder="little")
+        return np.flatnonzero(bits)
+
+
+class SeenLedger:
+    """One Bitset per progress key, e.g. ("flash", front, back)."""
+
+    def __init__(self, size: int = 0) -> None:
+        self.size = size
+        self.ledgers: dict[Hashable, Bitset] = {}
+
+    def mark(self, key: Hashable, position: int) -> bool:
+        ledger = self.ledgers.get(key)
+        if ledger is None:
+            ledger = self.ledgers[key] = Bitset(self.size)
+        return ledger.add(position)
+
+    def count(self, key: Hashable) -> int:
+        ledger = self.ledgers.get(key)
+        return ledger.count if ledger is not None else 0
+
+    def keys(self) -> list[Hashable]:
+        return list(self.ledgers)
+
+    def union(self, keys: Iterable[Hashable] | None = None) -> Bitset:
+        """Rows seen under any of keys (default: any key at all)."""
+        chosen = [self.ledgers[k] for k in (self.ledgers if keys is None else keys) if k in self.ledgers]
+        if not chosen:
+            return Bitset(self.size)
+
+        width = max(len(b.words) for b in chosen)
+        words = np.zeros((len(chosen), width), dtype=np.uint64)
+        for row, bits in enumerate(chosen):
+            words[row, : len(bits.words)] = bits.words
+        return Bitset.from_words(np.bitwise_or.reduce(words, axis=0))
@@ -0,0 +1,251 @@
+"""
+Pre-generated Hot or Not round packs for class assignments.
+
+An instructor builds a pack of K rounds for one settings tuple (fact types,
+max difficulty, round length) ahead of time:
+
+    python -m nucmed.packs week3 --rounds 200 --length 20 \\
+        --fact-types half_life emission --max-difficulty 2
+
+and students pick the pack in the Hot or Not sidebar. Each student is dealt
+round (crc32(player name) mod K), or a round number they type in, so
+starting a round is an array lookup whatever the size of the bank, and
+everyone on the assignment plays rounds drawn from one fixed set.
+
+Round i is generate_round() with np.random.default_rng(seeds[i]), so a
+pack holds exactly the rounds the page would build for those seeds.
+
+On disk a pack is one .npz file with no pickled objects:
+    meta         JSON (format, name, bank fingerprint, settings), as uint8
+    seeds        (K,) uint32
+    lengths      (K,) uint8 or uint16, questions in each round
+    questions    (K, L) row indices, int16 when the bank allows, -1 padded
+    distractors  (K, L) same dtype as questions
+    flips        (K, ceil(L / 8)) np.packbits of the flip flags
+A pack records the fingerprint of the bank it was built from; row indices
+mean nothing against another bank, so such a pack is refused.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import secrets
+import sys
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from nucmed.hot_or_not import Round, RoundGenerationError, generate_round
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+PACKS_DIR = Path("data/packs")
+PACK_SUFFIX = ".npz"
+FORMAT_VERSION = 1
+
+
+class PackError(ValueError):
+    """The file is not a usable round pack."""
+
+
+@dataclass(frozen=True)
+class RoundPack:
+    name: str
+    bank: str   # fingerprint of the question bank the rows index into
+    fact_types: tuple[str, ...]
+    max_difficulty: int
+    round_length: int
+    seeds: np.ndarray
+    lengths: np.ndarray
+    questions: np.ndarray
+    distractors: np.ndarray
+    flips: np.ndarray   # packed bits, one row per round
+
+    def __len__(self) -> int:
+        return len(self.seeds)
+
+    def round(self, index: int) -> Round:
+        """Round `index` (wrapping around), as the page would have built it."""
+        i = index % len(self)
+        n = int(self.lengths[i])
+        return Round(
+            questions=self.questions[i, :n].astype(np.int32),
+            distractors=self.distractors[i, :n].astype(np.int32),
+            flips=np.unpackbits(self.flips[i], count=n).astype(bool),
+        )
+
+    def seed(self, index: int) -> int:
+        return int(self.seeds[index % len(self)])
+
+    def deal(self, player: str) -> int:
+        """The round index a player is dealt by default; stable per name."""
+        return zlib.crc32(player.strip().casefold().encode("utf-8")) % len(self)
+
+
+# ---------------------------------------------------------------------
+# Build, save, load
+# ---------------------------------------------------------------------
+def build_pack(
+    bank: pd.DataFrame,
+    bank_key: str,
+    name: str,
+    fact_types: list[str],
+    max_difficulty: int,
+    round_length: int,
+    rounds: int,
+    seed: int,
+) -> RoundPack:
+    seeds = np.random.default_rng(seed).choice(2**32, size=rounds, replace=False).astype(np.uint32)
+
+    index_dtype = np.int16 if len(bank) <= np.iinfo(np.int16).max else np.int32
+    questions = np.full((rounds, round_length), -1, dtype=index_dtype)
+    distractors = np.full((rounds, round_length), -1, dtype=index_dtype)
+    flips = np.zeros((rounds, round_length), dtype=bool)
+    lengths = np.zeros(rounds, dtype=np.uint8 if round_length <= 255 else np.uint16)
+
+    for i, round_seed in enumerate(seeds):
+        round_ = generate_round(bank, fact_types, max_difficulty, round_length, np.random.default_rng(int(round_seed)))
+        n = len(round_)
+        questions[i, :n] = round_.questions
+        distractors[i, :n] = round_.distractors
+        flips[i, :n] = round_.flips
+        lengths[i] = n
+
+    return RoundPack(
+        name=name,
+        bank=bank_key,
+        fact_types=tuple(fact_types),
+        max_difficulty=max_difficulty,
+        round_length=round_length,
+        seeds=seeds,
+        lengths=lengths,
+        questions=questions,
+        distractors=distractors,
+        flips=np.packbits(flips, axis=1),
+    )
+
+
+def save_pack(pack: RoundPack, path: Path) -> None:
+    meta = {
+        "format": FORMAT_VERSION,
+        "name": pack.name,
+        "bank": pack.bank,
+        "fact_types": list(pack.fact_types),
+        "max_difficulty": pack.max_difficulty,
+        "round_length": pack.round_length,
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("wb") as fh:
+        np.savez_compressed(
+            fh,
+            meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            seeds=pack.seeds,
+            lengths=pack.lengths,
+            questions=pack.questions,
+            distractors=pack.distractors,
+            flips=pack.flips,
+        )
+    tmp.replace(path)
+
+
+def load_pack(path: Path) -> RoundPack:
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes())
+            arrays = {key: data[key] for key in ("seeds", "lengths", "questions", "distractors", "flips")}
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, zlib.error) as exc:   # incl. a failed CRC
+        raise PackError(f"{path.name} is not a round pack: {exc}") from None
+
+    if meta.get("format") != FORMAT_VERSION:
+        raise PackError(f"{path.name} has pack format {meta.get('format')}; expected {FORMAT_VERSION}")
+
+    for array in arrays.values():
+        array.flags.writeable = False   # shared by every session of the process
+
+    return RoundPack(
+        name=meta["name"],
+        bank=meta["bank"],
+        fact_types=tuple(meta["fact_types"]),
+        max_difficulty=int(meta["max_difficulty"]),
+        round_length=int(meta["round_length"]),
+        **arrays,
+    )
+
+
+def list_packs(directory: Path = PACKS_DIR) -> dict[str, Path]:
+    """Pack name -> path for every pack file in directory, sorted by name."""
+    if not directory.is_dir():
+        return {}
+    return {path.stem: path for path in sorted(directory.glob(f"*{PACK_SUFFIX}"))}
+
+
+# ---------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------
+def main(argv: list[str] | None = None) -> int:
+    from nucmed.data import QUESTIONS_DIR, fingerprint, read_questions
+
+    parser = argparse.ArgumentParser(
+        prog="python -m nucmed.packs",
+        description="Pre-generate a pack of Hot or Not rounds for an assignment.",
+    )
+    parser.add_argument("name", help="pack name, shown in the sidebar")
+    parser.add_argument("--rounds", type=int, default=100, help="rounds in the pack")
+    parser.add_argument("--length", type=int, default=20, help="questions per round")
+    parser.add_argument("--fact-types", nargs="*", default=[], help="default: all fact types")
+    parser.add_argument("--max-difficulty", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=None, help="base seed; the same seed rebuilds the same pack")
+    parser.add_argument("--questions-dir", default=str(QUESTIONS_DIR))
+    parser.add_argument("--out", default=str(PACKS_DIR), help="directory the app reads packs from")
+    args = parser.parse_args(argv)
+
+    if not 1 <= args.rounds <= 2**20:
+        parser.error("--rounds must be between 1 and 1048576")
+    if not 1 <= args.length <= 1000:
+        parser.error("--length must be between 1 and 1000")
+    if args.seed is None:
+        args.seed = secrets.randbits(31)
+
+    bank = read_questions(Path(args.questions_dir))
+    unknown = sorted(set(args.fact_types) - set(bank["fact_type"].dropna()))
+    if unknown:
+        parser.error(f"unknown fact type(s): {', '.join(unknown)}")
+
+    started = time.perf_counter()
+    try:
+        pack = build_pack(
+            bank,
+            fingerprint(bank),
+            args.name,
+            args.fact_types,
+            args.max_difficulty,
+            args.length,
+            args.rounds,
+            args.seed,
+        )
+    except RoundGenerationError as exc:
+        parser.exit(1, f"error: {exc}\n")
+
+    path = Path(args.out) / f"{args.name}{PACK_SUFFIX}"
+    save_pack(pack, path)
+
+    print(
+        f"Wrote {len(pack)} rounds to {path} ({path.stat().st_size / 1024:,.1f} KiB, "
+        f"seed {args.seed}) in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
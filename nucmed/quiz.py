@@ -0,0 +1,155 @@
+"""
+Flashcard, multiple-choice and match-up engines for the card deck.
+
+These are the samplers behind app.py, kept free of Streamlit so the offline
+tools can build the same quizzes. Every sampler draws from the
+numpy.random.Generator it is given, so a seed fully determines the output.
+
+A deck's records and per-column values are built once per deck (see
+DeckIndex); the samplers draw row positions and index into them. They use
+the generator exactly as DataFrame.sample would, so a seed gives the same
+quiz as before the index existed.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------------------------------------------------
+# Per-deck index
+# ---------------------------------------------------------------------
+class DeckIndex:
+    """
+    A deck's rows as records and each column's distinct values, built once.
+
+    Decks are shared read-only by every session and request, so this stays
+    valid for the deck's lifetime. Column lists and match answers are built
+    the first time they are asked for and then kept.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = weakref.ref(df)   # the module cache drops this index with the deck
+        self.records = df.to_dict("records")
+        self.values = lru_cache(maxsize=None)(self._values)
+        self.text_values = lru_cache(maxsize=None)(self._text_values)
+        self.answers = lru_cache(maxsize=64)(self._answers)
+
+    def _values(self, col: str) -> Tuple[list, dict]:
+        """Distinct non-missing values of col in deck order, and the position of each."""
+        values = self._df()[col].dropna().unique().tolist()
+        return values, {value: i for i, value in enumerate(values)}
+
+    def _text_values(self, col: str) -> list:
+        return self._df()[col].dropna().astype(str).unique().tolist()
+
+    def _answers(self, base_col: str, target_cols: tuple) -> dict:
+        """base value -> {target column: match answer}, for every base value."""
+        values, _ = self.values(base_col)
+        key = match_answer_key(self._df(), base_col, pd.Series(values, dtype=object), list(target_cols))
+        return dict(zip(values, key.to_dict("records")))
+
+
+_indexes: dict[int, tuple[weakref.ref, DeckIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def deck_index(df: pd.DataFrame) -> DeckIndex:
+    key = id(df)
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    index = DeckIndex(df)
+
+    def forget(ref: weakref.ref) -> None:
+        with _indexes_lock:
+            if _indexes.get(key, (None,))[0] is ref:
+                del _indexes[key]
+
+    with _indexes_lock:
+        _indexes[key] = (weakref.ref(df, forget), index)
+    return index
+
+
+# ---------------------------------------------------------------------
+# Samplers
+# ---------------------------------------------------------------------
+def shuffled_deck(df: pd.DataFrame, rng: np.random.Generator) -> List[dict]:
+    records = deck_index(df).records
+    # The draw DataFrame.sample(frac=1) makes.
+    return [dict(records[i]) for i in rng.choice(len(records), size=len(records), replace=False)]
+
+
+def mcq_options(
+    df: pd.DataFrame,
+    row: dict,
+    col_a: str,
+    rng: np.random.Generator,
+    n_distractors: int = 3,
+) -> List[str]:
+    """Up to n_distractors other values of col_a, followed by the correct one."""
+    correct = row.get(col_a, "")
+    values, position = deck_index(df).values(col_a)
+    # The distractors are values without the correct one; skip its position.
+    skip = position.get(correct)
+    picks = rng.permutation(len(values) - (skip is not None))[:n_distractors]
+    if skip is not None:
+        picks = picks + (picks >= skip)
+    return [values[i] for i in picks] + [correct]
+
+
+def sample_match_positions(df: pd.DataFrame, rng: np.random.Generator, n: int = 6) -> np.ndarray:
+    """Row positions of a match grid, drawn as DataFrame.sample(n) draws them."""
+    return rng.choice(len(df), size=min(n, len(df)), replace=False)
+
+
+def sample_match_rows(df: pd.DataFrame, rng: np.random.Generator, n: int = 6) -> pd.DataFrame:
+    return df.take(sample_match_positions(df, rng, n)).reset_index(drop=True)
+
+
+def match_answer_pools(
+    df: pd.DataFrame,
+    target_cols: List[str],
+    rng: np.random.Generator,
+) -> Dict[str, List[str]]:
+    """Shuffled unique answers for each target column."""
+    index = deck_index(df)
+    pools = {}
+    for c in target_cols:
+        pool = index.text_values(c)
+        pools[c] = [pool[i] for i in rng.permutation(len(pool))]
+    return pools
+
+
+def match_answer(df: pd.DataFrame, base_col: str, base_value, tcol: str) -> str:
+    """The expected answer for a match cell: first tcol value of the base row."""
+    real_ans_series = df.loc[df[base_col] == base_value, tcol].dropna()
+    return str(real_ans_series.iloc[0]) if not real_ans_series.empty else ""
+
+
+def match_answer_key(
+    df: pd.DataFrame,
+    base_col: str,
+    base_values: pd.Series,
+    target_cols: List[str],
+) -> pd.DataFrame:
+    """
+    match_answer for a whole grid at once.
+
+    One row per entry of base_values (same index), one column per target
+    column; cells with no answer are "". Built with one group-by, so a grid
+    is scored with a single DataFrame comparison instead of a lookup per cell.
+    """
+    first = df.dropna(subset=[base_col]).groupby(base_col, sort=False)[target_cols].first()
+    key = first.reindex(base_values.to_numpy())
+    key = key.apply(lambda s: s.map(str, na_action="ignore")).fillna("")
+    key.index = base_values.index
+    return key
@@ -0,0 +1,265 @@
+"""
+In-memory full-text search over the card decks and the Hot or Not bank.
+
+The index is built once per loaded dataset:
+
+* an inverted index from normalized term to a sorted NumPy array of
+  document ids, with an idf weight per term;
+* a trigram index from 3-character grams to vocabulary terms, used to
+  expand a misspelled query term ("thyriod") to the terms it resembles:
+  terms that share enough trigrams, or are within two edits of it;
+* a sorted vocabulary for prefix matches on the last query term, so
+  results appear while the user is still typing.
+
+Queries only touch the posting lists of the terms they expand to, never the
+underlying DataFrames.
+
+Nuclide names are normalized so "Ga-68", "ga68" and "Gallium-68" are the
+same term.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, Iterator, Mapping
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# Element names used in the decks -> symbols, so either spelling matches.
+ELEMENT_SYMBOLS = {
+    "barium": "ba",
+    "carbon": "c",
+    "cesium": "cs",
+    "chromium": "cr",
+    "cobalt": "co",
+    "copper": "cu",
+    "fluorine": "f",
+    "gallium": "ga",
+    "indium": "in",
+    "iodine": "i",
+    "krypton": "kr",
+    "lutetium": "lu",
+    "molybdenum": "mo",
+    "nitrogen": "n",
+    "oxygen": "o",
+    "phosphorus": "p",
+    "radium": "ra",
+    "rubidium": "rb",
+    "samarium": "sm",
+    "strontium": "sr",
+    "technetium": "tc",
+    "thallium": "tl",
+    "xenon": "xe",
+    "yttrium": "y",
+    "zirconium": "zr",
+}
+
+_WORD = re.compile(r"[a-z0-9]+")
+# "ga-68", "ga 68", "ga68", "tc-99m", "gallium-68"
+_NUCLIDE = re.compile(r"\b([a-z]{1,10})[\s-]?(\d{1,3}m?)\b")
+
+FUZZY_MIN_SIMILARITY = 0.45   # trigram Jaccard similarity accepted on its own
+FUZZY_MAX_EDITS = 2           # or this many edits (1 for terms under 5 letters)
+FUZZY_MAX_EXPANSIONS = 8
+PREFIX_MAX_EXPANSIONS = 32
+
+
+def _nuclide(element: str, mass: str) -> str | None:
+    symbol = ELEMENT_SYMBOLS.get(element, element)
+    return f"{symbol}{mass}" if len(symbol) <= 2 else None
+
+
+def _nuclide_terms(text: str) -> list[str]:
+    terms = []
+    for element, mass in _NUCLIDE.findall(text):
+        term = _nuclide(element, mass)
+        if term:
+            terms.append(term)
+    return terms
+
+
+def _strip_nuclides(text: str) -> str:
+    return _NUCLIDE.sub(lambda m: " " if _nuclide(*m.groups()) else m.group(0), text)
+
+
+def tokenize(text: str) -> list[str]:
+    text = text.lower()
+    return _WORD.findall(text) + _nuclide_terms(text)
+
+
+def _trigrams(term: str) -> set[str]:
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edits (insert, delete, substitute, swap two neighbours) from a to b, or
+    limit + 1 as soon as it is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    before, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return previous[-1]
+
+
+def frame_documents(frames: Mapping[str, pd.DataFrame]) -> Iterator[tuple[str, object, str]]:
+    """(source, row label, text) for every row; the text is all cells but __row_id."""
+    for source, frame in frames.items():
+        text_columns = [c for c in frame.columns if c != "__row_id"]
+        # astype(object) first: fillna("") fails on categorical columns.
+        texts = frame[text_columns].astype(object).fillna("").astype(str).agg(" ".join, axis=1)
+        for label, text in texts.items():
+            yield source, label, text
+
+
+@dataclass(frozen=True)
+class Hit:
+    doc_id: int
+    source: str
+    key: object
+    score: float
+
+
+class SearchIndex:
+    def __init__(self, documents: Iterable[tuple[str, object, str]]) -> None:
+        """documents: (source, key, text); key is e.g. the row label."""
+        self.sources: list[str] = []
+        self.keys: list[object] = []
+
+        postings: dict[str, list[int]] = defaultdict(list)
+        for doc_id, (source, key, text) in enumerate(documents):
+            self.sources.append(source)
+            self.keys.append(key)
+            for term in set(tokenize(text)):
+                postings[term].append(doc_id)
+
+        n_docs = max(1, len(self.keys))
+        self.postings = {term: np.asarray(ids, dtype=np.int32) for term, ids in postings.items()}
+        self.idf = {
+            term: math.log(1 + n_docs / len(ids)) for term, ids in self.postings.items()
+        }
+        self.vocabulary = sorted(self.postings)
+        self._source_array = np.asarray(self.sources, dtype=object)
+
+        grams: dict[str, list[str]] = defaultdict(list)
+        for term in self.vocabulary:
+            for gram in _trigrams(term):
+                grams[gram].append(term)
+        self.trigrams = dict(grams)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    # -----------------------------------------------------------------
+    # Term expansion
+    # -----------------------------------------------------------------
+    def _prefix_terms(self, prefix: str) -> list[str]:
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        found = []
+        for term in self.vocabulary[start : start + PREFIX_MAX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            found.append(term)
+        return found
+
+    def _fuzzy_terms(self, term: str) -> list[str]:
+        grams = _trigrams(term)
+        shared: dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self.trigrams.get(gram, ()):
+                shared[candidate] += 1
+
+        # A swap of two letters breaks three trigrams, so "thyriod" shares
+        # only a third of its grams with "thyroid"; edit distance catches it.
+        max_edits = FUZZY_MAX_EDITS if len(term) >= 5 else 1
+        scored = []
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + len(_trigrams(candidate)) - count)
+            edits = _edit_distance(term, candidate, max_edits) if count >= 2 else max_edits + 1
+            if edits <= max_edits or similarity >= FUZZY_MIN_SIMILARITY:
+                scored.append((min(edits, max_edits + 1), -similarity, candidate))
+
+        scored.sort()
+        return [candidate for _, _, candidate in scored[:FUZZY_MAX_EXPANSIONS]]
+
+    def expand(self, term: str, is_last: bool = False) -> list[str]:
+        if term in self.postings:
+            terms = [term]
+        else:
+            terms = self._fuzzy_terms(term)
+        if is_last and len(term) >= 2:
+            terms += [t for t in self._prefix_terms(term) if t not in terms]
+        return terms
+
+    # -----------------------------------------------------------------
+    # Queries
+    # -----------------------------------------------------------------
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        sources: Iterable[str] | None = None,
+    ) -> list[Hit]:
+        """
+        Rank documents by the idf of the query terms they contain.
+
+        Documents matching every query term come first; if none do, the
+        best partial matches are returned instead.
+        """
+        query = query.lower()
+        # "ga-68" is searched as the single term "ga68", not "ga" and "68".
+        words = _WORD.findall(_strip_nuclides(query))
+        terms = words + _nuclide_terms(query)
+        if not terms or not self.keys:
+            return []
+
+        scores = np.zeros(len(self.keys), dtype=np.float32)
+        matched = np.zeros(len(self.keys), dtype=np.int16)
+        groups = 0
+
+        for position, term in enumerate(terms):
+            expansions = self.expand(term, is_last=position == len(words) - 1)
+            if not expansions:
+                continue
+            groups += 1
+            docs = np.unique(np.concatenate([self.postings[t] for t in expansions]))
+            scores[docs] += max(self.idf[t] for t in expansions)
+            matched[docs] += 1
+
+        if not groups:
+            return []
+
+        if sources is not None:
+            allowed = np.isin(self._source_array, list(sources))
+            scores[~allowed] = 0
+            matched[~allowed] = 0
+
+        full = matched == groups
+        candidates = np.flatnonzero(full) if full.any() else np.flatnonzero(scores > 0)
+        if candidates.size > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        return [
+            Hit(int(doc), self.sources[doc], self.keys[doc], float(scores[doc]))
+            for doc in candidates
+        ]
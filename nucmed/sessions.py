@@ -0,0 +1,234 @@
+"""
+Idle-session compaction and the server memory gauge.
+
+Every page calls touch() at the top of each run. A background sweeper then
+compacts any session that has not run for IDLE_SECONDS (env
+NUCMED_IDLE_SECONDS, default 15 minutes):
+
+* rebuildable caches are dropped; the pages recompute them when missing
+  (the Match-Up answer pools and key, a pre-built next Hot or Not round);
+* large values are packed into a small snapshot under PACKED_KEY: the
+  flashcard deck and the Match-Up rows become int32 arrays of __row_id;
+* the MCQ option cache keeps only the question on screen.
+
+Seeds, indices, counters, progress bitsets and Hot or Not rounds (already
+int32 index arrays) are left as they are. On the next run the page calls
+rehydrate() with one function per packed key to rebuild the full value
+from its snapshot, before anything reads it.
+
+Compaction goes through the script-run context's SafeSessionState, which
+locks every access. A per-session lock also keeps a sweep and the start of
+a run (touch) apart, so a page never sees a half-compacted state.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+
+IDLE_SECONDS = float(os.environ.get("NUCMED_IDLE_SECONDS", 15 * 60))
+PACKED_KEY = "_packed"
+
+
+def _row_ids(records) -> np.ndarray:
+    return np.fromiter((r["__row_id"] for r in records), dtype=np.int32, count=len(records))
+
+
+def _last_entry(options: dict) -> dict:
+    # Insertion order: the last entry is the question on screen.
+    return dict(list(options.items())[-1:])
+
+
+# key -> (action, function); "pack" moves function(value) under PACKED_KEY,
+# "shrink" replaces the value in place, "drop" deletes it.
+COMPACTORS: dict[str, tuple[str, Callable | None]] = {
+    "deck": ("pack", _row_ids),
+    "match_rows": ("pack", lambda rows: rows["__row_id"].to_numpy(dtype=np.int32)),
+    "mcq_opts": ("shrink", _last_entry),
+    "match_answer_pools": ("drop", None),
+    "match_key": ("drop", None),
+    "hon_next_round": ("drop", None),
+}
+
+
+class _Session:
+    __slots__ = ("state", "last_active", "compacted", "lock")
+
+    def __init__(self, state) -> None:
+        self.state = state   # the latest run's SafeSessionState
+        self.last_active = time.monotonic()
+        self.compacted = False
+        self.lock = threading.Lock()
+
+
+_sessions: dict[str, _Session] = {}
+_registry_lock = threading.Lock()
+_sweeper_started = False
+
+
+# ---------------------------------------------------------------------
+# Page API
+# ---------------------------------------------------------------------
+def touch() -> None:
+    """Record activity for the current session; waits out a sweep in progress."""
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    if ctx is None:   # bare mode, e.g. `python app.py`
+        return
+
+    with _registry_lock:
+        session = _sessions.get(ctx.session_id)
+        if session is None:
+            session = _sessions[ctx.session_id] = _Session(ctx.session_state)
+        _start_sweeper()
+
+    with session.lock:
+        session.state = ctx.session_state
+        session.last_active = time.monotonic()
+        session.compacted = False
+
+
+def rehydrate(state, unpackers: dict[str, Callable[[Any], Any]]) -> None:
+    """
+    Rebuild packed values with unpackers[key](snapshot).
+
+    Keys this page has no unpacker for stay packed for the page that does.
+    If a snapshot no longer fits the data (e.g. a different deck is loaded),
+    the key is left missing and the page's usual bootstrap rebuilds it.
+    """
+    packed = state.get(PACKED_KEY)
+    if not packed:
+        return
+
+    for key, unpack in unpackers.items():
+        if key in packed:
+            snapshot = packed.pop(key)
+            try:
+                state[key] = unpack(snapshot)
+            except (IndexError, KeyError, ValueError):
+                pass
+
+
+# ---------------------------------------------------------------------
+# Sweeper
+# ---------------------------------------------------------------------
+def compact(state) -> int:
+    """Compact one session's state in place; returns the number of keys touched."""
+    packed = dict(state[PACKED_KEY]) if PACKED_KEY in state else {}
+    changed = 0
+
+    for key, (action, function) in COMPACTORS.items():
+        if key not in state:
+            continue
+
+        if action == "pack":
+            packed[key] = function(state[key])
+            state[PACKED_KEY] = packed   # snapshot first, then drop the value
+            del state[key]
+        elif action == "shrink":
+            state[key] = function(state[key])
+        else:
+            del state[key]
+        changed += 1
+
+    return changed
+
+
+def _forget_closed_sessions() -> None:
+    """Drop sessions whose tab is gone, so the registry does not keep their state alive."""
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return
+
+    runtime = Runtime.instance()
+    with _registry_lock:
+        for session_id in [sid for sid in _sessions if not runtime.is_active_session(sid)]:
+            del _sessions[session_id]
+
+
+def sweep(idle_seconds: float = IDLE_SECONDS) -> int:
+    """Compact every session idle for idle_seconds; returns how many were compacted."""
+    _forget_closed_sessions()
+    now = time.monotonic()
+
+    with _registry_lock:
+        candidates = list(_sessions.values())
+
+    count = 0
+    for session in candidates:
+        with session.lock:
+            if session.compacted or now - session.last_active < idle_seconds:
+                continue
+            compact(session.state)
+            session.compacted = True
+            count += 1
+
+    return count
+
+
+def _sweep_forever() -> None:
+    interval = max(1.0, min(60.0, IDLE_SECONDS / 4))
+    while True:
+        time.sleep(interval)
+        try:
+            sweep()
+        except Exception:   # a bad session must not stop the sweeper
+            continue
+
+
+def _start_sweeper() -> None:
+    global _sweeper_started
+
+    if not _sweeper_started:
+        _sweeper_started = True
+        threading.Thread(target=_sweep_forever, name="nucmed-session-sweeper", daemon=True).start()
+
+
+# ---------------------------------------------------------------------
+# Gauges
+# ---------------------------------------------------------------------
+def memory_bytes() -> tuple[int, bool]:
+    """
+    (bytes, is_current) for this server process: the current resident set
+    size where /proc is available, otherwise the peak reported by getrusage.
+    """
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE"), True
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return (peak if sys.platform == "darwin" else peak * 1024), False
+
+
+def session_states() -> list[dict]:
+    """A snapshot of every known session's user-visible state, for size estimates."""
+    with _registry_lock:
+        sessions = list(_sessions.values())
+
+    snapshots = []
+    for session in sessions:
+        with session.lock:
+            snapshots.append(dict(session.state.filtered_state))
+    return snapshots
+
+
+def stats() -> dict:
+    with _registry_lock:
+        sessions = list(_sessions.values())
+    rss, is_current = memory_bytes()
+    return {
+        "sessions": len(sessions),
+        "compacted": sum(s.compacted for s in sessions),
+        "memory_bytes": rss,
+        "memory_is_current": is_current,
+    }
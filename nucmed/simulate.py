@@ -0,0 +1,246 @@
+"""
+Monte Carlo balance simulator for Hot or Not.
+
+Plays many synthetic rounds at once with NumPy: every array has one slot per
+round and the loop runs over question positions only. The rules mirror the
+page exactly:
+
+* decay is applied for the whole answer time before the answer counts, and
+  a meter at or below NOT_THRESHOLD ends the round with that answer unheard
+  (the rerun's apply_decay ends the round before the button handler runs);
+* a correct answer bumps the meter and the streak, a wrong one applies the
+  penalty and resets the streak, and the round is lost if the meter is then
+  at or below NOT_THRESHOLD;
+* XP per answer comes from calculate_xp_for_answer itself, tabulated by
+  streak and speed, so changes to the XP curve are picked up automatically;
+* clearing the round adds ROUND_CLEAR_BONUS, plus PERFECT_ROUND_BONUS when
+  every answer was correct.
+
+Player skill is drawn per round: accuracy from a Beta distribution with the
+given mean and concentration, answer times from a log-normal distribution
+with the given median.
+
+Usage:
+    python -m nucmed.simulate --rounds 1000000
+    python -m nucmed.simulate --accuracy 0.7 --time-median 4 --round-length 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from nucmed.hot_or_not import (
+    DIFFICULTY_SETTINGS,
+    MAX_HOT,
+    NOT_THRESHOLD,
+    PERFECT_ROUND_BONUS,
+    ROUND_CLEAR_BONUS,
+    SPEED_BONUS_SECONDS,
+    STARTING_HOT,
+    XP_LEVELS,
+    calculate_xp_for_answer,
+)
+
+
+# Rounds simulated per batch; bounds peak memory at a few tens of MB.
+CHUNK_SIZE = 250_000
+
+
+@dataclass(frozen=True)
+class PlayerModel:
+    accuracy: float = 0.8
+    accuracy_concentration: float = 20.0
+    time_median: float = 3.0
+    time_sigma: float = 0.5
+
+    def sample_accuracy(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.accuracy_concentration <= 0 or self.accuracy in (0.0, 1.0):
+            return np.full(n, self.accuracy)
+        a = self.accuracy * self.accuracy_concentration
+        b = (1.0 - self.accuracy) * self.accuracy_concentration
+        return rng.beta(a, b, size=n)
+
+    def sample_times(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return rng.lognormal(np.log(self.time_median), self.time_sigma, size=n)
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    difficulty_level: int
+    rounds: int
+    win_rate: float
+    mean_answered: float
+    mean_accuracy: float
+    mean_xp: float
+    xp_per_minute: float
+    mean_round_seconds: float
+
+
+def xp_table(max_streak: int) -> np.ndarray:
+    """earned[speedy, streak] as calculate_xp_for_answer computes it."""
+    slow = SPEED_BONUS_SECONDS + 1.0
+    return np.array(
+        [
+            [calculate_xp_for_answer(True, slow, s)[0] for s in range(max_streak + 1)],
+            [calculate_xp_for_answer(True, 0.0, s)[0] for s in range(max_streak + 1)],
+        ],
+        dtype=np.int64,
+    )
+
+
+def _simulate_chunk(
+    n: int,
+    round_length: int,
+    settings: dict,
+    player: PlayerModel,
+    table: np.ndarray,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, ...]:
+    meter = np.full(n, STARTING_HOT)
+    streak = np.zeros(n, dtype=np.int64)
+    answered = np.zeros(n, dtype=np.int64)
+    correct = np.zeros(n, dtype=np.int64)
+    xp = np.zeros(n, dtype=np.int64)
+    seconds = np.zeros(n)
+    alive = np.ones(n, dtype=bool)
+
+    accuracy = player.sample_accuracy(rng, n)
+
+    for _ in range(round_length):
+        answer_time = player.sample_times(rng, n)
+        hits = rng.random(n) < accuracy
+
+        seconds += np.where(alive, answer_time, 0.0)
+        meter = np.where(
+            alive,
+            np.maximum(0.0, meter - answer_time * settings["decay_rate"]),
+            meter,
+        )
+        alive &= meter > NOT_THRESHOLD
+
+        right = alive & hits
+        wrong = alive & ~hits
+
+        answered += alive
+        correct += right
+        streak = np.where(right, streak + 1, np.where(wrong, 0, streak))
+        meter = np.where(right, np.minimum(MAX_HOT, meter + settings["correct_bump"]), meter)
+        meter = np.where(wrong, np.maximum(0.0, meter - settings["wrong_penalty"]), meter)
+
+        speedy = (answer_time < SPEED_BONUS_SECONDS).astype(np.int64)
+        xp += np.where(right, table[speedy, streak], 0)
+
+        alive &= meter > NOT_THRESHOLD
+
+    won = alive
+    xp += np.where(won, ROUND_CLEAR_BONUS, 0)
+    xp += np.where(won & (correct == answered), PERFECT_ROUND_BONUS, 0)
+
+    return won, answered, correct, xp, seconds
+
+
+def simulate(
+    difficulty_level: int,
+    rounds: int,
+    round_length: int = 20,
+    player: PlayerModel | None = None,
+    rng: np.random.Generator | None = None,
+) -> SimulationResult:
+    player = player or PlayerModel()
+    rng = rng if rng is not None else np.random.default_rng()
+    settings = DIFFICULTY_SETTINGS[difficulty_level]
+    table = xp_table(round_length)
+
+    won_total = answered_total = correct_total = xp_total = 0
+    seconds_total = 0.0
+
+    for start in range(0, rounds, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, rounds - start)
+        won, answered, correct, xp, seconds = _simulate_chunk(
+            n, round_length, settings, player, table, rng
+        )
+        won_total += int(won.sum())
+        answered_total += int(answered.sum())
+        correct_total += int(correct.sum())
+        xp_total += int(xp.sum())
+        seconds_total += float(seconds.sum())
+
+    return SimulationResult(
+        difficulty_level=difficulty_level,
+        rounds=rounds,
+        win_rate=won_total / rounds,
+        mean_answered=answered_total / rounds,
+        mean_accuracy=correct_total / answered_total if answered_total else 0.0,
+        mean_xp=xp_total / rounds,
+        xp_per_minute=60.0 * xp_total / seconds_total if seconds_total else 0.0,
+        mean_round_seconds=seconds_total / rounds,
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m nucmed.simulate",
+        description="Simulate Hot or Not rounds for every difficulty level.",
+    )
+    parser.add_argument("--rounds", type=int, default=1_000_000, help="rounds per difficulty level")
+    parser.add_argument("--round-length", type=int, default=20)
+    parser.add_argument("--accuracy", type=float, default=0.8, help="mean answer accuracy")
+    parser.add_argument(
+        "--accuracy-concentration",
+        type=float,
+        default=20.0,
+        help="Beta concentration of per-round accuracy; 0 for a fixed accuracy",
+    )
+    parser.add_argument("--time-median", type=float, default=3.0, help="median seconds per answer")
+    parser.add_argument("--time-sigma", type=float, default=0.5, help="log-normal sigma of answer times")
+    parser.add_argument("--levels", type=int, nargs="*", default=sorted(DIFFICULTY_SETTINGS))
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    player = PlayerModel(
+        accuracy=args.accuracy,
+        accuracy_concentration=args.accuracy_concentration,
+        time_median=args.time_median,
+        time_sigma=args.time_sigma,
+    )
+    rng = np.random.default_rng(args.seed)
+
+    print(
+        f"{args.rounds:,} rounds x {args.round_length} questions per level | "
+        f"accuracy {args.accuracy:.0%} | median answer {args.time_median:.1f}s"
+    )
+    print(f"{'level':<28}{'win rate':>10}{'answered':>10}{'XP/round':>10}{'XP/min':>9}{'sec':>7}")
+
+    results = []
+    started = time.perf_counter()
+    for level in args.levels:
+        r = simulate(level, args.rounds, args.round_length, player, rng)
+        results.append(r)
+        name = f"{level}: {DIFFICULTY_SETTINGS[level]['name']}"
+        print(
+            f"{name:<28}{r.win_rate:>10.1%}{r.mean_answered:>10.1f}"
+            f"{r.mean_xp:>10.1f}{r.xp_per_minute:>9.1f}{r.mean_round_seconds:>7.0f}"
+        )
+    elapsed = time.perf_counter() - started
+
+    print()
+    print("Minutes of play to reach each XP level:")
+    for level in XP_LEVELS[1:]:
+        minutes = "  ".join(
+            f"L{r.difficulty_level} {level['xp_required'] / r.xp_per_minute:6.1f}"
+            if r.xp_per_minute
+            else f"L{r.difficulty_level}    -"
+            for r in results
+        )
+        print(f"  {level['name']:<26}{minutes}")
+
+    print(f"\nSimulated {args.rounds * len(results):,} rounds in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,253 @@
+"""
+Head-to-head Hot or Not.
+
+Players in a match play the same round (same bank, settings and seed) and
+every answer is published to an asyncio event hub that runs on its own
+thread in the server process. The hub fans each event out to the other
+players' transports as soon as it arrives.
+
+A transport is anything with an async send(event). The Streamlit page uses
+InboxTransport, a deque the session checks from a short-interval fragment
+every 50 ms and drains there; QueueTransport is an in-process stand-in for
+tests and benchmarks.
+
+A closed tab never leaves its match, so the hub expires matches itself:
+one nobody has joined for EMPTY_MATCH_SECONDS, or with no event for
+IDLE_MATCH_SECONDS.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import secrets
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Protocol
+
+
+# An opponent's correct answer knocks this much off your HOT meter.
+OPPONENT_HIT = 4.0
+
+MATCH_CODE_LENGTH = 5
+MATCH_CODE_ALPHABET = "ABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+EMPTY_MATCH_SECONDS = 120.0
+IDLE_MATCH_SECONDS = 30 * 60.0
+EXPIRE_EVERY_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class AnswerEvent:
+    match_code: str
+    player: str
+    question_index: int
+    is_correct: bool
+    hot_meter: float
+    finished: bool = False
+    answered: bool = True   # False: a status update (e.g. knocked out), not an answer
+    sent_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class PlayerStatus:
+    answered: int = 0
+    correct: int = 0
+    hot_meter: float = 0.0
+    finished: bool = False
+
+
+@dataclass
+class Match:
+    code: str
+    settings: dict
+    seed: int
+    players: dict[str, PlayerStatus] = field(default_factory=dict)
+    last_event: float = field(default_factory=time.monotonic)
+    empty_since: float | None = field(default_factory=time.monotonic)
+
+
+class Transport(Protocol):
+    async def send(self, event: AnswerEvent) -> None: ...
+
+
+class QueueTransport:
+    """In-process transport: events land on a thread-safe deque."""
+
+    def __init__(self) -> None:
+        self.events: deque[AnswerEvent] = deque()
+        self.latencies: deque[float] = deque()
+        self._arrived = threading.Event()
+
+    async def send(self, event: AnswerEvent) -> None:
+        self.latencies.append(time.monotonic() - event.sent_at)
+        self.events.append(event)
+        self._arrived.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        arrived = self._arrived.wait(timeout)
+        self._arrived.clear()
+        return arrived
+
+
+class InboxTransport:
+    """Delivers into a deque the receiving session drains from its polling fragment."""
+
+    def __init__(self) -> None:
+        self.inbox: deque[AnswerEvent] = deque()
+
+    async def send(self, event: AnswerEvent) -> None:
+        self.inbox.append(event)
+
+    def drain(self) -> list[AnswerEvent]:
+        events = []
+        while self.inbox:
+            events.append(self.inbox.popleft())
+        return events
+
+
+def apply_opponent_event(hot_meter: float, event: AnswerEvent) -> float:
+    if event.answered and event.is_correct:
+        return max(0.0, hot_meter - OPPONENT_HIT)
+    return hot_meter
+
+
+class EventHub:
+    def __init__(self) -> None:
+        self._matches: dict[str, Match] = {}
+        self._transports: dict[str, dict[str, Transport]] = {}
+        self._lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="hon-versus-hub",
+            daemon=True,
+        )
+        self._thread.start()
+        self._loop.call_soon_threadsafe(self._expire_periodically)
+
+    # -----------------------------------------------------------------
+    # Lobby
+    # -----------------------------------------------------------------
+    def create_match(self, settings: dict, seed: int) -> Match:
+        with self._lock:
+            code = self._new_code()
+            match = Match(code=code, settings=dict(settings), seed=seed)
+            self._matches[code] = match
+            self._transports[code] = {}
+            return match
+
+    def get_match(self, code: str) -> Match | None:
+        return self._matches.get(code.strip().upper())
+
+    def join(self, code: str, player: str, transport: Transport, hot_meter: float) -> str:
+        """
+        Seat player in the match and return the name they play under: a name
+        already seated gets a suffix ("Ana (2)"), so two players never share
+        one status or replace each other's transport.
+        """
+        code = code.strip().upper()
+
+        with self._lock:
+            match = self._matches.get(code)
+            if match is None:
+                raise KeyError(f"No match with code {code}.")
+
+            seated = self._transports[code]
+            name, n = player, 1
+            while name in seated:
+                n += 1
+                name = f"{player} ({n})"
+
+            match.players[name] = PlayerStatus(hot_meter=hot_meter)
+            match.empty_since = None
+            seated[name] = transport
+            return name
+
+    def leave(self, code: str, player: str) -> None:
+        with self._lock:
+            transports = self._transports.get(code)
+            if transports is None:
+                return
+            transports.pop(player, None)
+            if not transports:
+                self._matches.pop(code, None)
+                self._transports.pop(code, None)
+
+    def expire(self, now: float | None = None) -> int:
+        """Drop matches left empty or idle too long; returns how many went."""
+        now = time.monotonic() if now is None else now
+
+        with self._lock:
+            expired = [
+                code
+                for code, match in self._matches.items()
+                if now - match.last_event >= IDLE_MATCH_SECONDS
+                or (match.empty_since is not None and now - match.empty_since >= EMPTY_MATCH_SECONDS)
+            ]
+            for code in expired:
+                del self._matches[code]
+                del self._transports[code]
+            return len(expired)
+
+    def _expire_periodically(self) -> None:
+        self.expire()
+        self._loop.call_later(EXPIRE_EVERY_SECONDS, self._expire_periodically)
+
+    def _new_code(self) -> str:
+        while True:
+            code = "".join(
+                secrets.choice(MATCH_CODE_ALPHABET) for _ in range(MATCH_CODE_LENGTH)
+            )
+            if code not in self._matches:
+                return code
+
+    # -----------------------------------------------------------------
+    # Events
+    # -----------------------------------------------------------------
+    def publish(self, event: AnswerEvent) -> None:
+        """Thread-safe; returns immediately, fan-out happens on the hub loop."""
+        with self._lock:
+            match = self._matches.get(event.match_code)
+            if match is None:
+                return
+            match.last_event = time.monotonic()
+            status = match.players.setdefault(event.player, PlayerStatus())
+            if event.answered:
+                status.answered += 1
+                status.correct += int(event.is_correct)
+            status.hot_meter = event.hot_meter
+            status.finished = event.finished
+            targets = [
+                transport
+                for player, transport in self._transports[event.match_code].items()
+                if player != event.player
+            ]
+
+        asyncio.run_coroutine_threadsafe(self._fanout(targets, event), self._loop)
+
+    def finish(self, code: str, player: str, question_index: int, hot_meter: float) -> None:
+        """Mark player finished without an answer, e.g. knocked out by opponents' hits."""
+        self.publish(
+            AnswerEvent(
+                match_code=code,
+                player=player,
+                question_index=question_index,
+                is_correct=False,
+                hot_meter=hot_meter,
+                finished=True,
+                answered=False,
+            )
+        )
+
+    async def _fanout(self, targets: list[Transport], event: AnswerEvent) -> None:
+        await asyncio.gather(
+            *(transport.send(event) for transport in targets),
+            return_exceptions=True,
+        )
+
+    def close(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=1)
@@ -0,0 +1,204 @@
+"""
+Process-wide dataset cache, start-up warm-up and readiness file.
+
+Every page keeps its own Streamlit cache, so the same CSVs used to be parsed
+once per page, and a burst of first visitors could start several parses of
+the same file. The loaders here are shared by every page and the API:
+
+* single_flight() computes each value once per process. Concurrent callers
+  that miss wait on a per-key lock and get the one computed value.
+* start() warms every loader, including the derived structures (question
+  bank fingerprint, search index), on a background thread. Streamlit has no
+  process start-up hook, so each page calls it first thing and the first
+  script run of the process, on any page, starts the warm-up.
+* Every cached value is tracked by the memory governor (nucmed/governor.py),
+  which may replace the question bank with a categorical copy or evict a
+  value that has gone cold; the next call then computes it again.
+* When the warm-up finishes, the process writes its own readiness file,
+  READY_FILE plus its pid (data/.ready.<pid>, JSON with what was loaded),
+  and is_ready() turns True. A health check can wait for the file of the
+  server it started after its first request; the API's /health reports
+  the flag. Several server processes can share one checkout: each only
+  replaces its own file, and files of processes that have exited are
+  removed when another one starts.
+
+If a loader fails, the file is not written and the error surfaces again
+on the page that needs the data. Set NUCMED_READY_FILE to move the files.
+
+    python -m nucmed.warmup    # time a cold warm-up
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Hashable
+
+from nucmed import governor
+
+# nucmed.data (and so pandas) is imported inside the loaders, so importing
+# this module does not slow down a page's first paint.
+
+READY_FILE = Path(os.environ.get("NUCMED_READY_FILE", "data/.ready"))   # + ".<pid>" per process
+
+_MISSING = object()
+_values: dict[Hashable, object] = {}
+_locks: dict[Hashable, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+_ready = threading.Event()
+_started = False
+_start_guard = threading.Lock()
+
+
+def single_flight(key: Hashable, compute: Callable[[], object], downcast: bool = False):
+    """
+    compute() once per process for key; concurrent misses share the result.
+    downcast lets the memory governor swap in a copy with categorical columns.
+    """
+    value = _values.get(key, _MISSING)
+    if value is not _MISSING:
+        governor.touch(key)
+        return value
+
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.Lock())
+
+    with lock:
+        value = _values.get(key, _MISSING)
+        if value is _MISSING:
+            _values[key] = compute()
+            value = governor.track(key, _values, allow_downcast=downcast)
+
+    return value
+
+
+def is_cached(key: Hashable) -> bool:
+    return key in _values
+
+
+# ---------------------------------------------------------------------
+# Shared loaders
+# ---------------------------------------------------------------------
+def card_decks() -> dict:
+    """The bundled CSVs, each read on its own (the Search page lists them apart)."""
+    from nucmed.data import DECK_PATH, MASTER_DECK_PATH, read_deck
+
+    def load():
+        return {
+            name: read_deck(path)
+            for name, path in (("Cards", DECK_PATH), ("Master list", MASTER_DECK_PATH))
+            if Path(path).exists()
+        }
+
+    return single_flight("card_decks", load)
+
+
+def default_deck():
+    """The bundled CSVs merged and deduplicated, as on the main page."""
+    from nucmed.data import DECK_PATH, MASTER_DECK_PATH, merge_decks
+
+    return single_flight("default_deck", lambda: merge_decks([DECK_PATH, MASTER_DECK_PATH]))
+
+
+def question_bank(data_dir: Path | None = None):
+    from nucmed.data import QUESTIONS_DIR, read_questions
+
+    data_dir = Path(data_dir or QUESTIONS_DIR)
+    # The Hot or Not engine works the same on categorical columns.
+    return single_flight(("question_bank", data_dir), lambda: read_questions(data_dir), downcast=True)
+
+
+def question_bank_key(data_dir: Path | None = None) -> str:
+    from nucmed.data import QUESTIONS_DIR, fingerprint
+
+    data_dir = Path(data_dir or QUESTIONS_DIR)
+    return single_flight(("question_bank_key", data_dir), lambda: fingerprint(question_bank(data_dir)))
+
+
+def search_index():
+    from nucmed.search import SearchIndex, frame_documents
+
+    def build():
+        frames = {**card_decks(), "Hot or Not": question_bank()}
+        return SearchIndex(frame_documents(frames))
+
+    return single_flight("search_index", build)
+
+
+# ---------------------------------------------------------------------
+# Warm-up
+# ---------------------------------------------------------------------
+def warm_up() -> dict:
+    """Fill every shared loader (blocking) and write the readiness file."""
+    from nucmed.quiz import deck_index
+
+    started = time.perf_counter()
+
+    summary = {
+        "pid": os.getpid(),
+        "cards": len(deck_index(default_deck()).records),   # the samplers' per-deck lists
+        "questions": len(question_bank()),
+        "question_bank_key": question_bank_key(),
+        "indexed": len(search_index()),
+    }
+    summary["seconds"] = round(time.perf_counter() - started, 3)
+    summary["ready_at"] = time.time()
+
+    path = ready_file()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(summary), encoding="utf-8")
+    tmp.replace(path)
+
+    _ready.set()
+    return summary
+
+
+def start() -> None:
+    """Start the warm-up on a background thread, once per process."""
+    global _started
+
+    with _start_guard:
+        if _started:
+            return
+        _started = True
+
+    # A file left by an earlier process with this pid does not mean this
+    # one is warm; other processes' files are theirs unless they exited.
+    ready_file().unlink(missing_ok=True)
+    _remove_stale_ready_files()
+    threading.Thread(target=warm_up, name="nucmed-warmup", daemon=True).start()
+    governor.start()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def ready_file(pid: int | None = None) -> Path:
+    """The readiness file of process pid (default: this one)."""
+    return READY_FILE.with_name(f"{READY_FILE.name}.{pid or os.getpid()}")
+
+
+def _remove_stale_ready_files() -> None:
+    if os.name != "posix":   # os.kill(pid, 0) only probes on POSIX
+        return
+
+    for path in READY_FILE.parent.glob(f"{READY_FILE.name}.*"):
+        pid = path.name[len(READY_FILE.name) + 1:].removesuffix(".tmp")
+        if not pid.isdigit():
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            path.unlink(missing_ok=True)
+        except OSError:   # alive, owned by another user
+            pass
+
+
+if __name__ == "__main__":
+    print(json.dumps(warm_up(), indent=2))
@@ -17,13 +17,45 @@ MVP features:
 
 from __future__ import annotations
 
-import random
+import math
+import secrets
 import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import pandas as pd
+import numpy as np
 import streamlit as st
 
+from nucmed.hot_or_not import (
+    DIFFICULTY_SETTINGS,
+    FACT_TYPE_LABELS,
+    MAX_HOT,
+    NOT_THRESHOLD,
+    PERFECT_ROUND_BONUS,
+    ROUND_CLEAR_BONUS,
+    STARTING_HOT,
+    Round,
+    RoundGenerationError,
+    calculate_xp_for_answer,
+    filter_questions,
+    generate_round,
+    get_next_xp_level,
+    get_xp_level,
+    keep_distractable,
+    resolve_question,
+    round_options,
+)
+from nucmed import sessions, warmup
+from nucmed.events import EventLog
+from nucmed.packs import PACKS_DIR, PackError, RoundPack, list_packs, load_pack
+from nucmed.leaderboard import Leaderboard
+from nucmed.versus import AnswerEvent, EventHub, InboxTransport, apply_opponent_event
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 # ---------------------------------------------------------------------
 # Optional live refresh support
@@ -34,12 +66,19 @@ import streamlit as st
 #
 # If not installed, the app still works, but the HOT meter updates mainly
 # when the user clicks buttons or Streamlit reruns.
-try:
-    from streamlit_autorefresh import st_autorefresh
+@st.cache_resource(show_spinner=False)
+def get_autorefresh():
+    """Probe for streamlit-autorefresh once per process, not on every rerun."""
+    try:
+        from streamlit_autorefresh import st_autorefresh
+    except ImportError:
+        return None
 
-    HAS_AUTOREFRESH = True
-except ImportError:
-    HAS_AUTOREFRESH = False
+    return st_autorefresh
+
+
+st_autorefresh = get_autorefresh()
+HAS_AUTOREFRESH = st_autorefresh is not None
 
 
 # ---------------------------------------------------------------------
@@ -50,311 +89,139 @@ st.set_page_config(
     page_icon="🔥",
     layout="centered",
 )
+warmup.start()   # first run in this process: load every page's data in the background
+sessions.touch()  # idle sessions are compacted; see nucmed/sessions.py
 
 
 # ---------------------------------------------------------------------
 # Constants
 # ---------------------------------------------------------------------
 DATA_DIR = Path("data/hot_or_not")
-
-FACT_TYPE_LABELS = {
-    "half_life": "Half-Life",
-    "decay_mode": "Decay Mode",
-    "emission": "Emission",
-    "generation": "Generation",
-    "common_use": "Common Use",
-}
-
-DIFFICULTY_SETTINGS = {
-    1: {
-        "name": "Warm Background",
-        "decay_rate": 1.0,
-        "correct_bump": 12,
-        "wrong_penalty": 10,
-    },
-    2: {
-        "name": "Mild Uptake",
-        "decay_rate": 1.5,
-        "correct_bump": 10,
-        "wrong_penalty": 12,
-    },
-    3: {
-        "name": "Physiologic Activity",
-        "decay_rate": 2.0,
-        "correct_bump": 9,
-        "wrong_penalty": 15,
-    },
-    4: {
-        "name": "Intense Focal Uptake",
-        "decay_rate": 2.5,
-        "correct_bump": 8,
-        "wrong_penalty": 18,
-    },
-    5: {
-        "name": "Hot Lab Meltdown",
-        "decay_rate": 3.0,
-        "correct_bump": 7,
-        "wrong_penalty": 20,
-    },
-}
-
-XP_LEVELS = [
-    {"level": 1, "name": "Non-Avid", "xp_required": 0},
-    {"level": 2, "name": "Mild Uptake", "xp_required": 100},
-    {"level": 3, "name": "Heterogenous Uptake", "xp_required": 250},
-    {"level": 4, "name": "Focal Uptake", "xp_required": 500},
-    {"level": 5, "name": "Bone Scan Banger", "xp_required": 900},
-    {"level": 6, "name": "Howard's Apprentice", "xp_required": 1400},
-    {"level": 7, "name": "Basically a 3/5 Resident", "xp_required": 2200},
-    {"level": 8, "name": "Mettler Himself", "xp_required": 3200},
-]
-
-STARTING_HOT = 65.0
-MAX_HOT = 100.0
-NOT_THRESHOLD = 20.0
+LEADERBOARD_PATH = Path("data/leaderboard.jsonl")
+EVENTS_DIR = Path("data/events")
+CSS_PATH = Path(__file__).resolve().parent.parent / "nucmed" / "hot_or_not.css"
+QUICK_ANSWER_DIR = Path(__file__).resolve().parent.parent / "nucmed" / "quick_answer"
+
+# Keyboard mode: questions sent ahead to the browser, and answers it collects
+# before syncing (it also syncs once the oldest is a second old).
+PREFETCH_QUESTIONS = 6
+SYNC_EVERY = 3
+
+# Keyboard mode only commits HOT meter decay up to this many seconds ago, so
+# answers still on their way from the browser are applied in the order they
+# were given instead of after the decay that followed them.
+SYNC_GRACE_SECONDS = 2.0
+
+# Keyboard mode trusts the browser's clock only within bounds: an answer may
+# be at most MAX_ANSWER_AGE_SECONDS old when it reaches the server, and its
+# time may undercut the server-side gap since the question came up by at most
+# ANSWER_TIME_SLACK_SECONDS (the answer flash and the screen refresh).
+MAX_ANSWER_AGE_SECONDS = 10.0
+ANSWER_TIME_SLACK_SECONDS = 1.5
+
+# How often a versus player's page checks for opponents' answers. The check
+# only looks at a deque, and the hub delivers in microseconds, so this
+# interval is most of the delay before an opponent's answer shows.
+VERSUS_POLL_SECONDS = 0.05
 
 
 # ---------------------------------------------------------------------
 # CSS
 # ---------------------------------------------------------------------
-st.markdown(
-    """
-    <style>
-    .game-title {
-        font-size: 2.4rem;
-        font-weight: 800;
-        margin-bottom: 0.2rem;
-        text-align: center;
-    }
-
-    .subtitle {
-        text-align: center;
-        opacity: 0.8;
-        margin-bottom: 1.5rem;
-    }
-
-    .question-card {
-        border: 1px solid rgba(250, 250, 250, 0.15);
-        border-radius: 18px;
-        padding: 1.25rem;
-        margin: 1rem 0;
-        background: rgba(255, 255, 255, 0.04);
-        text-align: center;
-    }
-
-    .radionuclide {
-        font-size: 2.2rem;
-        font-weight: 800;
-        margin: 0.5rem 0;
-    }
+@st.cache_resource(show_spinner=False)
+def page_css() -> str:
+    """Read and minify the stylesheet once per process."""
+    rules = " ".join(CSS_PATH.read_text(encoding="utf-8").split())
+    return f"<style>{rules}</style>"
 
-    .prompt-text {
-        font-size: 1.15rem;
-        opacity: 0.9;
-    }
 
-    .feedback-box {
-        border-radius: 14px;
-        padding: 1rem;
-        margin-top: 1rem;
-        background: rgba(255, 255, 255, 0.06);
-    }
-
-    .small-muted {
-        font-size: 0.9rem;
-        opacity: 0.75;
-    }
-
-    div.stButton > button {
-        width: 100%;
-        min-height: 5rem;
-        border-radius: 18px;
-        font-size: 1.05rem;
-        font-weight: 700;
-        white-space: normal;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# Streamlit drops any element a rerun does not emit again, so the <style>
+# tag still goes out every run; only the file read and minify are cached.
+st.markdown(page_css(), unsafe_allow_html=True)
 
 
 # ---------------------------------------------------------------------
 # Data loading
 # ---------------------------------------------------------------------
-@st.cache_data
 def load_questions(data_dir: Path) -> pd.DataFrame:
     """
-    Load Hot or Not fact files from data/hot_or_not/.
-
-    Expected file format for each PSV:
-        item_id|radionuclide|prompt|correct_option|explanation|difficulty
+    Shared, read-only question bank.
 
-    Optional columns:
-        distractor_group
-
-    The fact_type is inferred from the filename.
-    Example:
-        half_life.psv -> fact_type = "half_life"
+    The process-wide warm-up cache hands every rerun the same frame and
+    parses it once even if the warm-up and the first visitors ask for it at
+    the same time. It is not held in a Streamlit cache as well, so the memory
+    governor can downcast or evict it (nucmed/governor.py).
     """
-    if not data_dir.exists():
-        return pd.DataFrame()
-
-    required_columns = {
-        "item_id",
-        "radionuclide",
-        "prompt",
-        "correct_option",
-        "explanation",
-        "difficulty",
-    }
-
-    base_columns = [
-        "question_id",
-        "item_id",
-        "radionuclide",
-        "fact_type",
-        "prompt",
-        "correct_option",
-        "explanation",
-        "difficulty",
-    ]
+    return warmup.question_bank(data_dir)
 
-    supported_optional_columns = [
-        "distractor_group",
-    ]
-
-    frames = []
 
-    for path in sorted(data_dir.glob("*.psv")):
-        fact_type = path.stem
+def bank_key(data_dir: Path) -> str:
+    return warmup.question_bank_key(data_dir)
 
-        # Skip empty placeholder files.
-        if path.stat().st_size == 0:
-            continue
 
-        try:
-            df = pd.read_csv(path, sep="|", quotechar='"', skip_blank_lines=True)
-        except pd.errors.EmptyDataError:
-            continue
-
-        df.columns = df.columns.str.strip()
+@st.cache_data(max_entries=512, show_spinner=False)
+def cached_round(
+    _df: pd.DataFrame,
+    bank: str,
+    selected_fact_types: tuple[str, ...],
+    max_difficulty: int,
+    round_length: int,
+    seed: int,
+    question_pool: tuple[int, ...] | None = None,
+) -> Round:
+    """
+    (bank fingerprint, settings, seed) fully determines a round, so every
+    student on the same assignment seed shares one generated round.
+    """
+    return generate_round(
+        _df,
+        list(selected_fact_types),
+        max_difficulty,
+        round_length,
+        np.random.default_rng(seed),
+        question_pool,
+    )
 
-        # Skip files that only have a header and no rows.
-        if df.empty:
-            continue
 
-        missing = required_columns - set(df.columns)
-        if missing:
-            raise ValueError(
-                f"{path.name} is missing required column(s): "
-                f"{', '.join(sorted(missing))}"
-            )
+@st.cache_resource(max_entries=16, show_spinner=False)
+def get_pack(path: Path, mtime: float) -> RoundPack:
+    """
+    One loaded copy of each round pack per process. mtime is part of the
+    key, so a rebuilt pack replaces the old one.
+    """
+    return load_pack(path)
 
-        df = df.copy()
-        df["fact_type"] = fact_type
-        df["question_id"] = (
-            df["fact_type"].astype(str) + "_" + df["item_id"].astype(str)
-        )
 
-        df["difficulty"] = (
-            pd.to_numeric(df["difficulty"], errors="coerce")
-            .fillna(1)
-            .astype(int)
-            .clip(1, 5)
-        )
+@st.cache_resource(show_spinner=False)
+def get_quick_answer():
+    """Declare the keyboard-answer component once per process."""
+    import streamlit.components.v1 as components
 
-        optional_columns = [
-            col for col in supported_optional_columns if col in df.columns
-        ]
+    return components.declare_component("hot_or_not_quick_answer", path=str(QUICK_ANSWER_DIR))
 
-        frames.append(df[base_columns + optional_columns])
 
-    if not frames:
-        return pd.DataFrame()
+@st.cache_resource
+def get_leaderboard() -> Leaderboard:
+    """One leaderboard per server process, shared by every session."""
+    return Leaderboard(LEADERBOARD_PATH)
 
-    combined = pd.concat(frames, ignore_index=True)
 
-    # Basic cleanup
-    text_cols = [
-        "question_id",
-        "item_id",
-        "radionuclide",
-        "fact_type",
-        "prompt",
-        "correct_option",
-        "explanation",
-        "distractor_group",
-    ]
+@st.cache_resource
+def get_event_log() -> EventLog:
+    """Buffered answer log shared by every session of this process."""
+    return EventLog(EVENTS_DIR)
 
-    for col in text_cols:
-        if col in combined.columns:
-            combined[col] = combined[col].astype(str).str.strip()
 
-    combined = combined.dropna(subset=["radionuclide", "correct_option"])
-    combined = combined[combined["correct_option"].str.len() > 0]
+@st.cache_resource
+def get_event_hub() -> EventHub:
+    """Versus-mode event hub; its asyncio loop runs on a thread of this process."""
+    return EventHub()
 
-    # Normalize optional distractor_group.
-    # If a file does not have distractor_group, fall back to correct_option.
-    # This preserves old behavior while letting emission.psv opt into smarter grouping.
-    if "distractor_group" not in combined.columns:
-        combined["distractor_group"] = combined["correct_option"]
-    else:
-        combined["distractor_group"] = combined["distractor_group"].fillna("")
-        combined.loc[
-            combined["distractor_group"].str.len() == 0,
-            "distractor_group",
-        ] = combined["correct_option"]
 
-    return combined
-
-
-# ---------------------------------------------------------------------
-# XP helpers
-# ---------------------------------------------------------------------
-def get_xp_level(total_xp: int) -> dict:
-    current = XP_LEVELS[0]
-    for level in XP_LEVELS:
-        if total_xp >= level["xp_required"]:
-            current = level
-    return current
-
-
-def get_next_xp_level(total_xp: int) -> dict | None:
-    for level in XP_LEVELS:
-        if total_xp < level["xp_required"]:
-            return level
-    return None
-
-
-def get_streak_multiplier(streak: int) -> float:
-    if streak >= 10:
-        return 2.0
-    if streak >= 6:
-        return 1.5
-    if streak >= 3:
-        return 1.25
-    return 1.0
-
-
-def calculate_xp_for_answer(is_correct: bool, answer_time: float, streak: int) -> tuple[int, dict]:
-    if not is_correct:
-        return 0, {
-            "base_xp": 0,
-            "speed_bonus": 0,
-            "multiplier": 1.0,
-        }
-
-    base_xp = 10
-    speed_bonus = 5 if answer_time < 3.0 else 0
-    multiplier = get_streak_multiplier(streak)
-    earned = round((base_xp + speed_bonus) * multiplier)
-
-    return earned, {
-        "base_xp": base_xp,
-        "speed_bonus": speed_bonus,
-        "multiplier": multiplier,
-    }
+@st.cache_resource
+def get_round_executor() -> ThreadPoolExecutor:
+    """Worker threads that pre-build the next round while a summary is shown."""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="hon-prefetch")
 
 
 # ---------------------------------------------------------------------
@@ -383,95 +250,106 @@ def reset_round_state() -> None:
         "hon_round_answered",
         "hon_round_xp",
         "hon_feedback",
-        "hon_options",
+        "hon_round_distractors",
+        "hon_option_flips",
         "hon_settings",
+        "hon_next_round",
+        "hon_round_id",
     ]
 
+    leave_versus()
+
     for key in keys_to_clear:
         st.session_state.pop(key, None)
 
 
+def next_round_seed() -> int:
+    """
+    The assignment seed when one is set, so everyone on the assignment gets
+    the same round; otherwise the next draw from this session's generator.
+    """
+    assignment = st.session_state.get("assignment_seed", "").strip()
+
+    if assignment:
+        return int(assignment) if assignment.isdigit() else zlib.crc32(assignment.encode("utf-8"))
+
+    if "hon_rng" not in st.session_state:
+        st.session_state.hon_session_seed = secrets.randbits(32)
+        st.session_state.hon_rng = np.random.default_rng(st.session_state.hon_session_seed)
+
+    return int(st.session_state.hon_rng.integers(2**32))
+
+
 def start_round(
     df: pd.DataFrame,
     selected_fact_types: list[str],
     max_difficulty: int,
     round_length: int,
     difficulty_level: int,
+    seed: int | None = None,
+    question_pool: tuple[int, ...] | None = None,
 ) -> None:
     reset_round_state()
 
-    filtered = df.copy()
-
-    if selected_fact_types:
-        filtered = filtered[filtered["fact_type"].isin(selected_fact_types)]
-
-    filtered = filtered[filtered["difficulty"] <= max_difficulty]
-
-    if filtered.empty:
-        st.error("No questions match the selected filters.")
-        return
-
-    # Only keep fact types that have at least 2 unique answer choices.
-    # Otherwise we cannot generate a wrong answer from the same category.
-    eligible_fact_types = []
-    for fact_type, group in filtered.groupby("fact_type"):
-        if group["correct_option"].nunique() >= 2:
-            eligible_fact_types.append(fact_type)
-
-    filtered = filtered[filtered["fact_type"].isin(eligible_fact_types)]
-
-    if filtered.empty:
-        st.error(
-            "No eligible questions found. Each selected fact type needs at least "
-            "two unique correct_option values so the app can generate distractors."
+    if seed is None:
+        seed = next_round_seed()
+
+    try:
+        round_ = cached_round(
+            df,
+            bank_key(DATA_DIR),
+            tuple(selected_fact_types),
+            max_difficulty,
+            round_length,
+            seed,
+            question_pool,
         )
+    except RoundGenerationError as exc:
+        st.error(str(exc))
         return
 
-    sampled = filtered.sample(
-        n=min(round_length, len(filtered)),
-        replace=False,
-        random_state=None,
-    ).to_dict("records")
-
-    # Dynamically generate one incorrect option for each sampled question.
-    # Distractors come from other correct answers in the same fact type.
-    generated_questions = []
-
-    for question in sampled:
-        fact_type = question["fact_type"]
-        correct_option = str(question["correct_option"])
-
-        same_fact_type = filtered[filtered["fact_type"] == fact_type].copy()
-
-        correct_group = str(question.get("distractor_group", "")).strip()
-
-        distractor_rows = same_fact_type[
-            same_fact_type["distractor_group"].astype(str).str.strip() != correct_group
-        ]
+    begin_round(
+        round_,
+        {
+            "difficulty_level": difficulty_level,
+            "round_length": round_length,
+            "selected_fact_types": selected_fact_types,
+            "max_difficulty": max_difficulty,
+            "seed": seed,
+            "question_pool": question_pool,
+        },
+    )
 
-        distractor_pool = (
-            distractor_rows["correct_option"]
-            .dropna()
-            .astype(str)
-            .unique()
-            .tolist()
-        )
 
-        if not distractor_pool:
-            continue
+def deal_pack_round(pack: RoundPack, index: int, difficulty_level: int) -> None:
+    """Start round `index` of an assignment pack; no round is generated."""
+    reset_round_state()
 
-        question = question.copy()
-        question["incorrect_option"] = random.choice(distractor_pool)
-        generated_questions.append(question)
+    begin_round(
+        pack.round(index),
+        {
+            "difficulty_level": difficulty_level,
+            "round_length": pack.round_length,
+            "selected_fact_types": list(pack.fact_types),
+            "max_difficulty": pack.max_difficulty,
+            "seed": pack.seed(index),
+            "question_pool": None,
+            "pack": pack.name,
+            "pack_round": index % len(pack),
+        },
+    )
 
-    if not generated_questions:
-        st.error("Could not generate any questions with distractors.")
-        return
 
+def begin_round(round_: Round, settings: dict) -> None:
+    st.session_state.hon_round_id = secrets.token_hex(4)
     st.session_state.hon_round_active = True
     st.session_state.hon_round_complete = False
     st.session_state.hon_round_lost = False
-    st.session_state.hon_round_questions = generated_questions
+    # The round only keeps row indices into the shared bank; the text is
+    # looked up when a question is rendered.
+    st.session_state.hon_round_questions = round_.questions
+    st.session_state.hon_round_distractors = round_.distractors
+    st.session_state.hon_option_flips = round_.flips
     st.session_state.hon_question_index = 0
     st.session_state.hon_hot_meter = STARTING_HOT
     st.session_state.hon_last_tick = time.time()
@@ -482,23 +360,66 @@ def start_round(
     st.session_state.hon_round_answered = 0
     st.session_state.hon_round_xp = 0
     st.session_state.hon_feedback = None
-    st.session_state.hon_options = {}
-    st.session_state.hon_settings = {
-        "difficulty_level": difficulty_level,
-        "round_length": round_length,
-        "selected_fact_types": selected_fact_types,
-        "max_difficulty": max_difficulty,
-    }
+    st.session_state.hon_settings = settings
+
+
+def prefetch_next_round(df: pd.DataFrame) -> None:
+    """Start building the next round with the same settings in the background."""
+    if "hon_next_round" in st.session_state:
+        return
+
+    settings = st.session_state.get("hon_settings")
+    if not settings or settings.get("pack"):
+        return   # pack rounds are dealt, not built
+
+    seed = next_round_seed()
+    future = get_round_executor().submit(
+        generate_round,
+        df,
+        settings["selected_fact_types"],
+        settings["max_difficulty"],
+        settings["round_length"],
+        np.random.default_rng(seed),
+        settings.get("question_pool"),
+    )
+    st.session_state.hon_next_round = (seed, future)
+
+
+def play_again(pack: RoundPack | None = None) -> None:
+    next_round = st.session_state.pop("hon_next_round", None)
+    settings = st.session_state.get("hon_settings")
+
+    if settings and pack is not None and settings.get("pack") == pack.name:
+        deal_pack_round(pack, settings["pack_round"] + 1, settings["difficulty_level"])
+        return
+
+    reset_round_state()
+
+    if next_round is None or settings is None:
+        return
+
+    seed, future = next_round
+
+    try:
+        round_ = future.result()
+    except RoundGenerationError:
+        # Fall back to the start screen, which reports the problem.
+        return
 
+    begin_round(round_, {**settings, "seed": seed})
 
-def apply_decay() -> None:
+
+def apply_decay(now: float | None = None) -> None:
+    """Decay the HOT meter up to now (default: the current time)."""
     if not st.session_state.get("hon_round_active", False):
         return
 
     if st.session_state.get("hon_round_complete", False):
         return
 
-    now = time.time()
+    if now is None:
+        now = time.time()
+
     last_tick = st.session_state.get("hon_last_tick", now)
     elapsed = max(0.0, now - last_tick)
 
@@ -509,46 +430,204 @@ def apply_decay() -> None:
         0.0,
         st.session_state.hon_hot_meter - elapsed * decay_rate,
     )
-    st.session_state.hon_last_tick = now
+    st.session_state.hon_last_tick = max(last_tick, now)
 
     if st.session_state.hon_hot_meter <= NOT_THRESHOLD:
-        st.session_state.hon_round_lost = True
-        st.session_state.hon_round_complete = True
-        st.session_state.hon_round_active = False
+        lose_round()
+        finish_versus()
 
 
-def get_current_question() -> dict | None:
+def get_current_question(df: pd.DataFrame) -> dict | None:
     questions = st.session_state.get("hon_round_questions", [])
     idx = st.session_state.get("hon_question_index", 0)
 
     if idx >= len(questions):
         return None
 
-    return questions[idx]
+    return resolve_question(
+        df,
+        questions[idx],
+        st.session_state.hon_round_distractors[idx],
+    )
 
 
 def get_shuffled_options(question: dict) -> list[str]:
-    question_id = question["question_id"]
+    idx = st.session_state.get("hon_question_index", 0)
+    return round_options(question, st.session_state.hon_option_flips[idx])
+
+
+# ---------------------------------------------------------------------
+# Versus mode
+# ---------------------------------------------------------------------
+def render_versus_panel() -> None:
+    """
+    The HOT meter and standings of a versus round, with opponents' answers
+    applied as they arrive.
+
+    Runs as a fragment every VERSUS_POLL_SECONDS and redraws only itself;
+    the page reruns only when opponents' hits end the round. Without
+    st.fragment (Streamlit < 1.37) the live refresh timer, or the player's
+    next click, picks the events up instead.
+    """
+    apply_versus_events()
+
+    if not st.session_state.get("hon_round_active", False):   # knocked out
+        st.rerun()
+
+    render_hot_meter(st.session_state.get("hon_hot_meter", STARTING_HOT))
+    render_versus_standings()
+
+
+if hasattr(st, "fragment"):
+    render_versus_panel = st.fragment(run_every=VERSUS_POLL_SECONDS)(render_versus_panel)
+
+
+def player_label() -> str:
+    name = st.session_state.get("player_name", "").strip()
+
+    if not name:
+        st.session_state.setdefault("hon_guest_name", f"Guest-{secrets.token_hex(2).upper()}")
+        name = st.session_state.hon_guest_name
+
+    return name
+
+
+def start_versus_round(df: pd.DataFrame, code: str | None, settings: dict) -> None:
+    """Create a match (code=None) or join one, then start its shared round."""
+    hub = get_event_hub()
+
+    if code is None:
+        seed = next_round_seed()
+    else:
+        match = hub.get_match(code)
+        if match is None:
+            st.session_state.hon_versus_error = f"No match with code {code.strip().upper()}."
+            return
+        seed, settings = match.seed, match.settings
+
+    start_round(df=df, seed=seed, **settings)
+
+    if not st.session_state.get("hon_round_active", False):
+        return
+
+    if code is None:   # only a round that started gets a match
+        match = hub.create_match(settings, seed)
+
+    transport = InboxTransport()
+    player = hub.join(match.code, player_label(), transport, st.session_state.hon_hot_meter)
+    st.session_state.hon_versus = {"code": match.code, "player": player}
+    st.session_state.hon_versus_transport = transport
 
-    if question_id not in st.session_state.hon_options:
-        options = [
-            str(question["correct_option"]),
-            str(question["incorrect_option"]),
-        ]
-        random.shuffle(options)
-        st.session_state.hon_options[question_id] = options
 
-    return st.session_state.hon_options[question_id]
+def leave_versus() -> None:
+    versus = st.session_state.pop("hon_versus", None)
+    st.session_state.pop("hon_versus_transport", None)
 
+    if versus:
+        get_event_hub().leave(versus["code"], versus["player"])
 
-def submit_answer(selected_option: str) -> None:
-    question = get_current_question()
+
+def publish_versus_answer(is_correct: bool) -> None:
+    versus = st.session_state.get("hon_versus")
+
+    if not versus:
+        return
+
+    get_event_hub().publish(
+        AnswerEvent(
+            match_code=versus["code"],
+            player=versus["player"],
+            question_index=st.session_state.hon_question_index,
+            is_correct=is_correct,
+            hot_meter=st.session_state.hon_hot_meter,
+            finished=st.session_state.hon_round_complete,
+        )
+    )
+
+
+def finish_versus() -> None:
+    """Tell the match this player is out, without counting an answer."""
+    versus = st.session_state.get("hon_versus")
+
+    if versus:
+        get_event_hub().finish(
+            versus["code"],
+            versus["player"],
+            st.session_state.hon_question_index,
+            st.session_state.hon_hot_meter,
+        )
+
+
+def apply_versus_events() -> None:
+    """Apply opponents' answers that arrived since the last run."""
+    transport = st.session_state.get("hon_versus_transport")
+
+    if transport is None or not st.session_state.get("hon_round_active", False):
+        return
+
+    for event in transport.drain():
+        st.session_state.hon_hot_meter = apply_opponent_event(
+            st.session_state.hon_hot_meter, event
+        )
+
+    if st.session_state.hon_hot_meter <= NOT_THRESHOLD:
+        lose_round()
+        finish_versus()
+
+
+def answer_clicked(question_id: str, option: str) -> None:
+    """
+    on_click of the answer buttons. Callbacks run before the page, so the
+    answer is scored, and published to a versus match, at the start of the
+    rerun instead of after the page has been drawn once more.
+    """
+    df = load_questions(DATA_DIR)
+    question = get_current_question(df)
+
+    if question is None or question["question_id"] != question_id:   # a stale click
+        return
+
+    apply_decay()
+    submit_answer(df, option)
+
+
+def post_to_leaderboard() -> None:
+    player = st.session_state.get("player_name", "").strip()
+
+    if player:
+        get_leaderboard().submit(player, st.session_state.hon_total_xp)
+
+
+def lose_round() -> None:
+    """End the round as lost: the HOT meter fell to NOT_THRESHOLD."""
+    st.session_state.hon_round_lost = True
+    st.session_state.hon_round_complete = True
+    st.session_state.hon_round_active = False
+    post_to_leaderboard()
+
+
+def submit_answer(
+    df: pd.DataFrame,
+    selected_option: str,
+    answer_time: float | None = None,
+    now: float | None = None,
+) -> None:
+    """
+    Score an answer to the current question.
+
+    answer_time and now default to the server clock; keyboard mode passes
+    the time measured in the browser and when the answer was given.
+    """
+    question = get_current_question(df)
 
     if question is None:
         return
 
-    now = time.time()
-    answer_time = now - st.session_state.get("hon_question_started_at", now)
+    if now is None:
+        now = time.time()
+
+    if answer_time is None:
+        answer_time = now - st.session_state.get("hon_question_started_at", now)
 
     correct_option = str(question["correct_option"])
     is_correct = selected_option == correct_option
@@ -587,11 +666,27 @@ def submit_answer(selected_option: str) -> None:
     st.session_state.hon_total_xp += earned_xp
     st.session_state.hon_round_xp += earned_xp
 
+    get_event_log().append(
+        ts=now,
+        session=st.session_state.setdefault("hon_session_id", secrets.token_hex(8)),
+        player=st.session_state.get("player_name", "").strip() or None,
+        question_id=question["question_id"],
+        fact_type=question["fact_type"],
+        distractor_id=question["distractor_id"],
+        difficulty=question["difficulty"],
+        difficulty_level=difficulty_level,
+        is_correct=is_correct,
+        answer_time=answer_time,
+        streak=st.session_state.hon_streak,
+        earned_xp=earned_xp,
+        speed_bonus=xp_details["speed_bonus"],
+        multiplier=xp_details["multiplier"],
+        hot_meter=st.session_state.hon_hot_meter,
+    )
+
     st.session_state.hon_feedback = {
         "is_correct": is_correct,
-        "selected_option": selected_option,
-        "correct_option": correct_option,
-        "explanation": str(question["explanation"]),
+        "row_idx": question["row_idx"],
         "answer_time": answer_time,
         "earned_xp": earned_xp,
         "xp_details": xp_details,
@@ -599,9 +694,8 @@ def submit_answer(selected_option: str) -> None:
 
     # Check loss immediately after wrong-answer penalty.
     if st.session_state.hon_hot_meter <= NOT_THRESHOLD:
-        st.session_state.hon_round_lost = True
-        st.session_state.hon_round_complete = True
-        st.session_state.hon_round_active = False
+        lose_round()
+        publish_versus_answer(is_correct)
         return
 
     # Advance to next question.
@@ -613,14 +707,114 @@ def submit_answer(selected_option: str) -> None:
         st.session_state.hon_lifetime_rounds += 1
 
         # Completion bonuses
-        st.session_state.hon_total_xp += 25
-        st.session_state.hon_round_xp += 25
+        st.session_state.hon_total_xp += ROUND_CLEAR_BONUS
+        st.session_state.hon_round_xp += ROUND_CLEAR_BONUS
 
         if st.session_state.hon_round_correct == st.session_state.hon_round_answered:
-            st.session_state.hon_total_xp += 50
-            st.session_state.hon_round_xp += 50
+            st.session_state.hon_total_xp += PERFECT_ROUND_BONUS
+            st.session_state.hon_round_xp += PERFECT_ROUND_BONUS
     else:
-        st.session_state.hon_question_started_at = time.time()
+        st.session_state.hon_question_started_at = now
+
+    post_to_leaderboard()
+    publish_versus_answer(is_correct)
+
+
+# ---------------------------------------------------------------------
+# Keyboard mode
+# ---------------------------------------------------------------------
+def quick_answer_window(df: pd.DataFrame) -> list[dict]:
+    """The current question and the next few, as sent to the browser."""
+    questions = st.session_state.hon_round_questions
+    idx = st.session_state.hon_question_index
+    window = []
+
+    for i in range(idx, min(idx + PREFETCH_QUESTIONS, len(questions))):
+        question = resolve_question(df, questions[i], st.session_state.hon_round_distractors[i])
+        flipped = bool(st.session_state.hon_option_flips[i])
+        window.append({
+            "index": i,
+            "total": len(questions),
+            "label": FACT_TYPE_LABELS.get(question["fact_type"], question["fact_type"].replace("_", " ").title()),
+            "radionuclide": str(question["radionuclide"]),
+            "prompt": str(question["prompt"]),
+            "options": round_options(question, flipped),
+        })
+
+    return window
+
+
+def _seconds(value) -> float | None:
+    """A finite, non-negative number of seconds from the browser, else None."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) and value >= 0 else None
+
+
+def apply_quick_answers(df: pd.DataFrame, payload: dict | None) -> bool:
+    """
+    Score the answers synced by the keyboard component, in order.
+
+    The component resends every answer until it sees it applied, so only
+    the one for the current question is taken at each step and the rest
+    are skipped. Returns True if any answer was applied.
+
+    Correctness is judged here only. The browser's times are clamped to the
+    server clock: an answer cannot be dated before its question came up
+    (hon_question_started_at, the previous answer) or more than
+    MAX_ANSWER_AGE_SECONDS ago, and its answer time lies between the gap
+    since the question came up, less ANSWER_TIME_SLACK_SECONDS, and that gap.
+    """
+    if not isinstance(payload, dict) or payload.get("token") != st.session_state.get("hon_round_id"):
+        return False
+
+    answers = payload.get("answers")
+    if not isinstance(answers, list):
+        return False
+
+    received = time.time()
+    applied = False
+
+    for answer in answers:
+        if not st.session_state.get("hon_round_active", False):
+            break
+
+        if not isinstance(answer, dict) or answer.get("index") != st.session_state.hon_question_index:
+            continue
+
+        age, claimed, option = _seconds(answer.get("age")), _seconds(answer.get("time")), answer.get("option")
+        if age is None or claimed is None or not isinstance(option, str):
+            break   # malformed; the answers after it cannot be applied in order either
+
+        started = st.session_state.get("hon_question_started_at", received)
+        answered_at = min(received, max(received - min(age, MAX_ANSWER_AGE_SECONDS), started))
+        gap = answered_at - started
+        answer_time = min(gap, max(claimed, gap - ANSWER_TIME_SLACK_SECONDS))
+
+        apply_decay(answered_at)
+
+        if not st.session_state.get("hon_round_active", False):
+            break
+
+        submit_answer(df, option, answer_time=answer_time, now=answered_at)
+        applied = True
+
+    return applied
+
+
+def render_quick_answer(df: pd.DataFrame) -> None:
+    payload = get_quick_answer()(
+        token=st.session_state.hon_round_id,
+        answered=st.session_state.hon_question_index,
+        questions=quick_answer_window(df),
+        sync_every=SYNC_EVERY,
+        key=f"hon_quick_{st.session_state.hon_round_id}",
+        default=None,
+    )
+
+    if apply_quick_answers(df, payload):
+        st.rerun()
 
 
 # ---------------------------------------------------------------------
@@ -665,12 +859,81 @@ def render_xp_bar() -> None:
     )
 
 
-def render_feedback() -> None:
+def render_leaderboard() -> None:
+    board = get_leaderboard()
+    player = st.session_state.get("player_name", "").strip()
+
+    rank = board.rank(player) if player else None
+    if rank is not None:
+        st.caption(f"🏆 You are #{rank:,} of {len(board):,} on the leaderboard.")
+    elif player:
+        st.caption("🏆 Answer a question to join the leaderboard.")
+
+    with st.expander("Leaderboard"):
+        top = board.top(10)
+
+        if not top:
+            st.write("No scores yet.")
+            return
+
+        for position, (name, xp) in enumerate(top, 1):
+            marker = " ⬅️" if name == player else ""
+            st.write(f"{position}. **{name}** — {xp:,} XP{marker}")
+
+
+def render_versus_standings() -> None:
+    versus = st.session_state.get("hon_versus")
+
+    if not versus:
+        return
+
+    match = get_event_hub().get_match(versus["code"])
+    if match is None:
+        return
+
+    st.caption(f"🤝 Versus match **{match.code}**")
+    rows = [
+        {
+            "Player": name + (" (you)" if name == versus["player"] else ""),
+            "Answered": status.answered,
+            "Correct": status.correct,
+            "HOT": round(status.hot_meter),
+            "Done": "✔" if status.finished else "",
+        }
+        for name, status in sorted(match.players.items())
+    ]
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+
+
+def render_versus_lobby(df: pd.DataFrame, settings: dict) -> None:
+    with st.expander("🤝 Versus mode"):
+        st.caption(
+            "Everyone in a match plays the same questions. "
+            "Each correct answer from an opponent cools your HOT meter."
+        )
+
+        if st.button("Create match with these settings"):
+            start_versus_round(df, None, settings)
+            st.rerun()
+
+        code = st.text_input("Match code", max_chars=8)
+        if st.button("Join match", disabled=not code.strip()):
+            start_versus_round(df, code, settings)
+            st.rerun()
+
+        error = st.session_state.pop("hon_versus_error", None)
+        if error:
+            st.error(error)
+
+
+def render_feedback(df: pd.DataFrame) -> None:
     feedback = st.session_state.get("hon_feedback")
 
     if not feedback:
         return
 
+    row = df.loc[feedback["row_idx"]]
+
     if feedback["is_correct"]:
         st.success(
             f"🔥 HOT! +{feedback['earned_xp']} XP "
@@ -678,11 +941,11 @@ def render_feedback() -> None:
         )
     else:
         st.error(
-            f"❄️ NOT! Correct answer: {feedback['correct_option']}"
+            f"❄️ NOT! Correct answer: {row['correct_option']}"
         )
 
     with st.expander("Explanation", expanded=not feedback["is_correct"]):
-        st.write(feedback["explanation"])
+        st.write(str(row["explanation"]))
 
         if feedback["is_correct"]:
             details = feedback["xp_details"]
@@ -693,7 +956,7 @@ def render_feedback() -> None:
             )
 
 
-def render_round_summary() -> None:
+def render_round_summary(pack: RoundPack | None = None) -> None:
     lost = st.session_state.get("hon_round_lost", False)
     answered = st.session_state.get("hon_round_answered", 0)
     correct = st.session_state.get("hon_round_correct", 0)
@@ -713,10 +976,17 @@ def render_round_summary() -> None:
     col4.metric("XP earned", st.session_state.get("hon_round_xp", 0))
 
     if not lost:
-        st.caption("Round clear bonus: +25 XP. Perfect round bonus: +50 XP.")
+        st.caption(
+            f"Round clear bonus: +{ROUND_CLEAR_BONUS} XP. "
+            f"Perfect round bonus: +{PERFECT_ROUND_BONUS} XP."
+        )
+
+    settings = st.session_state.get("hon_settings") or {}
+    if settings.get("pack"):
+        st.caption(f"📦 Pack **{settings['pack']}**, round {settings['pack_round'] + 1}.")
 
     if st.button("Play Again 🔁", type="primary"):
-        reset_round_state()
+        play_again(pack)
         st.rerun()
 
 
@@ -749,6 +1019,55 @@ if questions_df.empty:
 with st.sidebar:
     st.header("🔥 Hot or Not Settings")
 
+    st.text_input(
+        "Player name",
+        key="player_name",
+        help="Set a name to post your lifetime XP to the local leaderboard.",
+    )
+
+    st.text_input(
+        "Assignment seed",
+        key="assignment_seed",
+        help=(
+            "Everyone using the same seed and settings plays the same round. "
+            "Leave blank for a fresh round every time."
+        ),
+    )
+
+    # Assignment packs: pre-generated rounds from `python -m nucmed.packs`.
+    assignment_pack = None
+    available_packs = list_packs(PACKS_DIR)
+    if available_packs:
+        pack_name = st.selectbox("Assignment pack", ["None", *available_packs], key="assignment_pack")
+        if pack_name in available_packs:
+            pack_path = available_packs[pack_name]
+            try:
+                loaded_pack = get_pack(pack_path, pack_path.stat().st_mtime)
+            except (OSError, PackError) as exc:
+                st.error(str(exc))
+            else:
+                if loaded_pack.bank != bank_key(DATA_DIR):
+                    st.warning(
+                        f"Pack **{pack_name}** was built from a different question bank; "
+                        "rebuild it with `python -m nucmed.packs`."
+                    )
+                else:
+                    assignment_pack = loaded_pack
+
+    if assignment_pack is not None:
+        player = st.session_state.get("player_name", "").strip()
+        pack_round = st.number_input(
+            f"Round in pack (1-{len(assignment_pack)})",
+            min_value=1,
+            max_value=len(assignment_pack),
+            value=assignment_pack.deal(player) + 1 if player else 1,
+            help="Dealt from your player name; type another number to play a different round.",
+        )
+        st.caption(
+            "The pack sets the fact types, question difficulty and round length; "
+            "the settings below are not used."
+        )
+
     fact_types = sorted(questions_df["fact_type"].dropna().unique().tolist())
 
     selected_fact_types = st.multiselect(
@@ -781,6 +1100,11 @@ with st.sidebar:
         step=5,
     )
 
+    if assignment_pack is not None:
+        selected_fact_types = list(assignment_pack.fact_types)
+        max_difficulty = assignment_pack.max_difficulty
+        round_length = assignment_pack.round_length
+
     live_refresh = st.checkbox(
         "Live HOT meter refresh",
         value=HAS_AUTOREFRESH,
@@ -794,7 +1118,25 @@ with st.sidebar:
     if not HAS_AUTOREFRESH:
         st.caption("Optional: `pip install streamlit-autorefresh` for live meter decay.")
 
+    keyboard_mode = st.checkbox(
+        "⌨️ Keyboard mode",
+        key="hon_keyboard_mode",
+        help=(
+            "Answer with F / J (or 1 / 2, ← / →). Upcoming questions are loaded "
+            "ahead and answer times are measured in your browser, so the speed "
+            "bonus does not pay for the round trip to the server."
+        ),
+    )
+
+    search_pool = st.session_state.get("search_questions")
+    if search_pool:
+        st.info(f"🔎 Rounds draw from {len(search_pool)} questions picked on the Search page.")
+        if st.button("Use all questions"):
+            st.session_state.pop("search_questions", None)
+            st.rerun()
+
     if st.button("Reset Hot or Not Progress"):
+        leave_versus()
         for key in list(st.session_state.keys()):
             if key.startswith("hon_"):
                 del st.session_state[key]
@@ -802,8 +1144,9 @@ with st.sidebar:
         st.rerun()
 
 
-# Apply decay every rerun.
-apply_decay()
+# Apply decay and opponents' answers every rerun.
+apply_decay(time.time() - SYNC_GRACE_SECONDS if keyboard_mode else None)
+apply_versus_events()
 
 # Optional live refresh while round is active.
 if (
@@ -828,6 +1171,8 @@ lifetime_correct = st.session_state.get("hon_lifetime_correct", 0)
 lifetime_accuracy = lifetime_correct / lifetime_answered if lifetime_answered else 0
 metric_cols[3].metric("Lifetime accuracy", f"{lifetime_accuracy:.0%}")
 
+render_leaderboard()
+
 
 # Start screen
 if (
@@ -836,17 +1181,11 @@ if (
 ):
     st.markdown("### Start a round")
 
-    available_df = questions_df[
-        (questions_df["fact_type"].isin(selected_fact_types))
-        & (questions_df["difficulty"] <= max_difficulty)
-    ]
-
-    eligible_count = 0
-    for _, group in available_df.groupby("fact_type"):
-        if group["correct_option"].nunique() >= 2:
-            eligible_count += len(group)
-
-    selected_count = eligible_count
+    selected_count = len(
+        keep_distractable(
+            filter_questions(questions_df, selected_fact_types, max_difficulty)
+        )
+    )
 
     st.info(
         f"{selected_count} eligible questions available with the current filters. "
@@ -862,72 +1201,98 @@ if (
     )
 
     if st.button("Start Round ▶", type="primary"):
-        start_round(
-            df=questions_df,
-            selected_fact_types=selected_fact_types,
-            max_difficulty=max_difficulty,
-            round_length=round_length,
-            difficulty_level=difficulty_level,
-        )
+        if assignment_pack is not None:
+            deal_pack_round(assignment_pack, int(pack_round) - 1, difficulty_level)
+        else:
+            start_round(
+                df=questions_df,
+                selected_fact_types=selected_fact_types,
+                max_difficulty=max_difficulty,
+                round_length=round_length,
+                difficulty_level=difficulty_level,
+                question_pool=search_pool,
+            )
         st.rerun()
 
+    render_versus_lobby(
+        questions_df,
+        {
+            "selected_fact_types": selected_fact_types,
+            "max_difficulty": max_difficulty,
+            "round_length": round_length,
+            "difficulty_level": difficulty_level,
+        },
+    )
 
 
 # Active round
 elif st.session_state.get("hon_round_active", False):
-    render_hot_meter(st.session_state.get("hon_hot_meter", STARTING_HOT))
+    if st.session_state.get("hon_versus"):
+        render_versus_panel()
+    else:
+        render_hot_meter(st.session_state.get("hon_hot_meter", STARTING_HOT))
 
     questions = st.session_state.get("hon_round_questions", [])
     idx = st.session_state.get("hon_question_index", 0)
     total = len(questions)
 
-    question = get_current_question()
+    question = get_current_question(questions_df)
 
     if question is None:
         st.session_state.hon_round_complete = True
         st.session_state.hon_round_active = False
         st.rerun()
 
-    st.caption(f"Question {idx + 1} / {total}")
-
-    st.markdown(
-        f"""
-        <div class="question-card">
-            <div class="small-muted">{FACT_TYPE_LABELS.get(question["fact_type"], question["fact_type"].replace("_", " ").title())}</div>
-            <div class="radionuclide">{question["radionuclide"]}</div>
-            <div class="prompt-text">{question["prompt"]}</div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    if keyboard_mode:
+        render_quick_answer(questions_df)
+    else:
+        st.caption(f"Question {idx + 1} / {total}")
+
+        st.markdown(
+            f"""
+            <div class="question-card">
+                <div class="small-muted">{FACT_TYPE_LABELS.get(question["fact_type"], question["fact_type"].replace("_", " ").title())}</div>
+                <div class="radionuclide">{question["radionuclide"]}</div>
+                <div class="prompt-text">{question["prompt"]}</div>
+            </div>
+            """,
+            unsafe_allow_html=True,
+        )
 
-    options = get_shuffled_options(question)
+        options = get_shuffled_options(question)
 
-    col1, col2 = st.columns(2)
+        col1, col2 = st.columns(2)
 
-    with col1:
-        if st.button(options[0], key=f"hon_answer_{question['question_id']}_0"):
-            apply_decay()
-            submit_answer(options[0])
-            st.rerun()
+        with col1:
+            st.button(
+                options[0],
+                key=f"hon_answer_{question['question_id']}_0",
+                on_click=answer_clicked,
+                args=(question["question_id"], options[0]),
+            )
 
-    with col2:
-        if st.button(options[1], key=f"hon_answer_{question['question_id']}_1"):
-            apply_decay()
-            submit_answer(options[1])
-            st.rerun()
+        with col2:
+            st.button(
+                options[1],
+                key=f"hon_answer_{question['question_id']}_1",
+                on_click=answer_clicked,
+                args=(question["question_id"], options[1]),
+            )
 
-    render_feedback()
+    render_feedback(questions_df)
 
     st.markdown("---")
     st.caption(
         "Tip: answer in under 3 seconds for a speed bonus. "
         "Streak multipliers start at 3, 6, and 10 correct in a row."
+        + ("" if keyboard_mode else " Turn on keyboard mode in the sidebar to answer with F and J.")
     )
 
 
 # Completed round
 elif st.session_state.get("hon_round_complete", False):
     render_hot_meter(st.session_state.get("hon_hot_meter", STARTING_HOT))
-    render_feedback()
-    render_round_summary()
\ No newline at end of file
+    render_feedback(questions_df)
+    render_versus_standings()
+    prefetch_next_round(questions_df)
+    render_round_summary(assignment_pack)
\ No newline at end of file
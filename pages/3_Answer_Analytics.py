@@ -0,0 +1,137 @@
+"""
+Answer Analytics - Hot or Not
+
+Reads the answer-event log written by the Hot or Not page and shows which
+questions players find hardest, how long they take, and which distractors
+fool them most often.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from nucmed import governor, sessions, warmup
+from nucmed.events import HAS_PYARROW, confused_pairs, question_stats, read_events
+from nucmed.hot_or_not import FACT_TYPE_LABELS
+
+
+# ---------------------------------------------------------------------
+# Page setup
+# ---------------------------------------------------------------------
+st.set_page_config(
+    page_title="Answer Analytics",
+    page_icon="📊",
+    layout="wide",
+)
+warmup.start()   # first run in this process: load every page's data in the background
+sessions.touch()  # idle sessions are compacted; see nucmed/sessions.py
+
+
+# ---------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------
+EVENTS_DIR = Path("data/events")
+
+
+# ---------------------------------------------------------------------
+# Data loading
+# ---------------------------------------------------------------------
+@st.cache_data(ttl=60, show_spinner="Reading answer log...")
+def load_analytics(events_dir: Path):
+    started = time.perf_counter()
+    events = read_events(events_dir)
+
+    if events.empty:
+        return None
+
+    return {
+        "answers": len(events),
+        "sessions": events["session"].nunique(),
+        "accuracy": float(events["is_correct"].mean()),
+        "median_time": float(events["answer_time"].median()),
+        "questions": question_stats(events),
+        "pairs": confused_pairs(events),
+        "by_fact_type": (
+            events.groupby("fact_type", observed=True)
+            .agg(answers=("is_correct", "size"), accuracy=("is_correct", "mean"),
+                 median_time=("answer_time", "median"))
+        ),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+# ---------------------------------------------------------------------
+# Main app
+# ---------------------------------------------------------------------
+st.title("📊 Answer Analytics")
+
+with st.sidebar:
+    st.subheader("Server")
+    server = sessions.stats()
+    st.metric(
+        "Memory" if server["memory_is_current"] else "Peak memory",
+        f"{server['memory_bytes'] / 2**20:,.0f} MB",
+    )
+    st.metric("Sessions", server["sessions"], help="Seen in this server process.")
+    st.metric("Compacted", server["compacted"], help=f"Idle for {sessions.IDLE_SECONDS / 60:.0f}+ minutes.")
+
+    memory = governor.stats()
+    if memory["budget_bytes"]:
+        st.progress(
+            min(1.0, server["memory_bytes"] / memory["budget_bytes"]),
+            text=f"Budget {memory['budget_bytes'] / 2**20:,.0f} MB ({memory['level']})",
+        )
+    st.caption(
+        f"Datasets ~{memory['dataset_bytes'] / 2**20:,.1f} MB in {memory['datasets']}, "
+        f"session state ~{memory['session_bytes'] / 2**20:,.1f} MB. "
+        f"Evicted {memory['evicted']}, downcast {memory['downcast']}, "
+        f"uploads refused {memory['rejected']}."
+    )
+
+if not HAS_PYARROW:
+    st.warning("The answer log needs pyarrow: `pip install pyarrow`.")
+    st.stop()
+
+if st.button("Refresh"):
+    load_analytics.clear()
+
+analytics = load_analytics(EVENTS_DIR)
+
+if analytics is None:
+    st.info("No answers logged yet. Play a Hot or Not round first.")
+    st.stop()
+
+cols = st.columns(4)
+cols[0].metric("Answers", f"{analytics['answers']:,}")
+cols[1].metric("Sessions", f"{analytics['sessions']:,}")
+cols[2].metric("Accuracy", f"{analytics['accuracy']:.0%}")
+cols[3].metric("Median answer time", f"{analytics['median_time']:.1f} s")
+
+st.caption(f"Computed in {analytics['seconds'] * 1000:.0f} ms.")
+
+st.subheader("By fact type")
+by_fact_type = analytics["by_fact_type"].rename(
+    index=lambda x: FACT_TYPE_LABELS.get(x, x.replace("_", " ").title())
+)
+st.dataframe(by_fact_type, use_container_width=True)
+
+st.subheader("Hardest questions")
+min_answers = st.slider("Minimum answers per question", 1, 100, 5)
+questions = analytics["questions"]
+st.dataframe(
+    questions[questions["answers"] >= min_answers],
+    use_container_width=True,
+    column_config={
+        "accuracy": st.column_config.ProgressColumn("accuracy", min_value=0.0, max_value=1.0),
+        "observed_difficulty": st.column_config.NumberColumn(format="%.2f"),
+        "median_time": st.column_config.NumberColumn("median time (s)", format="%.1f"),
+        "p90_time": st.column_config.NumberColumn("p90 time (s)", format="%.1f"),
+    },
+)
+
+st.subheader("Most confused distractor pairs")
+st.caption("Question and distractor pairs with the highest wrong-answer rate (shown at least 5 times).")
+st.dataframe(analytics["pairs"], hide_index=True, use_container_width=True)
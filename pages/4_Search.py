@@ -0,0 +1,113 @@
+"""
+Search - find cards and Hot or Not questions
+
+Full-text and fuzzy search across radionuclides_info.csv, the master
+radiopharmaceutical CSV and every data/hot_or_not/*.psv file. Results can
+be turned into a custom flashcard deck or a custom Hot or Not question pool.
+"""
+
+from __future__ import annotations
+
+import time
+
+import pandas as pd
+import streamlit as st
+
+from nucmed import sessions, warmup
+from nucmed.search import SearchIndex
+
+
+# ---------------------------------------------------------------------
+# Page setup
+# ---------------------------------------------------------------------
+st.set_page_config(
+    page_title="Search",
+    page_icon="🔎",
+    layout="wide",
+)
+warmup.start()   # first run in this process: load every page's data in the background
+sessions.touch()  # idle sessions are compacted; see nucmed/sessions.py
+
+
+# ---------------------------------------------------------------------
+# Constants
+# ---------------------------------------------------------------------
+CARD_SOURCES = ["Cards", "Master list"]
+
+
+# ---------------------------------------------------------------------
+# Data loading
+# ---------------------------------------------------------------------
+# Straight from the warm-up cache, without a Streamlit cache on top, so the
+# memory governor can evict them (nucmed/governor.py).
+def load_sources() -> dict[str, pd.DataFrame]:
+    return {**warmup.card_decks(), "Hot or Not": warmup.question_bank()}
+
+
+def load_index() -> SearchIndex:
+    """Built once per process, usually by the start-up warm-up; queries never touch the frames."""
+    with st.spinner("Building search index..."):   # only shown if it takes a moment
+        return warmup.search_index()
+
+
+# ---------------------------------------------------------------------
+# Main app
+# ---------------------------------------------------------------------
+st.title("🔎 Search")
+
+frames = load_sources()
+index = load_index()
+
+query = st.text_input(
+    "Search cards and questions",
+    placeholder="thyroid, Ga-68, bone scan, positron...",
+)
+sources = st.multiselect("Sources", list(frames), default=list(frames))
+
+if not query.strip():
+    st.caption(f"{len(index):,} cards and questions indexed.")
+    st.stop()
+
+started = time.perf_counter()
+hits = index.search(query, limit=500, sources=sources)
+elapsed = time.perf_counter() - started
+
+st.caption(f"{len(hits):,} results in {elapsed * 1000:.1f} ms")
+
+if not hits:
+    st.info("No matches. Try a shorter or different term.")
+    st.stop()
+
+by_source: dict[str, list] = {}
+for hit in hits:
+    by_source.setdefault(hit.source, []).append(hit.key)
+
+for name, keys in by_source.items():
+    st.subheader(f"{name} ({len(keys)})")
+    shown = frames[name].loc[keys].drop(columns="__row_id", errors="ignore")
+    st.dataframe(shown, use_container_width=True, hide_index=True)
+
+
+# Build decks from the results
+st.markdown("---")
+col1, col2 = st.columns(2)
+
+card_hits = [(name, key) for name in CARD_SOURCES for key in by_source.get(name, [])]
+with col1:
+    if st.button(f"📇 Study {len(card_hits)} cards as flashcards", disabled=not card_hits):
+        deck = []
+        for position, (name, key) in enumerate(card_hits):
+            record = frames[name].loc[key].to_dict()
+            # Row ids are only unique within one file, and the main page's
+            # progress ledgers index by position, so renumber.
+            record["__row_id"] = position
+            deck.append(record)
+        st.session_state.search_deck = deck
+        st.session_state.pop("deck", None)   # the main page rebuilds from search_deck
+        st.success("Deck ready. Open the main page to study it.")
+
+question_hits = by_source.get("Hot or Not", [])
+with col2:
+    if st.button(f"🔥 Play Hot or Not with {len(question_hits)} questions", disabled=not question_hits):
+        st.session_state.search_questions = tuple(int(key) for key in question_hits)
+        st.success("Question pool ready. Open Hot or Not and start a round.")
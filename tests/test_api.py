@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from nucmed.api import MAX_BODY_BYTES, BadRequest, app, handle_score, route
+
+
+@pytest.fixture(scope="module")
+def token():
+    status, response = route("GET", "/v1/hot_or_not", {"seed": ["3"], "length": ["3"]}, b"")
+    assert status == 200
+    return response["token"]
+
+
+@pytest.mark.parametrize("answer_time", ["fast", float("nan"), True, [1]])
+def test_score_rejects_non_numeric_times(token, answer_time):
+    with pytest.raises(BadRequest, match="time must be a number"):
+        handle_score({"token": token, "answers": [{"option": "Hot", "time": answer_time}]})
+
+
+def test_score_rejects_negative_times(token):
+    with pytest.raises(BadRequest, match="negative"):
+        handle_score({"token": token, "answers": [{"option": "Hot", "time": -1}]})
+
+
+def test_score_accepts_missing_and_numeric_times(token):
+    answers = [{"option": "Hot", "time": 1.5}, {"option": "Hot"}, "Hot"]
+    assert handle_score({"token": token, "answers": answers})["total"] == 3
+
+
+def call(method: str, path: str, chunks: list[bytes], headers=()) -> tuple[int, dict]:
+    """One request through the ASGI app, with the body sent in chunks."""
+    scope = {"type": "http", "method": method, "path": path, "query_string": b"", "headers": list(headers)}
+    messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1} for i, c in enumerate(chunks)]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def test_oversized_bodies_are_rejected(token):
+    chunk = b" " * (MAX_BODY_BYTES // 2 + 1)
+    assert call("POST", "/v1/score", [chunk, chunk])[0] == 413
+    assert call("POST", "/v1/score", [b"{}"], [(b"content-length", str(MAX_BODY_BYTES + 1).encode())])[0] == 413
+
+    body = json.dumps({"token": token, "answers": ["Hot"]}).encode()
+    status, scored = call("POST", "/v1/score", [body[:10], body[10:]])
+    assert status == 200 and scored["total"] == 3
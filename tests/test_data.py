@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import io
+
+from nucmed.data import merge_decks
+
+
+def test_merge_strips_cells_and_deduplicates_across_decks():
+    first = io.StringIO("Radionuclide,Radiopharmaceutical ,Uses\nFluorine-18 ,FDG,PET \nTc-99m,MDP,\n")
+    second = io.StringIO("radionuclide,Radiopharmaceutical,Half-life\nFluorine-18,FDG,110 min\n")
+
+    deck = merge_decks([first, second])
+
+    assert list(deck.columns) == ["__row_id", "Radionuclide", "Radiopharmaceutical", "Uses", "Half-life"]
+    assert deck["__row_id"].tolist() == [0, 1]
+    fdg = deck.iloc[0]
+    assert (fdg["Radionuclide"], fdg["Uses"], fdg["Half-life"]) == ("Fluorine-18", "PET", "110 min")
+    assert deck["Uses"].isna().tolist() == [False, True]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from nucmed.events import SEGMENT_SUFFIX, EventLog, confused_pairs, read_events
+
+
+def answer(log: EventLog, i: int, question: str = "q1", distractor: str = "d1", correct: bool = True) -> None:
+    log.append(ts=float(i), session="s", player="ana", question_id=question, fact_type="half_life",
+               distractor_id=distractor, difficulty=1, difficulty_level=1, is_correct=correct,
+               answer_time=1.0, streak=0, earned_xp=10, speed_bonus=0, multiplier=1.0, hot_meter=50.0)
+
+
+def test_flushes_in_batches_and_rotates_segments(tmp_path):
+    log = EventLog(tmp_path, flush_rows=3, flush_seconds=3600, segment_rows=6)
+
+    for i in range(2):
+        answer(log, i)
+    assert read_events(tmp_path).empty   # still buffered
+
+    for i in range(2, 7):
+        answer(log, i)
+    assert len(read_events(tmp_path)) == 6   # two batches; the 7th event waits
+    assert len(list(tmp_path.glob(f"*{SEGMENT_SUFFIX}"))) == 1   # closed at 6 rows
+
+    log.close()
+    events = read_events(tmp_path)
+    assert len(list(tmp_path.glob(f"*{SEGMENT_SUFFIX}"))) == 2
+    assert events["ts"].tolist() == [float(i) for i in range(7)]
+    assert events["question_id"].astype(str).eq("q1").all()
+
+
+def test_confused_pairs_rank_by_wrong_rate():
+    events = pd.DataFrame({
+        "question_id": ["q1"] * 6 + ["q2"] * 6 + ["q3"] * 2,
+        "distractor_id": ["a"] * 6 + ["b"] * 6 + ["c"] * 2,
+        "is_correct": [False] * 3 + [True] * 3 + [False] * 5 + [True] + [False] * 2,
+    })
+
+    pairs = confused_pairs(events, min_shown=5)
+
+    assert pairs["question_id"].tolist() == ["q2", "q1"]   # q3 was shown too rarely
+    assert pairs[["shown", "wrong"]].values.tolist() == [[6, 5], [6, 3]]
+    assert pairs["wrong_rate"].tolist() == pytest.approx([5 / 6, 0.5])
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from nucmed.governor import downcast
+
+
+def test_downcast_converts_repeated_text_columns():
+    frame = pd.DataFrame({"kind": ["a", "b"] * 5, "name": [f"n{i}" for i in range(10)], "n": range(10)})
+    smaller = downcast(frame)
+
+    assert smaller is not frame
+    assert isinstance(smaller["kind"].dtype, pd.CategoricalDtype)
+    assert not isinstance(smaller["name"].dtype, pd.CategoricalDtype)
+    assert smaller["kind"].tolist() == frame["kind"].tolist()
+
+
+def test_downcast_returns_the_value_when_nothing_qualifies():
+    frame = pd.DataFrame({"name": ["x", "y", "z"], "n": [1, 2, 3]})
+
+    assert downcast(frame) is frame
+    frames = {"deck": frame}
+    assert downcast(frames) is frames
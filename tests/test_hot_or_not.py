@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from nucmed.data import QUESTIONS_DIR, read_questions
+from nucmed.hot_or_not import RoundGenerationError, generate_round
+
+
+@pytest.fixture(scope="module")
+def bank():
+    return read_questions(QUESTIONS_DIR)
+
+
+def test_rounds_are_deterministic_and_distractors_fit(bank):
+    first = generate_round(bank, ["half_life", "emission"], 3, 10, np.random.default_rng(11))
+    again = generate_round(bank, ["half_life", "emission"], 3, 10, np.random.default_rng(11))
+
+    assert np.array_equal(first.questions, again.questions)
+    assert np.array_equal(first.distractors, again.distractors)
+    assert np.array_equal(first.flips, again.flips)
+    assert len(set(first.questions)) == len(first) == 10
+
+    for question, distractor in zip(first.questions, first.distractors):
+        asked, wrong = bank.loc[question], bank.loc[distractor]
+        assert asked["fact_type"] in ("half_life", "emission")
+        assert asked["difficulty"] <= 3
+        assert wrong["fact_type"] == asked["fact_type"]
+        assert wrong["correct_option"] != asked["correct_option"]
+        assert wrong["distractor_group"].strip() != asked["distractor_group"].strip()
+
+
+def test_question_pool_limits_questions_only(bank):
+    pool = bank.index[bank["fact_type"] == "half_life"][:3]
+    round_ = generate_round(bank, [], 5, 20, np.random.default_rng(2), question_pool=tuple(pool))
+
+    assert set(round_.questions) <= set(pool)
+
+    with pytest.raises(RoundGenerationError):
+        generate_round(bank, ["emission"], 5, 20, np.random.default_rng(2), question_pool=tuple(pool))
+
+
+def test_categorical_bank_gives_the_same_rounds(bank):
+    categorical = bank.astype({"fact_type": "category", "correct_option": "category", "distractor_group": "category"})
+    plain = generate_round(bank, [], 5, 20, np.random.default_rng(4))
+    downcast = generate_round(categorical, [], 5, 20, np.random.default_rng(4))
+
+    assert np.array_equal(plain.questions, downcast.questions)
+    assert np.array_equal(plain.distractors, downcast.distractors)
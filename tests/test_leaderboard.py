@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("sortedcontainers")
+
+from nucmed.leaderboard import Leaderboard
+
+
+def test_ranks_follow_each_update():
+    board = Leaderboard()
+
+    assert board.submit("ana", 100) == 1
+    assert board.submit("ben", 150) == 1
+    assert board.rank("ana") == 2
+
+    assert board.submit("ana", 200) == 1   # a better total moves ana up
+    assert board.rank("ben") == 2
+    assert board.submit("ana", 50) == 1    # a worse one is ignored
+    assert board.score("ana") == 200
+    assert board.rank("nobody") is None
+
+
+def test_ties_share_a_rank_and_list_by_name():
+    board = Leaderboard()
+    for player, xp in [("cy", 100), ("ana", 100), ("ben", 300), ("dee", 50)]:
+        board.submit(player, xp)
+
+    assert [board.rank(p) for p in ("ben", "ana", "cy", "dee")] == [1, 2, 2, 4]
+    assert board.top(3) == [("ben", 300), ("ana", 100), ("cy", 100)]
+
+
+def test_log_replays_best_score_per_player(tmp_path):
+    path = tmp_path / "board.jsonl"
+    board = Leaderboard(path)
+    board.submit("ana", 100)
+    board.submit("ana", 300)
+    board.submit(" ben ", 200)
+    board.flush()
+
+    replayed = Leaderboard(path)
+    assert replayed.top() == [("ana", 300), ("ben", 200)]
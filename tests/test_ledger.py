@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import numpy as np
+
+from nucmed.ledger import Bitset, SeenLedger, _popcount
+
+
+def test_bits_set_once_and_count():
+    bits = Bitset(100)
+
+    assert bits.add(0) and bits.add(63) and bits.add(64) and bits.add(99)
+    assert not bits.add(63)
+    assert len(bits) == 4
+    assert 64 in bits and 65 not in bits
+    assert bits.positions().tolist() == [0, 63, 64, 99]
+
+
+def test_popcount_matches_the_bits():
+    words = np.array([0, 1, 2**63, 2**64 - 1], dtype=np.uint64)
+
+    assert _popcount(words) == 0 + 1 + 1 + 64
+    assert len(Bitset.from_words(words)) == 66
+
+
+def test_adding_past_the_last_word_grows_the_set():
+    bits = Bitset(64)
+    assert len(bits.words) == 1
+    assert 1000 not in bits   # past the end reads as unset
+
+    assert bits.add(1000)
+    assert len(bits.words) >= 1000 // 64 + 1
+    assert 1000 in bits and len(bits) == 1
+    assert bits.positions().tolist() == [1000]
+
+
+def test_union_across_ledgers_of_different_widths():
+    seen = SeenLedger(10)
+    seen.mark(("flash", "a", "b"), 3)
+    seen.mark(("mcq", "a", "b"), 3)
+    seen.mark(("mcq", "a", "b"), 500)   # grows this ledger only
+
+    assert seen.count(("mcq", "a", "b")) == 2
+    assert seen.count(("match", "a")) == 0
+    assert seen.union().positions().tolist() == [3, 500]
+    assert seen.union([("flash", "a", "b"), ("missing",)]).positions().tolist() == [3]
+    assert len(seen.union([("missing",)])) == 0
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("streamlit")
+
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import ElementTree
+
+
+def edit_grid(monkeypatch, editor, edited_rows: dict) -> None:
+    """Send data_editor edits on every later run, as the browser does; AppTest cannot edit tables."""
+    get_widget_states = ElementTree.get_widget_states
+    state = json.dumps({"edited_rows": edited_rows, "added_rows": [], "deleted_rows": []})
+
+    def with_edits(tree):
+        states = get_widget_states(tree)
+        states.widgets.append(WidgetState(id=editor.proto.id, string_value=state))
+        return states
+
+    monkeypatch.setattr(ElementTree, "get_widget_states", with_edits)
+
+
+def test_table_grid_keeps_answers_through_check(monkeypatch):
+    at = AppTest.from_file("../app.py", default_timeout=60).run()
+    next(s for s in at.sidebar.selectbox if s.label == "Choose a game").select("Multiple Match").run()
+
+    editor = next(d for d in at.dataframe if (d.key or "").startswith("match_grid_"))
+    answer_key = at.session_state["match_key"][1]
+    target = answer_key.columns[0]
+    rows = len(answer_key)
+
+    # Every row answered correctly except the first, which is left empty.
+    edit_grid(monkeypatch, editor, {str(i): {target: answer_key.iloc[i][target]} for i in range(1, rows)})
+    at.run()
+    next(b for b in at.button if b.label == "Check Answers ✅").click().run()
+
+    assert not at.exception
+    assert at.success[0].value == f"Score: {rows - 1} / {rows}"
+    picks = at.session_state["match_picks"][target].tolist()
+    assert pd.isna(picks[0]) and picks[1:] == answer_key[target].tolist()[1:]
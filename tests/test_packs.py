@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from nucmed.data import QUESTIONS_DIR, fingerprint, read_questions
+from nucmed.hot_or_not import generate_round
+from nucmed.packs import PackError, build_pack, load_pack, save_pack
+
+
+@pytest.fixture(scope="module")
+def bank():
+    return read_questions(QUESTIONS_DIR)
+
+
+@pytest.fixture
+def saved(bank, tmp_path):
+    pack = build_pack(bank, fingerprint(bank), "week3", ["half_life"], 3, 10, rounds=8, seed=5)
+    path = tmp_path / "week3.npz"
+    save_pack(pack, path)
+    return pack, path
+
+
+def test_round_trip_keeps_every_round(bank, saved):
+    pack, path = saved
+    loaded = load_pack(path)
+
+    assert (loaded.name, loaded.bank, loaded.fact_types) == ("week3", fingerprint(bank), ("half_life",))
+    assert len(loaded) == 8
+    for i in range(len(pack)):
+        expected = generate_round(bank, ["half_life"], 3, 10, np.random.default_rng(loaded.seed(i)))
+        got = loaded.round(i)
+        assert np.array_equal(got.questions, expected.questions)
+        assert np.array_equal(got.distractors, expected.distractors)
+        assert np.array_equal(got.flips, expected.flips)
+    assert not loaded.questions.flags.writeable
+    # The page refuses a pack whose fingerprint is not the current bank's.
+    assert fingerprint(bank.iloc[:-1]) != loaded.bank
+
+
+def test_corrupt_files_are_refused(saved):
+    _, path = saved
+    data = bytearray(path.read_bytes())
+    # Flip bytes inside the first member's data; the zip CRC no longer matches.
+    for i in range(60, 80):
+        data[i] ^= 0xFF
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(PackError):
+        load_pack(path)
+
+    path.write_bytes(b"not a pack")
+    with pytest.raises(PackError):
+        load_pack(path)
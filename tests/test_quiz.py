@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from argparse import Namespace
+
+import numpy as np
+import pytest
+
+from nucmed.data import DECK_PATH, MASTER_DECK_PATH, merge_decks
+from nucmed.export import build_match
+from nucmed.quiz import match_answer, mcq_options, sample_match_rows, shuffled_deck
+
+
+@pytest.fixture(scope="module")
+def deck():
+    return merge_decks([DECK_PATH, MASTER_DECK_PATH])
+
+
+def test_indexed_samplers_draw_as_dataframe_sample(deck):
+    for seed in range(20):
+        expected = deck.sample(frac=1, random_state=np.random.default_rng(seed)).to_dict("records")
+        assert shuffled_deck(deck, np.random.default_rng(seed)) == expected
+
+        expected = deck.sample(n=6, random_state=np.random.default_rng(seed)).reset_index(drop=True)
+        assert sample_match_rows(deck, np.random.default_rng(seed), 6).equals(expected)
+
+
+def test_mcq_options_leave_out_the_correct_answer(deck):
+    rng = np.random.default_rng(3)
+    answered = [row for row in shuffled_deck(deck, rng) if isinstance(row["Uses"], str)]
+    for row in answered[:20]:
+        options = mcq_options(deck, row, "Uses", rng)
+
+        assert options[-1] == row["Uses"]
+        assert row["Uses"] not in options[:-1]
+        assert len(set(options)) == len(options) == 4
+
+
+def test_match_answers_agree_with_match_answer(deck):
+    args = Namespace(base="Radionuclide", targets=["Half-life", "Decay Mode"], length=30)
+    items = build_match(deck, args, np.random.default_rng(5))
+
+    for item in items:
+        base = deck.loc[deck["Radionuclide"].astype(str).str.strip() == item["prompt"], "Radionuclide"].iloc[0]
+        assert item["answers"] == {t: match_answer(deck, "Radionuclide", base, t) for t in args.targets}
+    assert sorted(items[0]["pools"]["Decay Mode"]) == sorted(deck["Decay Mode"].dropna().astype(str).unique())
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from nucmed.search import SearchIndex, _edit_distance
+
+
+def make_index() -> SearchIndex:
+    return SearchIndex([
+        ("Cards", 0, "I-131 sodium iodide thyroid ablation"),
+        ("Cards", 1, "Tc-99m MDP bone scan"),
+        ("Cards", 2, "Ga-68 DOTATATE neuroendocrine tumours"),
+    ])
+
+
+def test_docstring_misspelling_finds_thyroid():
+    index = make_index()
+
+    assert "thyroid" in index.expand("thyriod")
+    assert [hit.key for hit in index.search("thyriod")] == [0]
+
+
+def test_fuzzy_expansion_stays_strict_for_unrelated_terms():
+    assert make_index().expand("cardiac") == []
+
+
+def test_edit_distance_counts_a_swap_as_one_edit():
+    assert _edit_distance("thyriod", "thyroid", 2) == 1
+    assert _edit_distance("bone", "bones", 2) == 1
+    assert _edit_distance("iodide", "thyroid", 2) == 3   # limit + 1
+
+
+def test_nuclide_spellings_are_one_term():
+    index = make_index()
+
+    assert [hit.key for hit in index.search("gallium-68")] == [2]
+    assert [hit.key for hit in index.search("ga68")] == [2]
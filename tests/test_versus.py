@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import pytest
+
+from nucmed.versus import (
+    EMPTY_MATCH_SECONDS,
+    IDLE_MATCH_SECONDS,
+    OPPONENT_HIT,
+    AnswerEvent,
+    EventHub,
+    QueueTransport,
+    apply_opponent_event,
+)
+
+
+@pytest.fixture
+def hub():
+    hub = EventHub()
+    yield hub
+    hub.close()
+
+
+def test_two_players_see_each_others_answers(hub):
+    match = hub.create_match({"round_length": 5}, seed=7)
+    ana, ben = QueueTransport(), QueueTransport()
+
+    assert hub.join(match.code, "Ana", ana, hot_meter=65.0) == "Ana"
+    assert hub.join(match.code.lower(), "Ben", ben, hot_meter=65.0) == "Ben"
+
+    hub.publish(AnswerEvent(match.code, "Ana", question_index=0, is_correct=True, hot_meter=77.0))
+    assert ben.wait(timeout=2)
+    hub.publish(AnswerEvent(match.code, "Ben", question_index=0, is_correct=False, hot_meter=55.0, finished=True))
+    assert ana.wait(timeout=2)
+
+    # Nobody receives their own answer.
+    assert [e.player for e in ben.events] == ["Ana"]
+    assert [e.player for e in ana.events] == ["Ben"]
+
+    assert apply_opponent_event(65.0, ben.events[0]) == 65.0 - OPPONENT_HIT
+    assert apply_opponent_event(65.0, ana.events[0]) == 65.0
+
+    players = hub.get_match(match.code).players
+    assert (players["Ana"].answered, players["Ana"].correct, players["Ana"].finished) == (1, 1, False)
+    assert (players["Ben"].answered, players["Ben"].correct, players["Ben"].finished) == (1, 0, True)
+
+
+def test_duplicate_names_are_suffixed(hub):
+    match = hub.create_match({}, seed=1)
+    first, second = QueueTransport(), QueueTransport()
+
+    assert hub.join(match.code, "Ana", first, hot_meter=65.0) == "Ana"
+    assert hub.join(match.code, "Ana", second, hot_meter=65.0) == "Ana (2)"
+
+    hub.publish(AnswerEvent(match.code, "Ana (2)", question_index=0, is_correct=True, hot_meter=70.0))
+    assert first.wait(timeout=2)
+    assert not second.events
+    assert set(hub.get_match(match.code).players) == {"Ana", "Ana (2)"}
+
+
+def test_last_player_leaving_closes_the_match(hub):
+    match = hub.create_match({}, seed=1)
+    hub.join(match.code, "Ana", QueueTransport(), hot_meter=65.0)
+    hub.leave(match.code, "Ana")
+
+    assert hub.get_match(match.code) is None
+    with pytest.raises(KeyError):
+        hub.join(match.code, "Ben", QueueTransport(), hot_meter=65.0)
+
+
+def test_finishing_is_not_an_answer(hub):
+    match = hub.create_match({}, seed=1)
+    ana, ben = QueueTransport(), QueueTransport()
+    hub.join(match.code, "Ana", ana, hot_meter=65.0)
+    hub.join(match.code, "Ben", ben, hot_meter=65.0)
+
+    hub.publish(AnswerEvent(match.code, "Ana", question_index=0, is_correct=True, hot_meter=70.0))
+    hub.finish(match.code, "Ana", question_index=1, hot_meter=18.0)
+    assert ben.wait(timeout=2)
+    while len(ben.events) < 2:
+        assert ben.wait(timeout=2)
+
+    ana_status = hub.get_match(match.code).players["Ana"]
+    assert (ana_status.answered, ana_status.correct, ana_status.finished) == (1, 1, True)
+    assert apply_opponent_event(65.0, ben.events[1]) == 65.0
+
+
+def test_empty_and_idle_matches_expire(hub):
+    never_joined = hub.create_match({}, seed=1)
+    idle = hub.create_match({}, seed=2)
+    active = hub.create_match({}, seed=3)
+    hub.join(idle.code, "Ana", QueueTransport(), hot_meter=65.0)
+    hub.join(active.code, "Ben", QueueTransport(), hot_meter=65.0)
+    now = idle.last_event
+
+    assert hub.expire(now + EMPTY_MATCH_SECONDS - 1) == 0
+    assert hub.expire(now + EMPTY_MATCH_SECONDS) == 1
+    assert hub.get_match(never_joined.code) is None
+
+    active.last_event = now + IDLE_MATCH_SECONDS
+    assert hub.expire(now + IDLE_MATCH_SECONDS) == 1
+    assert hub.get_match(idle.code) is None
+    assert hub.get_match(active.code) is active
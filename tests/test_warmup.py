@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+from nucmed import warmup
+
+
+def test_only_exited_processes_lose_their_ready_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(warmup, "READY_FILE", tmp_path / ".ready")
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    dead = warmup.ready_file(int(exited.stdout))
+    live = warmup.ready_file(os.getppid())
+    for path in (dead, dead.with_name(dead.name + ".tmp"), live, warmup.ready_file()):
+        path.write_text("{}")
+
+    warmup._remove_stale_ready_files()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([live.name, f".ready.{os.getpid()}"])